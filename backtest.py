@@ -0,0 +1,162 @@
+"""
+Backtest alert thresholds against stored metrics history.
+
+Replays a time range from MetricsDB (or a CSV export, or the configured
+HISTORY_BACKEND store) through the configured ALERT_THRESHOLD_* values
+and any candidate threshold sets, and reports alert counts,
+time-to-detect and flapping per node.
+
+Usage:
+    python backtest.py --days 30
+    python backtest.py --days 90 --candidate "strict:finality_lag=20,peers_min=10"
+    python backtest.py --csv data/exports/metrics.csv --candidate "block_age_seconds=30"
+    python backtest.py --history --days 365
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.resolve()
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from services.alerts import AlertThresholds
+from services.backtester import (
+    AlertBacktester,
+    DEFAULT_FLAP_WINDOW_SECONDS,
+    format_report,
+    iter_csv_batches,
+    iter_db_batches,
+    iter_history_batches,
+    parse_candidate,
+    parse_timestamp,
+)
+from services.database import MetricsDB, READ_CHUNK_SIZE
+from services.history_store import create_history_store
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Backtest alert thresholds against stored metrics history",
+    )
+
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--db",
+        type=str,
+        help="SQLite database to read (default: the inspector database)",
+    )
+    source.add_argument(
+        "--csv",
+        type=str,
+        help="CSV export to read instead of the database",
+    )
+    source.add_argument(
+        "--history",
+        action="store_true",
+        help="Read the HISTORY_BACKEND store (sqlite or parquet) instead of the database",
+    )
+
+    parser.add_argument(
+        "--days",
+        type=float,
+        default=30,
+        help="Length of the replayed window, ending now (default: 30)",
+    )
+    parser.add_argument(
+        "--start",
+        type=parse_timestamp,
+        help="Start of the window (ISO format, offsets converted to UTC); overrides --days",
+    )
+    parser.add_argument(
+        "--end",
+        type=parse_timestamp,
+        help="End of the window (ISO format, exclusive)",
+    )
+    parser.add_argument(
+        "--node",
+        action="append",
+        help="Only replay this node (repeatable)",
+    )
+    parser.add_argument(
+        "--candidate",
+        action="append",
+        default=[],
+        help='Threshold set to compare, e.g. "strict:finality_lag=20,peers_min=10" '
+             "(fields: finality_lag, rpc_response_time_ms, peers_min, block_age_seconds)",
+    )
+    parser.add_argument(
+        "--flap-window",
+        type=float,
+        default=DEFAULT_FLAP_WINDOW_SECONDS,
+        help="Seconds after a clear within which re-firing counts as a flap",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=READ_CHUNK_SIZE,
+        help="Rows read per chunk from the database",
+    )
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    candidates = {"current": AlertThresholds()}
+    try:
+        for i, spec in enumerate(args.candidate, start=1):
+            name, thresholds = parse_candidate(spec, i)
+            candidates[name] = thresholds
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+
+    start = args.start or datetime.now() - timedelta(days=args.days)
+    backtester = AlertBacktester(candidates, flap_window_seconds=args.flap_window)
+    started = time.perf_counter()
+
+    if args.csv:
+        if not Path(args.csv).exists():
+            print(f"Error: CSV file not found: {args.csv}")
+            return 2
+        source = None
+        batches = iter_csv_batches(args.csv, start, args.end, args.node)
+    elif args.history:
+        try:
+            source = create_history_store()
+        except (ImportError, ValueError) as e:
+            print(f"Error: {e}")
+            return 2
+        batches = iter_history_batches(source, start, args.end, args.node, args.chunk_size)
+    else:
+        source = MetricsDB(db_path=args.db)
+        if not Path(source.db_path).exists():
+            print(f"Error: Database not found: {source.db_path}")
+            return 2
+        batches = iter_db_batches(source, start, args.end, args.node, args.chunk_size)
+
+    try:
+        for batch in batches:
+            backtester.feed(batch)
+    finally:
+        if source is not None:
+            source.close()
+
+    results = backtester.results()
+    elapsed = time.perf_counter() - started
+
+    if not results:
+        print("No metrics in the selected range")
+        return 1
+
+    print(format_report(results))
+    samples = sum(r.samples for r in results) // len(candidates)
+    print(f"\nReplayed {samples} samples against {len(candidates)} threshold sets in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
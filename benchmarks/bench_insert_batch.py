@@ -0,0 +1,107 @@
+"""
+Benchmark MetricsDB.insert_batch throughput.
+
+Compares the bulk executemany path with the previous ORM path
+(one MetricsRecord per row + session.add_all) on a fresh SQLite file.
+The bulk path also merges the rows into the rollup tables; the ORM
+baseline only inserts them.
+
+The default run skips the ORM baseline above --orm-max-rows (100,000),
+since it manages about 10k rows/s; the second command below compares
+both paths at 1M rows.
+
+Usage:
+    python benchmarks/bench_insert_batch.py
+    python benchmarks/bench_insert_batch.py --rows 10000 1000000 --orm-max-rows 1000000
+"""
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy.orm import Session
+
+from models.metrics import HealthMetrics
+from services.database import MetricsDB, MetricsRecord
+
+
+def make_metrics(count: int):
+    """Yield synthetic metrics for 10 nodes, one row per node per minute."""
+    start = datetime(2025, 1, 1)
+    for i in range(count):
+        yield HealthMetrics(
+            timestamp=start + timedelta(minutes=i // 10),
+            node_name=f"node-{i % 10}",
+            block_height=20_000_000 + i // 10,
+            current_block_height=20_000_000 + i // 10,
+            peers_count=40,
+            finality_lag=3,
+            time_since_last_block=6,
+            rpc_response_time=120.0 + i % 50,
+            status="healthy",
+        )
+
+
+def orm_insert(db: MetricsDB, metrics_list) -> None:
+    """The pre-bulk insert_batch: one ORM instance per row."""
+    records = [
+        MetricsRecord(
+            timestamp=m.timestamp,
+            node_name=m.node_name,
+            block_height=m.block_height,
+            current_block_height=m.current_block_height,
+            peers_count=m.peers_count,
+            finality_lag=m.finality_lag,
+            time_since_last_block=m.time_since_last_block,
+            rpc_response_time=m.rpc_response_time,
+            status=m.status,
+        )
+        for m in metrics_list
+    ]
+    with Session(db.engine) as session:
+        session.add_all(records)
+        session.commit()
+
+
+def run_case(label: str, rows: int, insert) -> float:
+    """Insert `rows` rows into a fresh database and return rows/sec."""
+    metrics_list = list(make_metrics(rows))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db = MetricsDB(db_path=str(Path(temp_dir) / "bench.db"))
+        db.create_tables()
+        try:
+            start = time.perf_counter()
+            insert(db, metrics_list)
+            elapsed = time.perf_counter() - start
+            assert db.count_records() == rows
+        finally:
+            db.close()
+
+    rate = rows / elapsed
+    print(f"{label:<8} {rows:>10,} rows  {elapsed:8.2f}s  {rate:>12,.0f} rows/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MetricsDB.insert_batch")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000],
+                        help="Row counts to benchmark")
+    parser.add_argument("--orm-max-rows", type=int, default=100_000,
+                        help="Skip the ORM baseline above this many rows")
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        bulk_rate = run_case("bulk", rows, MetricsDB.insert_batch)
+        if rows <= args.orm_max_rows:
+            orm_rate = run_case("orm", rows, orm_insert)
+            print(f"{'':<8} speedup {bulk_rate / orm_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,9 +24,41 @@ POLKADOT_RPC_URL = os.getenv("POLKADOT_RPC_URL", "wss://rpc.polkadot.io")
 RPC_TIMEOUT = 10
 RPC_MAX_RETRIES = 3
 
+# Blocking RPC work (metadata-based queries) runs on a bounded thread pool
+# per endpoint, or per provider host when grouping is enabled
+EXECUTOR_WORKERS_PER_ENDPOINT = int(os.getenv("EXECUTOR_WORKERS_PER_ENDPOINT", "2"))
+EXECUTOR_MAX_QUEUE = int(os.getenv("EXECUTOR_MAX_QUEUE", "8"))
+EXECUTOR_GROUP_BY_HOST = os.getenv("EXECUTOR_GROUP_BY_HOST", "False").lower() == "true"
+
+# Circuit breaker: consecutive failures before an endpoint is skipped,
+# and bounds of the exponential backoff while it stays down
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_BASE_DELAY_SECONDS = float(os.getenv("CIRCUIT_BASE_DELAY_SECONDS", "5"))
+CIRCUIT_MAX_DELAY_SECONDS = float(os.getenv("CIRCUIT_MAX_DELAY_SECONDS", "300"))
+
+# Headers (by hash) and finalized block hashes (by number) kept per chain
+BLOCK_CACHE_SIZE = int(os.getenv("BLOCK_CACHE_SIZE", "256"))
+
+# Pipelined system_health calls per latency probe; rpc_response_time is their median
+RPC_LATENCY_SAMPLES = int(os.getenv("RPC_LATENCY_SAMPLES", "1"))
+
+# Send per-tick probes as a single JSON-RPC batch array
+RPC_BATCH_REQUESTS = os.getenv("RPC_BATCH_REQUESTS", "True").lower() == "true"
+# After an endpoint rejects a batch, send single requests for this long before batching again
+RPC_BATCH_RETRY_SECONDS = int(os.getenv("RPC_BATCH_RETRY_SECONDS", "600"))
+
 # Monitoring settings
 CHECK_INTERVAL_SECONDS = int(os.getenv("CHECK_INTERVAL_SECONDS", "60"))
 
+# Daemon mode: upper bound of the random per-node tick offset
+SCHEDULER_JITTER_SECONDS = float(os.getenv("SCHEDULER_JITTER_SECONDS", "5"))
+
+# Track chain heads via chain_subscribeNewHeads/FinalizedHeads instead of polling
+STREAMING_MODE = os.getenv("STREAMING_MODE", "False").lower() == "true"
+
+# Maximum number of nodes collected at the same time (--all-nodes)
+MAX_CONCURRENT_COLLECTIONS = int(os.getenv("MAX_CONCURRENT_COLLECTIONS", "10"))
+
 # Alert thresholds (trigger notifications when exceeded)
 ALERT_THRESHOLD_FINALITY_LAG = int(
     os.getenv("ALERT_THRESHOLD_FINALITY_LAG", "50")
@@ -63,6 +95,28 @@ MAIN_LOG_FILE = LOGS_DIR / "inspector.log"
 # Database
 DATABASE_URL = f"sqlite:///{DB_DIR / 'inspector.db'}"
 
+# Write-behind queue: rows are committed in batches of up to this many,
+# or after this many seconds, whichever comes first
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "500"))
+DB_WRITE_FLUSH_SECONDS = float(os.getenv("DB_WRITE_FLUSH_SECONDS", "1.0"))
+
+# Retention in days (0 keeps data forever). Raw rows and 1-minute rollups
+# use the raw window; hourly and daily rollups use the rollup window.
+RETENTION_RAW_DAYS = int(os.getenv("RETENTION_RAW_DAYS", "30"))
+RETENTION_ROLLUP_DAYS = int(os.getenv("RETENTION_ROLLUP_DAYS", "365"))
+# How often the background retention task prunes and vacuums
+RETENTION_INTERVAL_SECONDS = float(os.getenv("RETENTION_INTERVAL_SECONDS", "3600"))
+# Store raw rows in one table per day so expiry is a DROP TABLE
+DB_PARTITION_BY_DAY = os.getenv("DB_PARTITION_BY_DAY", "False").lower() == "true"
+
+# Long-range metrics history: "sqlite" (MetricsDB) or "parquet" (columnar
+# files per node and day under HISTORY_DIR; requires pyarrow)
+HISTORY_BACKEND = os.getenv("HISTORY_BACKEND", "sqlite").lower()
+HISTORY_DIR = Path(os.getenv("HISTORY_DIR", str(DATA_DIR / "history")))
+
+# Runtime metadata cache (per genesis hash and spec_version)
+METADATA_CACHE_DIR = Path(os.getenv("METADATA_CACHE_DIR", str(DATA_DIR / "metadata_cache")))
+
 # CSV export
 CSV_EXPORT_DIR = DATA_DIR / "exports"
 CSV_EXPORT_DIR.mkdir(exist_ok=True)
@@ -1,8 +1,10 @@
 import sys
+import signal
 import asyncio
 import argparse
 import logging
 from pathlib import Path
+from typing import Optional
 
 from services.rpc_utils import RpcUtils
 from services.logger import setup_logger, log_metrics
@@ -12,26 +14,33 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 import config
 from models.node import Node
+from models.metrics import HealthMetrics
 from services.metrics_collector import MetricsCollector
 from services.config_loader import ConfigLoader
+from services.scheduler import TickScheduler
 
 
-async def collect_and_print_metrics(
-    node: Node, 
-    collector: MetricsCollector,
-    logger: logging.Logger, 
+def print_node_metrics(
+    node: Node,
+    metrics: Optional[HealthMetrics],
+    logger: logging.Logger,
 ) -> None:
-    """Collect metrics for a node and print results."""
+    """Print and log collected metrics for a node."""
     print(f"\n{'='*60}")
     print(f"Monitoring: {node.name}")
     print(f"RPC URL: {node.rpc_url}")
     print('='*60)
 
-    metrics = await collector.collect_metrics(node)
-
     if metrics:
         peers_icon = "✓" if metrics.peers_count > 0 else "⚠"
-        block_icon = "✓" if metrics.time_since_last_block <= 12 else "⚠" if metrics.time_since_last_block <= 30 else "✗"
+
+        # Block age: -1 means no block timestamp could be read
+        if metrics.time_since_last_block < 0:
+            block_display = "N/A (no block timestamp)"
+            block_icon = "⚠"
+        else:
+            block_display = f"{metrics.time_since_last_block}s"
+            block_icon = "✓" if metrics.time_since_last_block <= 12 else "⚠" if metrics.time_since_last_block <= 30 else "✗"
 
         # RPC time: -1 means measurement failed
         if metrics.rpc_response_time < 0:
@@ -46,7 +55,7 @@ async def collect_and_print_metrics(
         print(f"\n{status_icon} Metrics collected (with graceful degradation):")
         print(f"  Block height:      {metrics.block_height}")
         print(f"  {peers_icon} Peers:             {metrics.peers_count}")
-        print(f"  {block_icon} Time since block:  {metrics.time_since_last_block}s")
+        print(f"  {block_icon} Time since block:  {block_display}")
         print(f"  {rpc_icon} RPC response time: {rpc_display}")
         print(f"  Finality lag:      {metrics.finality_lag}")
         print(f"  Status:            {metrics.status.upper()}")
@@ -59,6 +68,54 @@ async def collect_and_print_metrics(
         logger.error(f"Failed to collect metrics for {node.name}")  
 
 
+async def run_daemon(
+    nodes: list[Node],
+    collector: MetricsCollector,
+    logger: logging.Logger,
+    max_concurrency: int,
+) -> None:
+    """Collect metrics for all nodes every CHECK_INTERVAL_SECONDS until stopped."""
+    scheduler = TickScheduler(
+        interval=config.CHECK_INTERVAL_SECONDS,
+        jitter=config.SCHEDULER_JITTER_SECONDS,
+        max_concurrency=max_concurrency,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, scheduler.stop)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C still cancels the loop
+
+    async def tick(node: Node) -> None:
+        metrics = await collector.collect_metrics(node)
+        print_node_metrics(node, metrics, logger)
+
+    logger.info(
+        f"Daemon mode: {len(nodes)} nodes every {config.CHECK_INTERVAL_SECONDS}s"
+    )
+    await scheduler.run(nodes, tick)
+
+    for node_name, stats in scheduler.stats.items():
+        logger.info(
+            f"Scheduler stats for {node_name}: ticks={stats.ticks}, "
+            f"overruns={stats.overruns}, skipped={stats.skipped}, "
+            f"max_lateness={stats.max_lateness:.2f}s"
+        )
+
+    for group, stats in collector.executors.stats().items():
+        logger.info(f"Executor stats for {group}: {stats}")
+
+    for chain, stats in collector.block_caches.stats().items():
+        logger.info(f"Block cache stats for {chain}: {stats}")
+
+    for node in nodes:
+        for probe in collector.latency_histograms.probes(node.name):
+            summary = collector.latency_histograms.summary(node.name, probe, window="1h")
+            logger.info(f"Latency of {probe} for {node.name} over 1h: {summary}")
+
+
 async def main():
     """Main entry point with CLI support."""
     logger = setup_logger("polkadot-inspector", log_dir=config.LOG_DIR)
@@ -81,6 +138,26 @@ async def main():
         help="Monitor all configured nodes",
     )
 
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=config.MAX_CONCURRENT_COLLECTIONS,
+        help="Maximum number of nodes collected at the same time",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        default=config.STREAMING_MODE,
+        help="Track chain heads via subscriptions instead of polling",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and collect every CHECK_INTERVAL_SECONDS",
+    )
+
     parser.add_argument(
         "--list",
         action="store_true",
@@ -104,7 +181,7 @@ async def main():
         logger.info("Listed available nodes")  
         return
 
-    collector = MetricsCollector()
+    collector = MetricsCollector(streaming=args.stream)
 
     try:
         # Determine which nodes to monitor
@@ -136,9 +213,16 @@ async def main():
                 logger.error("No nodes configured") 
                 return
 
-        # Collect metrics for each node
-        for node in nodes_to_monitor:
-            await collect_and_print_metrics(node, collector, logger)  
+        if args.daemon:
+            await run_daemon(nodes_to_monitor, collector, logger, args.concurrency)
+            return
+
+        # Collect metrics concurrently, reporting each node as it finishes
+        async for node, metrics in collector.collect_all(
+            nodes_to_monitor,
+            max_concurrency=args.concurrency,
+        ):
+            print_node_metrics(node, metrics, logger)
 
         print(f"\n{'='*60}")
         print("✓ Monitoring completed")
@@ -1,5 +1,10 @@
-from dataclasses import dataclass
-from datetime import datetime
+import warnings
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import IntEnum
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
 
 @dataclass
 class HealthMetrics:
@@ -11,7 +16,307 @@ class HealthMetrics:
     current_block_height: int   # Current reference block height
     peers_count: int
     finality_lag: int
-    time_since_last_block: int  # In seconds
+    time_since_last_block: int  # In seconds, -1 if unknown
     rpc_response_time: float    # In milliseconds
     status: str                 # "healthy", "warning", or "critical"
-    timestamp: datetime
\ No newline at end of file
+    timestamp: datetime
+
+
+class HealthStatus(IntEnum):
+    """Node health status, ordered so that max() is the worst."""
+    HEALTHY = 0
+    WARNING = 1
+    CRITICAL = 2
+
+    @classmethod
+    def parse(cls, status: str) -> "HealthStatus":
+        """Status from its string form ("healthy", "warning", "critical")."""
+        return cls[status.upper()]
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+# Naive timestamps are treated as UTC, which makes the conversion exact
+# and reversible (and matches numpy's datetime64 semantics); aware ones
+# are converted to UTC and come back naive
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """Nanoseconds since the epoch; naive datetimes are taken as UTC."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _ONE_US * 1000
+
+
+def from_epoch_ns(timestamp_ns: int) -> datetime:
+    """Naive datetime for nanoseconds since the epoch (microsecond precision)."""
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+
+def _timestamps_to_ns(timestamps: Sequence) -> np.ndarray:
+    """int64 epoch-ns array from datetimes or ISO 8601 strings."""
+    if isinstance(timestamps[0], str):
+        # numpy parses ISO text in C, far faster than datetime.fromisoformat.
+        # It converts UTC offsets (as written by exports of aware
+        # timestamps) to UTC, but warns that datetime64 has no timezone.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            parsed = np.array(timestamps, dtype="datetime64[us]")
+        return parsed.astype("datetime64[ns]").view(np.int64)
+
+    # For datetime objects, converting one by one beats numpy's own conversion
+    return np.array([to_epoch_ns(t) for t in timestamps], dtype=np.int64)
+
+
+@dataclass(slots=True)
+class CompactHealthMetrics:
+    """
+    Slotted HealthMetrics with an integer status and epoch-ns timestamp.
+
+    Holds the same data without a per-instance __dict__ or a datetime
+    object per record.
+    """
+    node_name: str
+    block_height: int
+    current_block_height: int
+    peers_count: int
+    finality_lag: int
+    time_since_last_block: int  # In seconds, -1 if unknown
+    rpc_response_time: float    # In milliseconds
+    status: HealthStatus
+    timestamp_ns: int           # Nanoseconds since the epoch
+
+    @classmethod
+    def from_metrics(cls, metrics: HealthMetrics) -> "CompactHealthMetrics":
+        return cls(
+            node_name=metrics.node_name,
+            block_height=metrics.block_height,
+            current_block_height=metrics.current_block_height,
+            peers_count=metrics.peers_count,
+            finality_lag=metrics.finality_lag,
+            time_since_last_block=metrics.time_since_last_block,
+            rpc_response_time=metrics.rpc_response_time,
+            status=HealthStatus.parse(metrics.status),
+            timestamp_ns=to_epoch_ns(metrics.timestamp),
+        )
+
+    def to_metrics(self) -> HealthMetrics:
+        return HealthMetrics(
+            node_name=self.node_name,
+            block_height=self.block_height,
+            current_block_height=self.current_block_height,
+            peers_count=self.peers_count,
+            finality_lag=self.finality_lag,
+            time_since_last_block=self.time_since_last_block,
+            rpc_response_time=self.rpc_response_time,
+            status=str(self.status),
+            timestamp=from_epoch_ns(self.timestamp_ns),
+        )
+
+
+@dataclass
+class MetricsBatch:
+    """
+    Column-oriented batch of metrics records, one NumPy array per field.
+
+    Node names are stored once in ``node_names`` and referenced per row
+    by ``node_codes``; statuses are HealthStatus values. Bulk consumers
+    (vectorized health checks, backtests) work on the arrays directly
+    instead of on one Python object per record.
+    """
+    node_names: List[str]
+    node_codes: np.ndarray              # int32, index into node_names
+    timestamp_ns: np.ndarray            # int64, ns since the epoch
+    block_height: np.ndarray            # int64
+    current_block_height: np.ndarray    # int64
+    peers_count: np.ndarray             # int64
+    finality_lag: np.ndarray            # int64
+    time_since_last_block: np.ndarray   # int64, seconds
+    rpc_response_time: np.ndarray       # float64, milliseconds
+    status: np.ndarray                  # int8, HealthStatus values
+
+    # Numeric columns and their dtypes
+    COLUMNS = {
+        "timestamp_ns": np.int64,
+        "block_height": np.int64,
+        "current_block_height": np.int64,
+        "peers_count": np.int64,
+        "finality_lag": np.int64,
+        "time_since_last_block": np.int64,
+        "rpc_response_time": np.float64,
+        "status": np.int8,
+    }
+
+    def __len__(self) -> int:
+        return len(self.node_codes)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> "MetricsBatch":
+        """
+        Build a batch from plain tuples in MetricsDB column order.
+
+        Rows are (timestamp, node_name, block_height, current_block_height,
+        peers_count, finality_lag, time_since_last_block, rpc_response_time,
+        status), as yielded by a projected MetricsDB.iter_metrics_for_node.
+        Timestamps are naive datetimes or ISO 8601 text.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        if not rows:
+            return cls.empty()
+
+        (timestamps, node_names, block_height, current_block_height, peers_count,
+         finality_lag, time_since_last_block, rpc_response_time, status) = zip(*rows)
+
+        index: dict[str, int] = {}
+        node_codes = [index.setdefault(name, len(index)) for name in node_names]
+        status_codes = {str(s): int(s) for s in HealthStatus}
+        statuses = [status_codes[s] for s in status]
+
+        return cls(
+            node_names=list(index),
+            node_codes=np.array(node_codes, dtype=np.int32),
+            timestamp_ns=_timestamps_to_ns(timestamps),
+            block_height=np.array(block_height, dtype=np.int64),
+            current_block_height=np.array(current_block_height, dtype=np.int64),
+            peers_count=np.array(peers_count, dtype=np.int64),
+            finality_lag=np.array(finality_lag, dtype=np.int64),
+            time_since_last_block=np.array(time_since_last_block, dtype=np.int64),
+            rpc_response_time=np.array(rpc_response_time, dtype=np.float64),
+            status=np.array(statuses, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_metrics(cls, metrics: Iterable[HealthMetrics]) -> "MetricsBatch":
+        """Build a batch from HealthMetrics records."""
+        return cls.from_rows(
+            (m.timestamp, m.node_name, m.block_height, m.current_block_height,
+             m.peers_count, m.finality_lag, m.time_since_last_block,
+             m.rpc_response_time, m.status)
+            for m in metrics
+        )
+
+    @classmethod
+    def empty(cls) -> "MetricsBatch":
+        return cls(
+            node_names=[],
+            node_codes=np.empty(0, dtype=np.int32),
+            **{name: np.empty(0, dtype=dtype) for name, dtype in cls.COLUMNS.items()},
+        )
+
+    def to_metrics(self) -> List[HealthMetrics]:
+        """Expand the batch back into HealthMetrics records."""
+        timestamps = self.timestamp_ns.view("datetime64[ns]").astype("datetime64[us]").tolist()
+        statuses = [str(s) for s in HealthStatus]
+
+        return [
+            HealthMetrics(
+                node_name=self.node_names[code],
+                block_height=block_height,
+                current_block_height=current_block_height,
+                peers_count=peers_count,
+                finality_lag=finality_lag,
+                time_since_last_block=time_since_last_block,
+                rpc_response_time=rpc_response_time,
+                status=statuses[status],
+                timestamp=timestamp,
+            )
+            for (code, timestamp, block_height, current_block_height, peers_count,
+                 finality_lag, time_since_last_block, rpc_response_time, status)
+            in zip(
+                self.node_codes.tolist(), timestamps, self.block_height.tolist(),
+                self.current_block_height.tolist(), self.peers_count.tolist(),
+                self.finality_lag.tolist(), self.time_since_last_block.tolist(),
+                self.rpc_response_time.tolist(), self.status.tolist(),
+            )
+        ]
+
+    def take(self, selector: np.ndarray) -> "MetricsBatch":
+        """Rows selected by a boolean mask or an index array."""
+        return MetricsBatch(
+            node_names=self.node_names,
+            node_codes=self.node_codes[selector],
+            **{name: getattr(self, name)[selector] for name in self.COLUMNS},
+        )
+
+    def for_node(self, node_name: str) -> "MetricsBatch":
+        """Rows of a single node (empty if the node is not in the batch)."""
+        if node_name not in self.node_names:
+            return MetricsBatch.empty()
+        return self.take(self.node_codes == self.node_names.index(node_name))
+
+    @classmethod
+    def concat(cls, batches: Sequence["MetricsBatch"]) -> "MetricsBatch":
+        """Join batches into one, merging their node name tables."""
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls.empty()
+
+        index: dict[str, int] = {}
+        node_codes = []
+        for batch in batches:
+            remap = np.array(
+                [index.setdefault(name, len(index)) for name in batch.node_names],
+                dtype=np.int32,
+            )
+            node_codes.append(remap[batch.node_codes])
+
+        return cls(
+            node_names=list(index),
+            node_codes=np.concatenate(node_codes),
+            **{
+                name: np.concatenate([getattr(batch, name) for batch in batches])
+                for name in cls.COLUMNS
+            },
+        )
+
+
+@dataclass
+class LatencyStats:
+    """
+    Distribution of one tick's RPC latency samples, in milliseconds.
+
+    Failed calls are counted in ``errors`` and never enter the percentiles.
+    """
+    samples: int                # Successful samples
+    errors: int                 # Failed or timed-out samples
+    min_ms: Optional[float]     # None when every sample failed
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    max_ms: Optional[float]
+    values_ms: list[float] = field(default_factory=list, repr=False)  # Raw samples
+
+
+@dataclass
+class MetricsRollup:
+    """
+    Aggregated metrics of one node over one time bucket.
+
+    Each metric carries avg/min/max over the bucket's samples. Latency
+    only covers samples whose probe succeeded (rpc_sample_count) and
+    block age only samples where it was known (block_age_sample_count);
+    both are -1 if there were none, like in HealthMetrics.
+    """
+    node_name: str
+    resolution: str             # "1m", "1h" or "1d"
+    bucket_start: datetime
+    sample_count: int
+    rpc_sample_count: int       # Samples with a measured latency
+    block_age_sample_count: int  # Samples with a known block age
+    rpc_response_time_avg: float
+    rpc_response_time_min: float
+    rpc_response_time_max: float
+    peers_count_avg: float
+    peers_count_min: int
+    peers_count_max: int
+    finality_lag_avg: float
+    finality_lag_min: int
+    finality_lag_max: int
+    time_since_last_block_avg: float
+    time_since_last_block_min: int
+    time_since_last_block_max: int
+    healthy_count: int
+    warning_count: int
+    critical_count: int
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional
 
-from models.metrics import HealthMetrics
+import numpy as np
+
+from models.metrics import HealthMetrics, MetricsBatch
 from config import (
     ALERT_THRESHOLD_FINALITY_LAG,
     ALERT_THRESHOLD_RPC_RESPONSE_TIME_MS,
@@ -22,6 +24,16 @@ class Alert:
     metric_name: str
 
 
+@dataclass
+class AlertThresholds:
+    """One set of alert thresholds; defaults are the configured ones."""
+    
+    finality_lag: int = ALERT_THRESHOLD_FINALITY_LAG
+    rpc_response_time_ms: float = ALERT_THRESHOLD_RPC_RESPONSE_TIME_MS
+    peers_min: int = ALERT_THRESHOLD_PEERS_MIN
+    block_age_seconds: float = ALERT_THRESHOLD_BLOCK_AGE_SECONDS
+
+
 class AlertSystem:
     """Generate alerts based on HealthMetrics thresholds."""
     
@@ -56,6 +68,33 @@ class AlertSystem:
         
         return alerts
     
+    @staticmethod
+    def check_alerts_batch(
+        batch: MetricsBatch,
+        thresholds: Optional[AlertThresholds] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized check_alerts: which samples would raise each alert.
+        
+        Args:
+            batch: Metrics to check.
+            thresholds: Thresholds to apply (defaults to the configured ones).
+            
+        Returns:
+            Boolean array per alert metric_name, one entry per sample.
+        """
+        t = thresholds or AlertThresholds()
+        
+        return {
+            "finality_lag": batch.finality_lag > t.finality_lag,
+            "rpc_response_time": batch.rpc_response_time > t.rpc_response_time_ms,
+            "peers_count": batch.peers_count < t.peers_min,
+            "block_age": (
+                (batch.time_since_last_block > t.block_age_seconds)
+                | (batch.time_since_last_block < 0)
+            ),
+        }
+    
     @staticmethod
     def _check_finality_lag(metrics: HealthMetrics) -> bool:
         """Check if finality lag exceeds threshold."""
@@ -73,8 +112,11 @@ class AlertSystem:
     
     @staticmethod
     def _check_block_age(metrics: HealthMetrics) -> bool:
-        """Check if time since last block exceeds threshold."""
-        return metrics.time_since_last_block > ALERT_THRESHOLD_BLOCK_AGE_SECONDS
+        """Check if time since last block exceeds threshold or is unknown."""
+        return (
+            metrics.time_since_last_block > ALERT_THRESHOLD_BLOCK_AGE_SECONDS
+            or metrics.time_since_last_block < 0
+        )
     
     @staticmethod
     def _create_alert_finality_lag(metrics: HealthMetrics) -> Alert:
@@ -114,11 +156,17 @@ class AlertSystem:
     
     @staticmethod
     def _create_alert_block_age(metrics: HealthMetrics) -> Alert:
-        """Create alert for stale blocks."""
+        """Create alert for stale blocks or an unknown block age."""
+        if metrics.time_since_last_block < 0:
+            message = "Time since last block unknown (no block timestamp)"
+        else:
+            message = (
+                f"Time since last block: {metrics.time_since_last_block}s "
+                f"(threshold: {ALERT_THRESHOLD_BLOCK_AGE_SECONDS}s)"
+            )
         return Alert(
             level="warning",
-            message=f"Time since last block: {metrics.time_since_last_block}s "
-                   f"(threshold: {ALERT_THRESHOLD_BLOCK_AGE_SECONDS}s)",
+            message=message,
             timestamp=metrics.timestamp,
             node_name=metrics.node_name,
             metric_name="block_age"
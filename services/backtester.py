@@ -0,0 +1,331 @@
+import logging
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.metrics import HealthStatus, MetricsBatch, to_epoch_ns
+from services.alerts import AlertSystem, AlertThresholds
+from services.csv_exporter import load_metrics_batch_from_csv
+from services.database import MetricsDB, INSERT_COLUMNS, READ_CHUNK_SIZE
+from services.history_store import HistoryStore
+
+logger = logging.getLogger(__name__)
+
+# Alert metric names as in Alert.metric_name, plus the union of all of them
+ALERT_METRICS = ("finality_lag", "rpc_response_time", "peers_count", "block_age")
+ANY_ALERT = "any"
+
+# An episode that starts this soon after the previous one cleared is a flap
+DEFAULT_FLAP_WINDOW_SECONDS = 300
+
+
+@dataclass
+class AlertSignalStats:
+    """How one alert signal behaved over a node's history."""
+    samples: int = 0            # Samples that raised the alert
+    episodes: int = 0           # Times the alert went from clear to firing
+    flaps: int = 0              # Episodes starting within the flap window of a clear
+    # Carried between chunks
+    firing: bool = field(default=False, repr=False)
+    last_cleared_ns: Optional[int] = field(default=None, repr=False)
+
+
+@dataclass
+class NodeBacktest:
+    """
+    Backtest result of one threshold set on one node.
+
+    Incidents are runs of samples whose recorded status is critical. An
+    incident is detected at its first sample that raises any alert;
+    time-to-detect is measured from the incident's first sample.
+    """
+    candidate: str
+    node_name: str
+    samples: int = 0
+    alerts: Dict[str, AlertSignalStats] = field(
+        default_factory=lambda: {name: AlertSignalStats() for name in ALERT_METRICS + (ANY_ALERT,)}
+    )
+    incidents: int = 0
+    detected: int = 0
+    detect_seconds: List[float] = field(default_factory=list, repr=False)
+    false_alert_samples: int = 0    # Alerting samples outside any incident
+    # Carried between chunks
+    _in_incident: bool = field(default=False, repr=False)
+    _incident_start_ns: int = field(default=0, repr=False)
+    _incident_detected: bool = field(default=False, repr=False)
+
+    @property
+    def missed(self) -> int:
+        return self.incidents - self.detected
+
+    @property
+    def mean_detect_seconds(self) -> Optional[float]:
+        return float(np.mean(self.detect_seconds)) if self.detect_seconds else None
+
+    @property
+    def max_detect_seconds(self) -> Optional[float]:
+        return max(self.detect_seconds) if self.detect_seconds else None
+
+
+def _shifted(values: np.ndarray, first: bool) -> np.ndarray:
+    """values moved one sample later, with `first` in front (the previous chunk's last)."""
+    previous = np.empty_like(values)
+    previous[0] = first
+    previous[1:] = values[:-1]
+    return previous
+
+
+def _update_signal(
+    stats: AlertSignalStats,
+    firing: np.ndarray,
+    timestamp_ns: np.ndarray,
+    flap_window_ns: int,
+) -> None:
+    """Fold one chunk of an alert signal into its running stats."""
+    previous = _shifted(firing, stats.firing)
+    start_ns = timestamp_ns[firing & ~previous]
+    cleared_ns = timestamp_ns[~firing & previous]
+
+    stats.samples += int(firing.sum())
+    stats.episodes += len(start_ns)
+
+    if stats.last_cleared_ns is not None:
+        cleared_ns = np.concatenate([[stats.last_cleared_ns], cleared_ns])
+
+    if len(start_ns) and len(cleared_ns):
+        # Most recent clear at or before each start
+        last_clear = np.searchsorted(cleared_ns, start_ns, side="right") - 1
+        after_clear = last_clear >= 0
+        gaps = start_ns[after_clear] - cleared_ns[last_clear[after_clear]]
+        stats.flaps += int((gaps < flap_window_ns).sum())
+
+    if len(cleared_ns):
+        stats.last_cleared_ns = int(cleared_ns[-1])
+    stats.firing = bool(firing[-1])
+
+
+def _update_incidents(
+    result: NodeBacktest,
+    critical: np.ndarray,
+    any_alert: np.ndarray,
+    timestamp_ns: np.ndarray,
+) -> None:
+    """Fold one chunk into the incident counts and detection times."""
+    starts = critical & ~_shifted(critical, result._in_incident)
+    start_ns = timestamp_ns[starts]
+
+    # Incident number per sample; samples before the chunk's first start
+    # belong to the incident carried over from the previous chunk
+    base = result.incidents
+    incident = base + np.cumsum(starts)
+    incident_start_ns = np.concatenate([[result._incident_start_ns], start_ns])
+
+    hits = critical & any_alert
+    hit_incident, first_hit = np.unique(incident[hits], return_index=True)
+    if result._incident_detected:
+        first_hit = first_hit[hit_incident != base]
+        hit_incident = hit_incident[hit_incident != base]
+
+    delays_ns = timestamp_ns[hits][first_hit] - incident_start_ns[hit_incident - base]
+    result.detect_seconds.extend((delays_ns / 1e9).tolist())
+    result.detected += len(hit_incident)
+    result.incidents += len(start_ns)
+    result.false_alert_samples += int((any_alert & ~critical).sum())
+
+    last_incident = int(incident[-1])
+    if last_incident != base:
+        result._incident_detected = False
+    result._incident_detected = (
+        result._incident_detected or bool(len(hit_incident) and hit_incident[-1] == last_incident)
+    )
+    result._incident_start_ns = int(incident_start_ns[last_incident - base])
+    result._in_incident = bool(critical[-1])
+
+
+class AlertBacktester:
+    """
+    Replays stored metrics against candidate alert threshold sets.
+
+    Every candidate is evaluated in the same pass with vectorized checks
+    (AlertSystem.check_alerts_batch), so the history is read once no
+    matter how many threshold sets are compared. Batches may hold several
+    nodes, but each node's samples must arrive oldest first.
+    """
+
+    def __init__(
+        self,
+        candidates: Dict[str, AlertThresholds],
+        flap_window_seconds: float = DEFAULT_FLAP_WINDOW_SECONDS,
+    ):
+        """
+        Args:
+            candidates: Threshold sets by name.
+            flap_window_seconds: Re-firing within this long after a clear
+                counts as a flap.
+        """
+        self.candidates = candidates
+        self.flap_window_ns = int(flap_window_seconds * 1e9)
+        self._results: Dict[Tuple[str, str], NodeBacktest] = {}
+
+    def feed(self, batch: MetricsBatch) -> None:
+        """Evaluate the next chunk of history."""
+        for code, node_name in enumerate(batch.node_names):
+            node_batch = batch if len(batch.node_names) == 1 else batch.take(batch.node_codes == code)
+            if len(node_batch):
+                self._feed_node(node_name, node_batch)
+
+    def _feed_node(self, node_name: str, batch: MetricsBatch) -> None:
+        critical = batch.status == HealthStatus.CRITICAL
+
+        for name, thresholds in self.candidates.items():
+            result = self._results.get((name, node_name))
+            if result is None:
+                result = self._results[(name, node_name)] = NodeBacktest(name, node_name)
+
+            signals = AlertSystem.check_alerts_batch(batch, thresholds)
+            signals[ANY_ALERT] = np.logical_or.reduce(list(signals.values()))
+
+            for metric, firing in signals.items():
+                _update_signal(result.alerts[metric], firing, batch.timestamp_ns, self.flap_window_ns)
+            _update_incidents(result, critical, signals[ANY_ALERT], batch.timestamp_ns)
+            result.samples += len(batch)
+
+    def results(self) -> List[NodeBacktest]:
+        """Results per candidate and node, in candidate order."""
+        order = {name: i for i, name in enumerate(self.candidates)}
+        return sorted(self._results.values(), key=lambda r: (order[r.candidate], r.node_name))
+
+
+def parse_candidate(spec: str, index: int = 1) -> Tuple[str, AlertThresholds]:
+    """
+    Parse a threshold set such as "strict:finality_lag=30,peers_min=8".
+
+    Fields not given keep their configured values; the "name:" prefix is
+    optional.
+
+    Raises:
+        ValueError: On an unknown field or a non-numeric value.
+    """
+    name, _, assignments = spec.rpartition(":")
+    name = name.strip() or f"candidate-{index}"
+    known = {f.name for f in fields(AlertThresholds)}
+    overrides = {}
+
+    for assignment in filter(None, (part.strip() for part in assignments.split(","))):
+        key, _, value = assignment.partition("=")
+        key = key.strip()
+        if key not in known:
+            raise ValueError(f"Unknown threshold '{key}' (expected one of {sorted(known)})")
+        overrides[key] = float(value)
+
+    return name, replace(AlertThresholds(), **overrides)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse an ISO 8601 time for a replay window.
+
+    Offset-bearing times are converted to naive UTC, the form timestamps
+    are stored in.
+    """
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+def iter_db_batches(
+    db: MetricsDB,
+    start: datetime,
+    end: Optional[datetime] = None,
+    nodes: Optional[Sequence[str]] = None,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> Iterator[MetricsBatch]:
+    """Stream a time range out of MetricsDB, node by node, oldest first."""
+    for node_name in nodes or sorted(db.get_all_nodes()):
+        yield from db.iter_metric_batches(
+            node_name, chunk_size=chunk_size, start=start, end=end, ascending=True
+        )
+
+
+def iter_history_batches(
+    store: HistoryStore,
+    start: datetime,
+    end: Optional[datetime] = None,
+    nodes: Optional[Sequence[str]] = None,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> Iterator[MetricsBatch]:
+    """
+    Stream a time range out of a HistoryStore, node by node, oldest first.
+
+    Stores scan newest first, so a node's range is read as plain tuples
+    and replayed in reverse.
+    """
+    for node_name in nodes or store.nodes():
+        rows = [
+            row
+            for chunk in store.scan(
+                node_name, start, end, columns=INSERT_COLUMNS, chunk_size=chunk_size
+            )
+            for row in chunk
+        ]
+        rows.reverse()
+        for i in range(0, len(rows), chunk_size):
+            yield MetricsBatch.from_rows(rows[i:i + chunk_size])
+
+
+def iter_csv_batches(
+    filepath: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    nodes: Optional[Sequence[str]] = None,
+) -> Iterator[MetricsBatch]:
+    """
+    Read a time range out of a CSV export, one node at a time, oldest first.
+
+    Exports are not ordered per node, so the file is loaded into column
+    arrays (about 60 bytes per row) and sorted before it is replayed.
+    """
+    batch = load_metrics_batch_from_csv(filepath)
+
+    keep = np.ones(len(batch), dtype=bool)
+    if start is not None:
+        keep &= batch.timestamp_ns >= to_epoch_ns(start)
+    if end is not None:
+        keep &= batch.timestamp_ns < to_epoch_ns(end)
+
+    selected = np.flatnonzero(keep)
+    batch = batch.take(selected[np.argsort(batch.timestamp_ns[selected], kind="stable")])
+
+    for node_name in nodes or sorted(batch.node_names):
+        node_batch = batch.for_node(node_name)
+        if len(node_batch):
+            yield node_batch
+
+
+def format_report(results: Sequence[NodeBacktest]) -> str:
+    """Plain-text table of backtest results."""
+    header = (
+        f"{'candidate':<16} {'node':<24} {'samples':>9} {'alerts':>8} {'episodes':>8} "
+        f"{'flaps':>6} {'incidents':>9} {'missed':>6} {'ttd avg':>8} {'ttd max':>8} {'false':>7}"
+    )
+    lines = [header, "-" * len(header)]
+
+    for r in results:
+        any_alert = r.alerts[ANY_ALERT]
+        mean_ttd = f"{r.mean_detect_seconds:.0f}s" if r.mean_detect_seconds is not None else "-"
+        max_ttd = f"{r.max_detect_seconds:.0f}s" if r.max_detect_seconds is not None else "-"
+        lines.append(
+            f"{r.candidate:<16} {r.node_name:<24} {r.samples:>9} {any_alert.samples:>8} "
+            f"{any_alert.episodes:>8} {any_alert.flaps:>6} {r.incidents:>9} {r.missed:>6} "
+            f"{mean_ttd:>8} {max_ttd:>8} {r.false_alert_samples:>7}"
+        )
+        breakdown = ", ".join(
+            f"{metric}={r.alerts[metric].samples}/{r.alerts[metric].episodes}"
+            for metric in ALERT_METRICS
+        )
+        lines.append(f"{'':<16} {'':<24} alerts/episodes: {breakdown}")
+
+    return "\n".join(lines)
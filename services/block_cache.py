@@ -0,0 +1,155 @@
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for one LRU cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+class LRUCache:
+    """Bounded least-recently-used mapping with hit/miss counters."""
+
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: Entries kept before the least recently used is evicted.
+        """
+        self.max_size = max(1, max_size)
+        self.stats = CacheStats()
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value (marking it recently used), or None."""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+        self.stats.size = len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class BlockCache:
+    """
+    Immutable block data for one chain.
+
+    A header (and the block's Timestamp.Now) never changes for a given
+    hash, so hash -> header and hash -> timestamp are always safe to
+    cache. Number -> hash only holds for finalized blocks (best blocks
+    can be reorged), so only numbers at or below the highest finalized
+    block seen are stored.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: Entries kept in each of the caches.
+        """
+        self.headers = LRUCache(max_size)
+        self.hashes = LRUCache(max_size)
+        self.timestamps = LRUCache(max_size)
+        # Highest finalized number seen; anything at or below it is final
+        self.finalized_number = -1
+
+    def get_header(self, block_hash: str) -> Optional[Dict[str, Any]]:
+        """Cached header for a block hash, or None."""
+        return self.headers.get(block_hash)
+
+    def put_header(self, block_hash: str, header: Dict[str, Any]) -> None:
+        """Cache a header by its block hash."""
+        self.headers.put(block_hash, header)
+
+    def get_hash(self, block_number: int) -> Optional[str]:
+        """Cached hash for a finalized block number, or None."""
+        return self.hashes.get(block_number)
+
+    def put_hash(self, block_number: int, block_hash: str) -> None:
+        """Cache the hash of a block number, if that number is finalized."""
+        if block_number <= self.finalized_number:
+            self.hashes.put(block_number, block_hash)
+
+    def put_finalized(self, block_hash: str, header: Dict[str, Any]) -> None:
+        """Cache a finalized header and its number -> hash mapping."""
+        block_number = int(header["number"], 16)
+        self.finalized_number = max(self.finalized_number, block_number)
+        self.put_header(block_hash, header)
+        self.hashes.put(block_number, block_hash)
+
+    def get_timestamp(self, block_hash: str) -> Optional[int]:
+        """Cached block timestamp (ms) for a block hash, or None."""
+        return self.timestamps.get(block_hash)
+
+    def put_timestamp(self, block_hash: str, timestamp_ms: int) -> None:
+        """Cache a block's timestamp (ms) by its block hash."""
+        self.timestamps.put(block_hash, timestamp_ms)
+
+    def stats(self) -> Dict[str, CacheStats]:
+        """Counters for the header, block-hash and timestamp caches."""
+        return {
+            "headers": self.headers.stats,
+            "hashes": self.hashes.stats,
+            "timestamps": self.timestamps.stats,
+        }
+
+
+class BlockCacheRegistry:
+    """
+    One BlockCache per chain, keyed by genesis hash.
+
+    Clients for different endpoints of the same chain share a cache, so
+    a header fetched by one node is a hit for the others.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: Entries per cache in each chain's BlockCache.
+        """
+        self.max_size = max_size
+        self._caches: dict[str, BlockCache] = {}
+
+    def for_chain(self, genesis_hash: str) -> BlockCache:
+        """Get the cache for a chain, creating it on first use."""
+        key = genesis_hash.lower()
+
+        if key not in self._caches:
+            logger.debug(f"Creating block cache for chain {key}")
+            self._caches[key] = BlockCache(self.max_size)
+
+        return self._caches[key]
+
+    def stats(self) -> Dict[str, Dict[str, CacheStats]]:
+        """Cache counters per chain genesis hash."""
+        return {key: cache.stats() for key, cache in self._caches.items()}
+
+    def __len__(self) -> int:
+        return len(self._caches)
@@ -0,0 +1,116 @@
+import logging
+import time
+from typing import Callable, Optional
+
+from services.error_handler import ErrorHandler
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    - closed: requests flow normally; consecutive failures are counted.
+    - open: after failure_threshold failures, requests are refused until a
+      backoff delay has passed. The delay grows exponentially (with jitter)
+      every time the circuit re-opens.
+    - half_open: once the delay has passed, a single trial request is let
+      through. Success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        base_delay: float = 5.0,
+        max_delay: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: Endpoint name for logging.
+            failure_threshold: Consecutive failures that open the circuit.
+            base_delay: Open period after the first trip, in seconds.
+            max_delay: Maximum open period, in seconds.
+            clock: Monotonic clock returning seconds.
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.clock = clock
+
+        self.failures = 0
+        self.trips = 0  # consecutive times the circuit opened
+        self._opened_until: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        """Current state: closed, open or half_open."""
+        if self._opened_until is None:
+            return self.CLOSED
+        if self.clock() < self._opened_until:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial request is allowed (0 if allowed now)."""
+        if self._opened_until is None:
+            return 0.0
+        return max(0.0, self._opened_until - self.clock())
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a request may go to the endpoint now.
+
+        In half_open state only the first caller gets True until the trial
+        outcome is recorded.
+        """
+        state = self.state
+
+        if state == self.CLOSED:
+            return True
+
+        if state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            logger.info(f"Circuit for {self.name} half-open, trying a request")
+            return True
+
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit and reset failure counters."""
+        if self._opened_until is not None:
+            logger.info(f"Circuit for {self.name} closed, endpoint recovered")
+
+        self.failures = 0
+        self.trips = 0
+        self._opened_until = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure; open the circuit when the threshold is reached."""
+        self.failures += 1
+        trial_failed = self._trial_in_flight
+        self._trial_in_flight = False
+
+        if trial_failed or self.failures >= self.failure_threshold:
+            delay = ErrorHandler.backoff_delay(
+                self.trips, self.base_delay, self.max_delay
+            )
+            self.trips += 1
+            self._opened_until = self.clock() + delay
+            logger.warning(
+                f"Circuit for {self.name} open for {delay:.0f}s "
+                f"after {self.failures} consecutive failures"
+            )
+
+    def cancel_trial(self) -> None:
+        """Give back the half-open trial slot without recording an outcome."""
+        self._trial_in_flight = False
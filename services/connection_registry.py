@@ -0,0 +1,81 @@
+import logging
+from typing import Any, Callable
+
+from services.rpc_client import PolkadotRPCClient
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionRegistry:
+    """
+    Shares one RPC client per endpoint URL across all nodes using it.
+
+    Clients are reference counted: the first acquire() creates the client,
+    and the last release() disconnects it.
+    """
+
+    def __init__(self, client_factory: Callable[..., Any] = PolkadotRPCClient):
+        """
+        Args:
+            client_factory: Callable creating a client from (rpc_url, **kwargs).
+        """
+        self.client_factory = client_factory
+        self._clients: dict[str, Any] = {}
+        self._refcounts: dict[str, int] = {}
+
+    @staticmethod
+    def _key(rpc_url: str) -> str:
+        """Normalize an endpoint URL so trivial spelling differences share a client."""
+        return rpc_url.strip().rstrip("/")
+
+    def acquire(self, rpc_url: str, **client_kwargs: Any) -> Any:
+        """
+        Get the shared client for an endpoint, creating it on first use.
+
+        Args:
+            rpc_url: Endpoint URL.
+            **client_kwargs: Passed to the client factory on creation only.
+
+        Returns:
+            The shared client.
+        """
+        key = self._key(rpc_url)
+
+        if key not in self._clients:
+            self._clients[key] = self.client_factory(rpc_url, **client_kwargs)
+            self._refcounts[key] = 0
+        else:
+            logger.debug(f"Reusing connection to {rpc_url}")
+
+        self._refcounts[key] += 1
+        return self._clients[key]
+
+    async def release(self, rpc_url: str) -> None:
+        """Drop one reference; disconnect the client when none are left."""
+        key = self._key(rpc_url)
+
+        if key not in self._clients:
+            return
+
+        self._refcounts[key] -= 1
+        if self._refcounts[key] > 0:
+            return
+
+        client = self._clients.pop(key)
+        del self._refcounts[key]
+        await client.disconnect()
+
+    async def close_all(self) -> None:
+        """Disconnect every client regardless of reference counts."""
+        for client in self._clients.values():
+            await client.disconnect()
+        self._clients.clear()
+        self._refcounts.clear()
+
+    def refcount(self, rpc_url: str) -> int:
+        """Number of holders of the client for an endpoint."""
+        return self._refcounts.get(self._key(rpc_url), 0)
+
+    def __len__(self) -> int:
+        """Number of distinct endpoints with an open client."""
+        return len(self._clients)
@@ -1,14 +1,23 @@
 import csv
 from pathlib import Path
-from typing import List
+from itertools import chain
+from typing import Iterable, List
 from datetime import datetime
 
-from models.metrics import HealthMetrics
+from models.metrics import HealthMetrics, MetricsBatch
 
 
-def export_metrics_to_csv(metrics_list: List[HealthMetrics], filepath: str) -> None:
-    """Export metrics to CSV file for analysis."""
-    if not metrics_list:
+def export_metrics_to_csv(metrics_list: Iterable[HealthMetrics], filepath: str) -> None:
+    """
+    Export metrics to CSV file for analysis.
+
+    Rows are written as they are consumed, so a generator (e.g. chained
+    chunks from MetricsDB.iter_metrics_for_node) is exported in constant
+    memory.
+    """
+    metrics_iter = iter(metrics_list)
+    first = next(metrics_iter, None)
+    if first is None:
         return
 
     # Ensure directory exists
@@ -30,7 +39,7 @@ def export_metrics_to_csv(metrics_list: List[HealthMetrics], filepath: str) -> N
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
 
-        for metric in metrics_list:
+        for metric in chain([first], metrics_iter):
             row = {
                 'timestamp': metric.timestamp.isoformat(),
                 'node_name': metric.node_name,
@@ -70,3 +79,28 @@ def load_metrics_from_csv(filepath: str) -> List[HealthMetrics]:
             metrics_list.append(metric)
 
     return metrics_list
+
+
+def load_metrics_batch_from_csv(filepath: str) -> MetricsBatch:
+    """Load metrics from CSV file straight into a column-oriented MetricsBatch."""
+    if not Path(filepath).exists():
+        return MetricsBatch.empty()
+
+    with open(filepath, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+
+        # Timestamps stay ISO text; the batch parses them all at once
+        return MetricsBatch.from_rows(
+            (
+                row['timestamp'],
+                row['node_name'],
+                int(row['block_height']),
+                int(row['current_block_height']),
+                int(row['peers_count']),
+                int(row['finality_lag']),
+                int(row['time_since_last_block']),
+                float(row['rpc_response_time']),
+                row['status'],
+            )
+            for row in reader
+        )
@@ -1,12 +1,41 @@
-from datetime import datetime, timedelta
-from typing import List, Optional
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import date, datetime, timedelta
+from itertools import groupby, islice
+from typing import Iterable, Iterator, List, Optional, Sequence
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, select
-from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy import (
+    create_engine, event, func, select, type_coerce, union_all,
+    Column, Index, Integer, MetaData, Select, String, Float, DateTime, Table,
+)
+from sqlalchemy.orm import declarative_base, declared_attr, Session
 from sqlalchemy.pool import StaticPool
 
-from models.metrics import HealthMetrics
-from config import DB_DIR
+from models.metrics import HealthMetrics, MetricsBatch, MetricsRollup
+from config import (
+    DB_DIR,
+    DB_WRITE_BATCH_SIZE,
+    DB_WRITE_FLUSH_SECONDS,
+    DB_PARTITION_BY_DAY,
+)
+
+logger = logging.getLogger(__name__)
+
+# Applied to every new SQLite connection. WAL lets readers run alongside
+# the writer; synchronous=NORMAL only fsyncs at checkpoints in WAL mode.
+SQLITE_PRAGMAS = {
+    # Lets retention hand freed pages back with PRAGMA incremental_vacuum;
+    # takes effect on new databases, existing ones are converted once
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -20000,      # KiB (negative), ~20 MB page cache
+    "busy_timeout": 5000,      # ms to wait on a locked database
+}
 
 
 Base = declarative_base()
@@ -17,9 +46,15 @@ class MetricsRecord(Base):
     
     __tablename__ = "metrics"
     
+    # Per-node reads filter on node_name and order by timestamp, so they
+    # are served by one range scan of the composite index
+    __table_args__ = (
+        Index("ix_metrics_node_name_timestamp", "node_name", "timestamp"),
+    )
+    
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, nullable=False, index=True)
-    node_name = Column(String(255), nullable=False, index=True)
+    node_name = Column(String(255), nullable=False)
     block_height = Column(Integer, nullable=False)
     current_block_height = Column(Integer, nullable=False)
     peers_count = Column(Integer, nullable=False)
@@ -29,63 +64,559 @@ class MetricsRecord(Base):
     status = Column(String(50), nullable=False)
 
 
+# Rolled-up metrics and the aggregates kept for each
+ROLLUP_METRICS = ("rpc_response_time", "peers_count", "finality_lag", "time_since_last_block")
+ROLLUP_STATUSES = ("healthy", "warning", "critical")
+
+
+class RollupMixin:
+    """Columns shared by the rollup tables: one row per node and time bucket."""
+    
+    @declared_attr
+    def __table_args__(cls):
+        # Retention expires buckets by time across all nodes
+        return (Index(f"ix_{cls.__tablename__}_bucket_start", "bucket_start"),)
+    
+    node_name = Column(String(255), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    sample_count = Column(Integer, nullable=False)
+    rpc_sample_count = Column(Integer, nullable=False)  # Samples with a latency
+    block_age_sample_count = Column(Integer, nullable=False)  # Samples with a block age
+    rpc_response_time_sum = Column(Float, nullable=False)
+    peers_count_sum = Column(Integer, nullable=False)
+    finality_lag_sum = Column(Integer, nullable=False)
+    time_since_last_block_sum = Column(Integer, nullable=False)
+    rpc_response_time_min = Column(Float, nullable=False)
+    peers_count_min = Column(Integer, nullable=False)
+    finality_lag_min = Column(Integer, nullable=False)
+    time_since_last_block_min = Column(Integer, nullable=False)
+    rpc_response_time_max = Column(Float, nullable=False)
+    peers_count_max = Column(Integer, nullable=False)
+    finality_lag_max = Column(Integer, nullable=False)
+    time_since_last_block_max = Column(Integer, nullable=False)
+    healthy_count = Column(Integer, nullable=False)
+    warning_count = Column(Integer, nullable=False)
+    critical_count = Column(Integer, nullable=False)
+
+
+class MetricsRollup1m(RollupMixin, Base):
+    """Per-minute aggregates."""
+    
+    __tablename__ = "metrics_rollup_1m"
+
+
+class MetricsRollup1h(RollupMixin, Base):
+    """Per-hour aggregates."""
+    
+    __tablename__ = "metrics_rollup_1h"
+
+
+class MetricsRollup1d(RollupMixin, Base):
+    """Per-day aggregates."""
+    
+    __tablename__ = "metrics_rollup_1d"
+
+
+# Resolution -> (model, bucket width, stored-timestamp prefix length,
+# suffix completing the bucket start), finest first. The prefix/suffix
+# truncate timestamps stored as 'YYYY-MM-DD HH:MM:SS.ffffff' in SQL.
+ROLLUP_RESOLUTIONS = {
+    "1m": (MetricsRollup1m, timedelta(minutes=1), 16, ":00.000000"),
+    "1h": (MetricsRollup1h, timedelta(hours=1), 13, ":00:00.000000"),
+    "1d": (MetricsRollup1d, timedelta(days=1), 10, " 00:00:00.000000"),
+}
+
+# Rollup value columns: counts, sums, mins, maxs, status counts
+ROLLUP_VALUE_COLUMNS = (
+    ["sample_count", "rpc_sample_count", "block_age_sample_count"]
+    + [f"{metric}_sum" for metric in ROLLUP_METRICS]
+    + [f"{metric}_min" for metric in ROLLUP_METRICS]
+    + [f"{metric}_max" for metric in ROLLUP_METRICS]
+    + [f"{status}_count" for status in ROLLUP_STATUSES]
+)
+
+
+# A failed latency probe is stored as rpc_response_time = -1.0 and an
+# unknown block age as time_since_last_block = -1. Their aggregates only
+# cover the samples that have a value (counted per metric below); min
+# and max are -1 for a bucket without any.
+SAMPLED_METRICS = {
+    "rpc_response_time": "rpc_sample_count",
+    "time_since_last_block": "block_age_sample_count",
+}
+
+
+def _rollup_aggregate_sql(column: str) -> str:
+    """Aggregate over raw rows that produces one rollup value column."""
+    if column == "sample_count":
+        return "count(*)"
+    for metric, sample_column in SAMPLED_METRICS.items():
+        if column == sample_column:
+            return f"sum({metric} >= 0)"
+    if column.endswith("_count"):
+        return f"sum(status = '{column[:-len('_count')]}')"
+    
+    metric, _, aggregate = column.rpartition("_")
+    if metric not in SAMPLED_METRICS:
+        return f"{aggregate}({metric})"
+    
+    sampled = f"CASE WHEN {metric} >= 0 THEN {metric} END"
+    if aggregate == "sum":
+        return f"total({sampled})"
+    return f"coalesce({aggregate}({sampled}), -1)"
+
+
+def _rollup_merge_sql(column: str) -> str:
+    """How an upsert combines an existing aggregate with a new one."""
+    metric, _, aggregate = column.rpartition("_")
+    if metric in SAMPLED_METRICS and aggregate in ("min", "max"):
+        # -1 means "no sample" and must not win min()
+        sample_column = SAMPLED_METRICS[metric]
+        return (
+            f"{column} = CASE WHEN excluded.{sample_column} = 0 THEN {column} "
+            f"WHEN {sample_column} = 0 THEN excluded.{column} "
+            f"ELSE {aggregate}({column}, excluded.{column}) END"
+        )
+    if column.endswith("_min"):
+        return f"{column} = min({column}, excluded.{column})"
+    if column.endswith("_max"):
+        return f"{column} = max({column}, excluded.{column})"
+    return f"{column} = {column} + excluded.{column}"
+
+
+def _rollup_upsert_sql(
+    table: str, prefix_length: int, suffix: str, source: str = "metrics"
+) -> str:
+    """
+    Aggregate source rows with id > ? per node and bucket, merged into a rollup table.
+    
+    The aggregation runs inside SQLite, so rolling up a chunk costs one
+    grouped scan of the rows just inserted. NOT INDEXED keeps that scan
+    on the rowid range: otherwise SQLite may walk the whole
+    (node_name, timestamp) index to avoid sorting for the GROUP BY,
+    which makes each chunk slower the larger the table gets.
+    """
+    aggregates = [_rollup_aggregate_sql(column) for column in ROLLUP_VALUE_COLUMNS]
+    return (
+        f"INSERT INTO {table} (node_name, bucket_start, {', '.join(ROLLUP_VALUE_COLUMNS)}) "
+        f"SELECT node_name, substr(timestamp, 1, {prefix_length}) || '{suffix}' AS bucket, "
+        f"{', '.join(aggregates)} "
+        f"FROM {source} NOT INDEXED WHERE id > ? GROUP BY node_name, bucket "
+        f"ON CONFLICT (node_name, bucket_start) DO UPDATE SET "
+        + ", ".join(_rollup_merge_sql(column) for column in ROLLUP_VALUE_COLUMNS)
+    )
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    """Start of the rollup bucket containing a timestamp."""
+    if resolution == "1m":
+        return timestamp.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    if resolution == "1d":
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup resolution: {resolution}")
+
+
+# Bulk insert statement, in the column order of the tuples built by insert_batch
+INSERT_COLUMNS = (
+    "timestamp",
+    "node_name",
+    "block_height",
+    "current_block_height",
+    "peers_count",
+    "finality_lag",
+    "time_since_last_block",
+    "rpc_response_time",
+    "status",
+)
+# Rows per executemany call, so generators of any size use bounded memory
+INSERT_CHUNK_SIZE = 10000
+# Rows fetched per round trip by the streaming read API
+READ_CHUNK_SIZE = 5000
+
+
+def _insert_sql(table: str) -> str:
+    """Prepared bulk INSERT into the metrics table or a day partition."""
+    return (
+        f"INSERT INTO {table} ({', '.join(INSERT_COLUMNS)}) "
+        f"VALUES ({', '.join('?' for _ in INSERT_COLUMNS)})"
+    )
+
+
+# Day partitions: raw rows of one day in metrics_YYYYMMDD, so expiring a
+# day is a DROP TABLE instead of a large DELETE
+PARTITION_PREFIX = "metrics_"
+PARTITION_GLOB = PARTITION_PREFIX + "[0-9]" * 8
+
+
+def partition_name(day: date) -> str:
+    """Name of the raw-metrics table for one day."""
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def is_partition(name: str) -> bool:
+    """True for metrics_YYYYMMDD table names."""
+    suffix = name[len(PARTITION_PREFIX):]
+    return name.startswith(PARTITION_PREFIX) and len(suffix) == 8 and suffix.isdigit()
+
+
+def partition_day(name: str) -> date:
+    """Day stored in a partition table, parsed from its name."""
+    return datetime.strptime(name[len(PARTITION_PREFIX):], "%Y%m%d").date()
+
+
+def _partition_table(name: str) -> Table:
+    """Table object with the metrics columns under another name."""
+    return Table(
+        name,
+        MetaData(),
+        *(
+            Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable)
+            for c in MetricsRecord.__table__.columns
+        ),
+    )
+
+
 class MetricsDB:
     """Database interface for metrics storage and retrieval."""
     
-    def __init__(self, db_path: Optional[str] = None):
-        """Initialize database connection."""
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        write_batch_size: int = DB_WRITE_BATCH_SIZE,
+        write_flush_seconds: float = DB_WRITE_FLUSH_SECONDS,
+        partition_by_day: bool = DB_PARTITION_BY_DAY,
+    ):
+        """
+        Initialize database connection.
+        
+        Args:
+            db_path: SQLite file path, defaults to db/inspector.db.
+            write_batch_size: Most rows committed per write-behind batch.
+            write_flush_seconds: Longest a queued row waits to be committed.
+            partition_by_day: Write raw rows into per-day tables.
+        """
         if db_path is None:
             db_path = str(DB_DIR / "inspector.db")
         
         self.db_path = db_path
+        self.partition_by_day = partition_by_day
+        # File databases get a connection per thread so the writer and
+        # retention threads never share one; :memory: must share its only one
+        pool_args = {"poolclass": StaticPool} if db_path == ":memory:" else {}
         self.engine = create_engine(
             f"sqlite:///{db_path}",
             connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
+            **pool_args,
         )
+        event.listen(self.engine, "connect", self._set_sqlite_pragmas)
+        # Same datetime -> TEXT conversion the ORM applies, for raw SQL
+        timestamp_type = MetricsRecord.__table__.c.timestamp.type
+        self.db_timestamp = timestamp_type.dialect_impl(
+            self.engine.dialect
+        ).bind_processor(self.engine.dialect)
+        
+        # Write-behind queue drained by a single writer thread
+        self.write_batch_size = max(1, write_batch_size)
+        self.write_flush_seconds = write_flush_seconds
+        self._write_queue: "queue.Queue[Optional[HealthMetrics]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self.rows_written = 0
+        self.write_errors = 0
+        # One bulk insert at a time: rollups aggregate ids above the max
+        # seen at the start of each chunk
+        self._insert_lock = threading.Lock()
+        self._partitions: dict[str, Table] = {}
+    
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """Apply SQLITE_PRAGMAS to a new DBAPI connection."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in SQLITE_PRAGMAS.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
     
     def create_tables(self) -> None:
-        """Create all database tables."""
+        """Create all database tables and migrate existing ones."""
         Base.metadata.create_all(self.engine)
+        self._migrate()
+        self._enable_incremental_vacuum()
+    
+    def _enable_incremental_vacuum(self) -> None:
+        """Switch an older database to auto_vacuum=INCREMENTAL (one full VACUUM)."""
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+                return
+            
+            logger.warning(f"Converting {self.db_path} to incremental vacuum, this runs VACUUM once")
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+    
+    def _migrate(self) -> None:
+        """
+        Bring a database created by an older version up to date.
+        
+        create_all() does not add indexes to tables that already exist.
+        The composite (node_name, timestamp) index replaces the old
+        node_name index, which it covers as a prefix. Empty rollup tables
+        are backfilled from the raw rows and get their bucket_start index.
+        """
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_metrics_node_name_timestamp "
+                "ON metrics (node_name, timestamp)"
+            )
+            conn.exec_driver_sql("DROP INDEX IF EXISTS ix_metrics_node_name")
+            
+            # Rollup tables added to a database that already has raw rows
+            for model, _, prefix_length, suffix in ROLLUP_RESOLUTIONS.values():
+                table = model.__tablename__
+                conn.exec_driver_sql(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_bucket_start ON {table} (bucket_start)"
+                )
+                columns = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+                for sample_column in SAMPLED_METRICS.values():
+                    if sample_column in columns:
+                        continue
+                    # Older buckets averaged sentinels (-1) in; they keep
+                    # those values, new rows are merged correctly
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {table} ADD COLUMN {sample_column} INTEGER NOT NULL DEFAULT 0"
+                    )
+                    conn.exec_driver_sql(f"UPDATE {table} SET {sample_column} = sample_count")
+                if conn.exec_driver_sql(f"SELECT 1 FROM {table} LIMIT 1").first() is None:
+                    conn.exec_driver_sql(_rollup_upsert_sql(table, prefix_length, suffix), (0,))
     
     def insert_metrics(self, metrics: HealthMetrics) -> None:
         """Insert a single metrics record into database."""
-        record = MetricsRecord(
-            timestamp=metrics.timestamp,
-            node_name=metrics.node_name,
-            block_height=metrics.block_height,
-            current_block_height=metrics.current_block_height,
-            peers_count=metrics.peers_count,
-            finality_lag=metrics.finality_lag,
-            time_since_last_block=metrics.time_since_last_block,
-            rpc_response_time=metrics.rpc_response_time,
-            status=metrics.status,
+        self.insert_batch([metrics])
+    
+    def insert_batch(self, metrics_list: Iterable[HealthMetrics]) -> int:
+        """
+        Insert multiple metrics records in a single transaction.
+        
+        Bulk path: rows go straight from HealthMetrics into plain tuples
+        for a prepared INSERT run with executemany, without building ORM
+        objects. Large inputs are sent in chunks of INSERT_CHUNK_SIZE.
+        Each chunk is then merged into the 1m/1h/1d rollup tables in the
+        same transaction. With partition_by_day, rows go to the table of
+        their day.
+        
+        Returns:
+            Number of rows inserted.
+        """
+        inserted = 0
+        metrics_iter = iter(metrics_list)
+        
+        with self._insert_lock, self.engine.begin() as conn:
+            while True:
+                chunk = list(islice(metrics_iter, INSERT_CHUNK_SIZE))
+                if not chunk:
+                    break
+                
+                if not self.partition_by_day:
+                    self._insert_rows(conn, MetricsRecord.__tablename__, chunk)
+                else:
+                    chunk.sort(key=lambda m: m.timestamp.date())
+                    for day, day_rows in groupby(chunk, key=lambda m: m.timestamp.date()):
+                        table = self._ensure_partition(conn, day)
+                        self._insert_rows(conn, table.name, list(day_rows))
+                
+                inserted += len(chunk)
+        
+        return inserted
+    
+    def _insert_rows(self, conn, table: str, chunk: List[HealthMetrics]) -> None:
+        """Insert a chunk into one raw table and merge it into the rollups."""
+        to_db_timestamp = self.db_timestamp
+        
+        # New rows get ids above the current max inside this transaction
+        last_id = conn.exec_driver_sql(f"SELECT coalesce(max(id), 0) FROM {table}").scalar_one()
+        conn.exec_driver_sql(
+            _insert_sql(table),
+            [
+                (
+                    to_db_timestamp(m.timestamp),
+                    m.node_name,
+                    m.block_height,
+                    m.current_block_height,
+                    m.peers_count,
+                    m.finality_lag,
+                    m.time_since_last_block,
+                    m.rpc_response_time,
+                    m.status,
+                )
+                for m in chunk
+            ],
         )
         
-        with Session(self.engine) as session:
-            session.add(record)
-            session.commit()
-    
-    def insert_batch(self, metrics_list: List[HealthMetrics]) -> None:
-        """Insert multiple metrics records in a single transaction."""
-        records = [
-            MetricsRecord(
-                timestamp=m.timestamp,
-                node_name=m.node_name,
-                block_height=m.block_height,
-                current_block_height=m.current_block_height,
-                peers_count=m.peers_count,
-                finality_lag=m.finality_lag,
-                time_since_last_block=m.time_since_last_block,
-                rpc_response_time=m.rpc_response_time,
-                status=m.status,
+        for model, _, prefix_length, suffix in ROLLUP_RESOLUTIONS.values():
+            conn.exec_driver_sql(
+                _rollup_upsert_sql(model.__tablename__, prefix_length, suffix, source=table),
+                (last_id,),
+            )
+    
+    def _ensure_partition(self, conn, day: date) -> Table:
+        """Create the partition table of a day if needed."""
+        name = partition_name(day)
+        table = self._partitions.get(name)
+        
+        if table is None:
+            table = _partition_table(name)
+            table.create(conn, checkfirst=True)
+            conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_{name}_node_name_timestamp "
+                f"ON {name} (node_name, timestamp)"
+            )
+            self._partitions[name] = table
+        
+        return table
+    
+    def list_partitions(self, conn=None) -> List[str]:
+        """Names of the per-day raw tables, oldest first."""
+        if conn is None:
+            with self.engine.connect() as conn:
+                return self.list_partitions(conn)
+        
+        return [
+            row[0] for row in conn.exec_driver_sql(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? "
+                "ORDER BY name",
+                (PARTITION_GLOB,),
             )
-            for m in metrics_list
         ]
+    
+    def drop_partition(self, name: str) -> None:
+        """Drop one day partition (cheap expiry of a whole day)."""
+        if not is_partition(name):
+            raise ValueError(f"Not a partition table: {name}")
         
-        with Session(self.engine) as session:
-            session.add_all(records)
-            session.commit()
+        with self._insert_lock, self.engine.begin() as conn:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {name}")
+        self._partitions.pop(name, None)
+    
+    def _source_tables(
+        self,
+        conn,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Table]:
+        """Raw tables to read: the metrics table plus day partitions in a time range."""
+        tables = [MetricsRecord.__table__]
+        
+        for name in self.list_partitions(conn):
+            day = partition_day(name)
+            if since is not None and day < since.date():
+                continue
+            if until is not None and day > until.date():
+                continue
+            
+            table = self._partitions.get(name)
+            tables.append(table if table is not None else _partition_table(name))
+        
+        return tables
+    
+    def enqueue(self, metrics: HealthMetrics) -> None:
+        """
+        Queue a metrics record for the background writer.
+        
+        Never blocks, so it is safe to call from the event loop. Rows are
+        committed in batches of up to write_batch_size, at most
+        write_flush_seconds after they were queued.
+        """
+        self._ensure_writer()
+        self._write_queue.put_nowait(metrics)
+    
+    def flush(self) -> None:
+        """Block until every queued record has been written."""
+        if self._writer is not None:
+            self._write_queue.join()
+    
+    def close(self) -> None:
+        """Write pending records, stop the writer thread and dispose the engine."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        
+        if writer is not None:
+            atexit.unregister(self._stop_writer)
+            self._stop_writer(writer)
+        
+        self.engine.dispose()
+    
+    def _stop_writer(self, writer: threading.Thread) -> None:
+        """Let the writer thread write what is queued, then stop it."""
+        self._write_queue.put(None)
+        writer.join()
+    
+    def _ensure_writer(self) -> None:
+        """Start the writer thread on first use."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop,
+                    name=f"metrics-writer-{self.db_path}",
+                    daemon=True,
+                )
+                self._writer.start()
+                # The daemon thread would be killed at exit with rows still
+                # queued; stop it first if close() is never called
+                atexit.register(self._stop_writer, self._writer)
+    
+    def _writer_loop(self) -> None:
+        """Drain the queue in size- or time-bounded batches until stopped."""
+        stopping = False
+        
+        while not stopping:
+            item = self._write_queue.get()
+            batch: List[HealthMetrics] = []
+            taken = 1
+            
+            if item is None:
+                stopping = True
+            else:
+                batch.append(item)
+                deadline = time.monotonic() + self.write_flush_seconds
+                
+                while len(batch) < self.write_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._write_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    
+                    taken += 1
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+            
+            if stopping:
+                # Rows queued behind the stop marker still get written
+                while True:
+                    try:
+                        item = self._write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    taken += 1
+                    if item is not None:
+                        batch.append(item)
+            
+            try:
+                if batch:
+                    self.insert_batch(batch)
+                    self.rows_written += len(batch)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Failed to write {len(batch)} metrics records: {e}")
+            finally:
+                for _ in range(taken):
+                    self._write_queue.task_done()
     
     def get_metrics_for_node(
         self,
@@ -93,74 +624,261 @@ class MetricsDB:
         hours: int = 24
     ) -> List[HealthMetrics]:
         """Retrieve metrics for a specific node within the last N hours."""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+        return [
+            metric
+            for chunk in self.iter_metrics_for_node(node_name, hours)
+            for metric in chunk
+        ]
+    
+    def iter_metrics_for_node(
+        self,
+        node_name: str,
+        hours: int = 24,
+        chunk_size: int = READ_CHUNK_SIZE,
+        columns: Optional[Sequence[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        ascending: bool = False,
+    ) -> Iterator[list]:
+        """
+        Stream metrics for a node within the last N hours, newest first.
         
-        with Session(self.engine) as session:
-            stmt = select(MetricsRecord).where(
-                (MetricsRecord.node_name == node_name) &
-                (MetricsRecord.timestamp >= cutoff_time)
-            ).order_by(MetricsRecord.timestamp.desc())
-            
-            records = session.execute(stmt).scalars().all()
+        Rows are pulled from the cursor chunk_size at a time, so memory
+        stays bounded by one chunk however long the window is. The read
+        transaction stays open until the generator is exhausted or closed.
+        
+        Args:
+            node_name: Node name.
+            hours: Length of the window, ending now.
+            chunk_size: Rows per yielded chunk.
+            columns: Columns to project (names from INSERT_COLUMNS). If
+                given, chunks hold plain tuples in that column order
+                instead of HealthMetrics.
+            start: Start of the window (inclusive); overrides hours.
+            end: End of the window (exclusive), defaults to open-ended.
+            ascending: Yield oldest first instead.
+        
+        Yields:
+            Lists of at most chunk_size HealthMetrics (or tuples).
+        """
+        if columns is not None:
+            unknown = [name for name in columns if name not in INSERT_COLUMNS]
+            if unknown or not columns:
+                raise ValueError(f"Unknown metric columns: {unknown or 'none given'}")
+        
+        projected = list(columns) if columns is not None else list(INSERT_COLUMNS)
+        cutoff_time = start if start is not None else datetime.now() - timedelta(hours=hours)
+        
+        for partition in self._iter_partitions(
+            node_name, projected, cutoff_time, end, ascending, chunk_size
+        ):
+            if columns is None:
+                yield [HealthMetrics(**row._mapping) for row in partition]
+            else:
+                yield [tuple(row) for row in partition]
+    
+    def iter_metric_batches(
+        self,
+        node_name: str,
+        hours: int = 24,
+        chunk_size: int = READ_CHUNK_SIZE,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        ascending: bool = False,
+    ) -> Iterator[MetricsBatch]:
+        """
+        Stream metrics for a node as column arrays, newest first.
+        
+        Same window and chunking as iter_metrics_for_node, but each chunk
+        is a MetricsBatch built straight from the rows, with no
+        HealthMetrics objects in between. Timestamps are read as stored
+        text and parsed by numpy rather than one datetime at a time.
+        """
+        cutoff_time = start if start is not None else datetime.now() - timedelta(hours=hours)
+        
+        for partition in self._iter_partitions(
+            node_name, list(INSERT_COLUMNS), cutoff_time, end, ascending, chunk_size,
+            timestamps_as_text=True,
+        ):
+            yield MetricsBatch.from_rows(partition)
+    
+    def _iter_partitions(
+        self,
+        node_name: str,
+        projected: List[str],
+        start: datetime,
+        end: Optional[datetime],
+        ascending: bool,
+        chunk_size: int,
+        timestamps_as_text: bool = False,
+    ) -> Iterator[list]:
+        """Rows of a node's time range across all source tables, chunk by chunk."""
+        with self.engine.connect() as conn:
+            stmt = self._node_range_select(
+                self._source_tables(conn, since=start, until=end),
+                node_name, projected, start, end, ascending, timestamps_as_text,
+            )
             
-            return [
-                HealthMetrics(
-                    timestamp=r.timestamp,
-                    node_name=r.node_name,
-                    block_height=r.block_height,
-                    current_block_height=r.current_block_height,
-                    peers_count=r.peers_count,
-                    finality_lag=r.finality_lag,
-                    time_since_last_block=r.time_since_last_block,
-                    rpc_response_time=r.rpc_response_time,
-                    status=r.status,
-                )
-                for r in records
-            ]
+            # pysqlite has no server-side cursors, but its cursor steps the
+            # statement lazily; yield_per makes SQLAlchemy fetchmany() from it
+            # instead of buffering the whole result
+            result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+            yield from result.partitions()
+    
+    @staticmethod
+    def _node_range_select(
+        tables: List[Table],
+        node_name: str,
+        projected: List[str],
+        start: datetime,
+        end: Optional[datetime],
+        ascending: bool,
+        timestamps_as_text: bool = False,
+    ) -> Select:
+        """Ordered select of a node's time range over the given source tables."""
+        # The timestamp is always selected so the union can be ordered by it
+        selected = projected if "timestamp" in projected else projected + ["timestamp"]
+        
+        selects = []
+        for t in tables:
+            condition = (t.c.node_name == node_name) & (t.c.timestamp >= start)
+            if end is not None:
+                condition &= t.c.timestamp < end
+            selects.append(select(*(t.c[name] for name in selected)).where(condition))
+        
+        source = (selects[0] if len(selects) == 1 else union_all(*selects)).subquery()
+        order = source.c.timestamp.asc() if ascending else source.c.timestamp.desc()
+        return select(*(
+            type_coerce(source.c[name], String)
+            if name == "timestamp" and timestamps_as_text else source.c[name]
+            for name in projected
+        )).order_by(order)
+    
+    @staticmethod
+    def _latest_select(table: Table, node_name: str) -> Select:
+        """Select of a node's newest row in one source table."""
+        return select(*(table.c[name] for name in INSERT_COLUMNS)).where(
+            table.c.node_name == node_name
+        ).order_by(table.c.timestamp.desc()).limit(1)
+    
+    @staticmethod
+    def _count_select(table: Table, node_name: Optional[str] = None) -> Select:
+        """Row count of one source table, optionally for a single node."""
+        stmt = select(func.count()).select_from(table)
+        if node_name:
+            stmt = stmt.where(table.c.node_name == node_name)
+        return stmt
     
     def get_latest_for_node(self, node_name: str) -> Optional[HealthMetrics]:
         """Retrieve the most recent metric record for a node."""
-        with Session(self.engine) as session:
-            stmt = select(MetricsRecord).where(
-                MetricsRecord.node_name == node_name
-            ).order_by(MetricsRecord.timestamp.desc()).limit(1)
-            
-            record = session.execute(stmt).scalar_one_or_none()
+        with self.engine.connect() as conn:
+            candidates = []
+            for t in self._source_tables(conn):
+                row = conn.execute(self._latest_select(t, node_name)).first()
+                if row is not None:
+                    candidates.append(HealthMetrics(**row._mapping))
             
-            if record is None:
+            if not candidates:
                 return None
             
-            return HealthMetrics(
-                timestamp=record.timestamp,
-                node_name=record.node_name,
-                block_height=record.block_height,
-                current_block_height=record.current_block_height,
-                peers_count=record.peers_count,
-                finality_lag=record.finality_lag,
-                time_since_last_block=record.time_since_last_block,
-                rpc_response_time=record.rpc_response_time,
-                status=record.status,
-            )
+            return max(candidates, key=lambda m: m.timestamp)
+    
+    @staticmethod
+    def pick_resolution(window: timedelta, min_points: int = 24) -> str:
+        """
+        Coarsest rollup resolution that still gives min_points buckets.
+        
+        Args:
+            window: Length of the queried time window.
+            min_points: Fewest buckets the window should be split into.
+        
+        Returns:
+            "1d", "1h" or "1m" (the finest, if nothing coarser fits).
+        """
+        for resolution in reversed(ROLLUP_RESOLUTIONS):
+            _, width, _, _ = ROLLUP_RESOLUTIONS[resolution]
+            if window / width >= min_points:
+                return resolution
+        return "1m"
+    
+    def get_rollups(
+        self,
+        node_name: str,
+        hours: int = 24,
+        resolution: Optional[str] = None,
+        min_points: int = 24,
+    ) -> List[MetricsRollup]:
+        """
+        Retrieve aggregated metrics for a node over the last N hours.
+        
+        Reads a rollup table instead of raw rows; the bucket containing
+        the window start is included.
+        
+        Args:
+            node_name: Node name.
+            hours: Window length in hours.
+            resolution: "1m", "1h" or "1d"; picked with pick_resolution()
+                if not given.
+            min_points: Passed to pick_resolution().
+        
+        Returns:
+            Rollups in ascending bucket order.
+        """
+        window = timedelta(hours=hours)
+        if resolution is None:
+            resolution = self.pick_resolution(window, min_points)
+        
+        model, _, _, _ = ROLLUP_RESOLUTIONS[resolution]
+        cutoff = bucket_start(datetime.now() - window, resolution)
+        
+        with Session(self.engine) as session:
+            stmt = select(model).where(
+                (model.node_name == node_name) &
+                (model.bucket_start >= cutoff)
+            ).order_by(model.bucket_start)
+            
+            return [
+                self._rollup_from_record(r, resolution)
+                for r in session.execute(stmt).scalars()
+            ]
+    
+    @staticmethod
+    def _rollup_from_record(record: RollupMixin, resolution: str) -> MetricsRollup:
+        """Convert a rollup row into a MetricsRollup with averages."""
+        count = record.sample_count
+        values = {"sample_count": count}
+        for sample_column in SAMPLED_METRICS.values():
+            values[sample_column] = getattr(record, sample_column)
+        
+        for metric in ROLLUP_METRICS:
+            samples = values.get(SAMPLED_METRICS.get(metric), count)
+            total = getattr(record, f"{metric}_sum")
+            values[f"{metric}_avg"] = total / samples if samples else -1.0
+            values[f"{metric}_min"] = getattr(record, f"{metric}_min")
+            values[f"{metric}_max"] = getattr(record, f"{metric}_max")
+        
+        for status in ROLLUP_STATUSES:
+            values[f"{status}_count"] = getattr(record, f"{status}_count")
+        
+        return MetricsRollup(
+            node_name=record.node_name,
+            resolution=resolution,
+            bucket_start=record.bucket_start,
+            **values,
+        )
     
     def get_all_nodes(self) -> List[str]:
         """Get list of all unique nodes in database."""
-        with Session(self.engine) as session:
-            stmt = select(MetricsRecord.node_name).distinct()
-            nodes = session.execute(stmt).scalars().all()
+        with self.engine.connect() as conn:
+            nodes: set[str] = set()
+            for t in self._source_tables(conn):
+                nodes.update(conn.execute(select(t.c.node_name).distinct()).scalars())
             return list(nodes)
     
     def count_records(self, node_name: Optional[str] = None) -> int:
         """Count total records or records for specific node."""
-        with Session(self.engine) as session:
-            if node_name:
-                stmt = select(MetricsRecord).where(
-                    MetricsRecord.node_name == node_name
-                )
-            else:
-                stmt = select(MetricsRecord)
-            
-            count = session.query(MetricsRecord).count() if not node_name else \
-                    session.query(MetricsRecord).filter(
-                        MetricsRecord.node_name == node_name
-                    ).count()
-            return count
+        with self.engine.connect() as conn:
+            total = 0
+            for t in self._source_tables(conn):
+                total += conn.execute(self._count_select(t, node_name)).scalar_one()
+            return total
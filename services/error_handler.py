@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import random
 from typing import Callable, Any
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,30 @@ class ErrorHandler:
             logger.error(f"Error in {operation_name}: {type(e).__name__}: {e}")
             return fallback_value
 
+    @staticmethod
+    def backoff_delay(
+        attempt: int,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+    ) -> float:
+        """
+        Exponential backoff delay with jitter.
+
+        The delay doubles with every attempt up to max_delay; the actual
+        value is drawn from the upper half of that range so that many
+        clients retrying together spread out.
+
+        Args:
+            attempt: Zero-based retry number.
+            base_delay: Delay for the first retry in seconds.
+            max_delay: Upper bound in seconds.
+
+        Returns:
+            Delay in seconds.
+        """
+        delay = min(max_delay, base_delay * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
     @staticmethod
     async def execute_with_retry(
         coro_func: Callable,
@@ -48,16 +73,22 @@ class ErrorHandler:
         timeout: float = 5.0,
         fallback_value: Any = None,
         operation_name: str = "operation",
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
     ) -> Any:
         """
         Execute async function with retry logic.
 
+        Retries wait with jittered exponential backoff (see backoff_delay).
+
         Args:
             coro_func: Async function to execute
             max_retries: Number of retries (total attempts = max_retries + 1)
             timeout: Timeout per attempt in seconds
             fallback_value: Value to return if all retries fail
             operation_name: Name for logging
+            base_delay: Delay before the first retry in seconds
+            max_delay: Maximum delay between retries in seconds
 
         Returns:
             Result or fallback_value if all attempts fail
@@ -79,7 +110,9 @@ class ErrorHandler:
                     f"Timeout in {operation_name} (attempt {attempt + 1}/{max_retries + 1})"
                 )
                 if attempt < max_retries:
-                    await asyncio.sleep(1)  
+                    await asyncio.sleep(
+                        ErrorHandler.backoff_delay(attempt, base_delay, max_delay)
+                    )
 
             except Exception as e:
                 last_error = e
@@ -87,7 +120,9 @@ class ErrorHandler:
                     f"Error in {operation_name} (attempt {attempt + 1}/{max_retries + 1}): {e}"
                 )
                 if attempt < max_retries:
-                    await asyncio.sleep(1)  
+                    await asyncio.sleep(
+                        ErrorHandler.backoff_delay(attempt, base_delay, max_delay)
+                    )
 
         logger.error(
             f"All retries failed for {operation_name}. Using fallback value."
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when an endpoint executor's queue is full."""
+
+
+@dataclass
+class ExecutorStats:
+    """Counters for a single endpoint executor."""
+
+    submitted: int = 0
+    completed: int = 0
+    rejected: int = 0     # calls refused because the queue was full
+    saturated: int = 0    # calls that had to queue behind busy workers
+    active: int = 0       # calls running right now
+    queued: int = 0       # calls waiting for a worker right now
+
+
+class EndpointExecutor:
+    """
+    Bounded thread pool for blocking work against one endpoint (or group).
+
+    Hung calls can only tie up this pool's workers; once max_queue calls
+    are waiting, new work is rejected instead of piling up.
+    """
+
+    def __init__(self, name: str, max_workers: int = 2, max_queue: int = 8):
+        """
+        Args:
+            name: Endpoint or group name, used for thread names and logging.
+            max_workers: Worker threads in the pool.
+            max_queue: Calls allowed to wait for a worker before rejecting.
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.stats = ExecutorStats()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"rpc-{name}",
+        )
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking call on this executor.
+
+        Raises:
+            ExecutorSaturatedError: If max_queue calls are already waiting.
+        """
+        with self._lock:
+            if self.stats.queued >= self.max_queue and self.stats.active >= self.max_workers:
+                self.stats.rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Executor for {self.name} saturated "
+                    f"({self.stats.active} running, {self.stats.queued} queued)"
+                )
+
+            self.stats.submitted += 1
+            self.stats.queued += 1
+            if self.stats.active >= self.max_workers:
+                self.stats.saturated += 1
+
+        def _tracked_call() -> Any:
+            with self._lock:
+                self.stats.queued -= 1
+                self.stats.active += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.stats.active -= 1
+                    self.stats.completed += 1
+
+        def _release_if_cancelled(future: Future) -> None:
+            # Calls cancelled while queued never reach _tracked_call
+            if future.cancelled():
+                with self._lock:
+                    self.stats.queued -= 1
+
+        future = self._executor.submit(_tracked_call)
+        future.add_done_callback(_release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop accepting work; running calls finish in the background."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ExecutorPool:
+    """Hands out one EndpointExecutor per endpoint or endpoint group."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 8,
+        group_by_host: bool = False,
+    ):
+        """
+        Args:
+            max_workers: Worker threads per executor.
+            max_queue: Waiting calls allowed per executor.
+            group_by_host: Share one executor per provider host instead of
+                one per endpoint URL.
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.group_by_host = group_by_host
+        self._executors: dict[str, EndpointExecutor] = {}
+
+    def group_for(self, rpc_url: str) -> str:
+        """Executor group name for an endpoint URL."""
+        if self.group_by_host:
+            return urlparse(rpc_url).hostname or rpc_url
+        return rpc_url
+
+    def get(self, rpc_url: str) -> EndpointExecutor:
+        """Get the executor serving an endpoint, creating it on first use."""
+        group = self.group_for(rpc_url)
+
+        if group not in self._executors:
+            self._executors[group] = EndpointExecutor(
+                group,
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+            )
+
+        return self._executors[group]
+
+    def stats(self) -> dict[str, dict]:
+        """Counters of every executor, keyed by group name."""
+        return {
+            group: asdict(executor.stats)
+            for group, executor in self._executors.items()
+        }
+
+    def shutdown(self) -> None:
+        """Shut down all executors."""
+        for executor in self._executors.values():
+            executor.shutdown()
+        self._executors.clear()
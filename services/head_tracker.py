@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HeadTracker:
+    """
+    In-memory chain head state fed by new/finalized head subscriptions.
+
+    Headers are pushed as they arrive, so a tick only has to read the
+    latest state instead of polling the node.
+    """
+
+    def __init__(self):
+        """Initialize an empty tracker."""
+        self.best_height: Optional[int] = None
+        self.finalized_height: Optional[int] = None
+        self.last_block_at: Optional[float] = None      # Unix seconds
+        self.last_finalized_at: Optional[float] = None  # Unix seconds
+        self.headers_received = 0
+        self._ready = asyncio.Event()
+        self._finalized_ready = asyncio.Event()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once at least one best header has been received."""
+        return self.best_height is not None
+
+    def on_new_head(self, header: Dict[str, Any]) -> None:
+        """Handle a chain_subscribeNewHeads notification."""
+        height = int(header["number"], 16)
+        self.headers_received += 1
+
+        # The first header after (re)subscribing is the current head, not
+        # a block that just arrived, and re-orgs can announce a lower or
+        # equal height; only an advance past a seen header is a new block
+        if self.best_height is not None and height > self.best_height:
+            self.last_block_at = time.time()
+        self.best_height = height
+
+        self._ready.set()
+
+    def on_finalized_head(self, header: Dict[str, Any]) -> None:
+        """Handle a chain_subscribeFinalizedHeads notification."""
+        height = int(header["number"], 16)
+        self.headers_received += 1
+
+        if self.finalized_height is None or height > self.finalized_height:
+            self.finalized_height = height
+            self.last_finalized_at = time.time()
+
+        self._finalized_ready.set()
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait for the first best and finalized headers. Returns True if both arrived."""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(self._ready.wait(), self._finalized_ready.wait()),
+                timeout=timeout,
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Current head state.
+
+        Returns:
+            dict with block_height, finalized_block_number, finality_lag
+            (None before the first finalized header) and
+            time_since_last_block (seconds, None until the height has
+            advanced once), or None before the first header.
+        """
+        if not self.is_ready:
+            return None
+
+        finality_lag = None
+        if self.finalized_height is not None:
+            finality_lag = max(0, self.best_height - self.finalized_height)
+
+        return {
+            "block_height": self.best_height,
+            "finalized_block_number": self.finalized_height,
+            "finality_lag": finality_lag,
+            "time_since_last_block": (
+                None if self.last_block_at is None
+                else max(0, int(time.time() - self.last_block_at))
+            ),
+        }
@@ -1,11 +1,41 @@
 import logging
+from dataclasses import dataclass
+from typing import Optional
 
-from models.metrics import HealthMetrics
-from services.time_utils import TimeUtils
-from services.rpc_utils import RpcUtils
+import numpy as np
+
+from models.metrics import HealthMetrics, HealthStatus, MetricsBatch
+from services.time_utils import (
+    TimeUtils,
+    BLOCK_HEALTHY_MAX_SECONDS,
+    BLOCK_WARNING_MAX_SECONDS,
+)
+from services.rpc_utils import RpcUtils, RPC_HEALTHY_MAX_MS, RPC_WARNING_MAX_MS
 
 logger = logging.getLogger(__name__)
 
+# Peer and finality thresholds, shared by the scalar and batch evaluators
+PEERS_HEALTHY_ABOVE = 20
+FINALITY_HEALTHY_BELOW = 10
+FINALITY_WARNING_MAX = 30
+
+
+@dataclass
+class HealthThresholds:
+    """
+    Thresholds used by the batch evaluators.
+
+    The defaults are the ones hard-wired into the scalar path, so
+    evaluate_batch() with default thresholds matches evaluate_metrics().
+    """
+    peers_healthy_above: int = PEERS_HEALTHY_ABOVE
+    block_healthy_max_seconds: float = BLOCK_HEALTHY_MAX_SECONDS
+    block_warning_max_seconds: float = BLOCK_WARNING_MAX_SECONDS
+    rpc_healthy_max_ms: float = RPC_HEALTHY_MAX_MS
+    rpc_warning_max_ms: float = RPC_WARNING_MAX_MS
+    finality_healthy_below: int = FINALITY_HEALTHY_BELOW
+    finality_warning_max: int = FINALITY_WARNING_MAX
+
 
 class HealthChecker:
     """Evaluates and aggregates node health from multiple metrics."""
@@ -60,7 +90,7 @@ class HealthChecker:
     @staticmethod
     def _eval_peers(peers_count: int) -> str:
         """Evaluate peers health."""
-        if peers_count > 20:
+        if peers_count > PEERS_HEALTHY_ABOVE:
             return "healthy"
         elif peers_count > 0:
             return "warning"
@@ -72,12 +102,104 @@ class HealthChecker:
         """Evaluate finality lag health."""
         if finality_lag == 0:
             return "critical"
-        if finality_lag < 10:
+        if finality_lag < FINALITY_HEALTHY_BELOW:
             return "healthy"
-        if finality_lag <= 30:
+        if finality_lag <= FINALITY_WARNING_MAX:
             return "warning"
         return "critical"
 
+    @staticmethod
+    def evaluate_batch(
+        peers_count: np.ndarray,
+        time_since_last_block: np.ndarray,
+        rpc_response_time: np.ndarray,
+        finality_lag: np.ndarray,
+        thresholds: Optional[HealthThresholds] = None,
+    ) -> np.ndarray:
+        """
+        Vectorized evaluate_metrics over columns of samples.
+
+        Applies the same per-metric rules and the same combination
+        (any critical or 2+ warnings -> critical, 1 warning -> warning)
+        as the scalar path, with NumPy comparisons instead of strings.
+        Each per-metric evaluator assigns the scalar if-chain's branches
+        last to first, so the first matching branch is the one that sticks.
+
+        Args:
+            peers_count: Peer counts.
+            time_since_last_block: Block ages in seconds.
+            rpc_response_time: RPC response times in milliseconds.
+            finality_lag: Finality lags in blocks.
+            thresholds: Thresholds to apply (defaults match the scalar path).
+
+        Returns:
+            int8 array of HealthStatus codes, one per sample.
+        """
+        t = thresholds or HealthThresholds()
+
+        per_metric = np.stack([
+            HealthChecker._eval_peers_batch(peers_count, t.peers_healthy_above),
+            TimeUtils.evaluate_block_freshness_batch(
+                time_since_last_block,
+                t.block_healthy_max_seconds,
+                t.block_warning_max_seconds,
+            ),
+            RpcUtils.evaluate_rpc_health_batch(
+                rpc_response_time, t.rpc_healthy_max_ms, t.rpc_warning_max_ms
+            ),
+            HealthChecker._eval_finality_batch(
+                finality_lag, t.finality_healthy_below, t.finality_warning_max
+            ),
+        ])
+
+        any_critical = (per_metric == HealthStatus.CRITICAL).any(axis=0)
+        warning_count = (per_metric == HealthStatus.WARNING).sum(axis=0)
+
+        codes = np.full(any_critical.shape, HealthStatus.HEALTHY, dtype=np.int8)
+        codes[warning_count == 1] = HealthStatus.WARNING
+        codes[any_critical | (warning_count >= 2)] = HealthStatus.CRITICAL
+        return codes
+
+    @staticmethod
+    def evaluate_metrics_batch(
+        batch: MetricsBatch,
+        thresholds: Optional[HealthThresholds] = None,
+    ) -> np.ndarray:
+        """evaluate_batch over the columns of a MetricsBatch."""
+        return HealthChecker.evaluate_batch(
+            batch.peers_count,
+            batch.time_since_last_block,
+            batch.rpc_response_time,
+            batch.finality_lag,
+            thresholds,
+        )
+
+    @staticmethod
+    def _eval_peers_batch(
+        peers_count: np.ndarray,
+        healthy_above: int = PEERS_HEALTHY_ABOVE,
+    ) -> np.ndarray:
+        """Vectorized _eval_peers."""
+        peers_count = np.asarray(peers_count)
+        codes = np.full(peers_count.shape, HealthStatus.HEALTHY, dtype=np.int8)
+        codes[peers_count > 0] = HealthStatus.WARNING
+        codes[peers_count > healthy_above] = HealthStatus.HEALTHY
+        return codes
+
+    @staticmethod
+    def _eval_finality_batch(
+        finality_lag: np.ndarray,
+        healthy_below: int = FINALITY_HEALTHY_BELOW,
+        warning_max: int = FINALITY_WARNING_MAX,
+    ) -> np.ndarray:
+        """Vectorized _eval_finality."""
+        finality_lag = np.asarray(finality_lag)
+        codes = np.full(finality_lag.shape, HealthStatus.CRITICAL, dtype=np.int8)
+        codes[finality_lag <= warning_max] = HealthStatus.WARNING
+        codes[finality_lag < healthy_below] = HealthStatus.HEALTHY
+        codes[finality_lag == 0] = HealthStatus.CRITICAL
+        return codes
+
     @staticmethod
     def generate_report(metrics: HealthMetrics) -> dict:
         """
@@ -0,0 +1,377 @@
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import date, datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+from urllib.parse import quote, unquote
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only the parquet backend needs pyarrow
+    pa = None
+    pq = None
+
+from models.metrics import HealthMetrics
+from services.database import MetricsDB, INSERT_COLUMNS, READ_CHUNK_SIZE
+from config import HISTORY_BACKEND, HISTORY_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def _check_columns(columns: Optional[Sequence[str]]) -> List[str]:
+    """Validate a column projection; None selects every column."""
+    if columns is None:
+        return list(INSERT_COLUMNS)
+
+    unknown = [name for name in columns if name not in INSERT_COLUMNS]
+    if unknown or not columns:
+        raise ValueError(f"Unknown metric columns: {unknown or 'none given'}")
+    return list(columns)
+
+
+class HistoryStore(ABC):
+    """
+    Append-only history of raw metrics.
+
+    scan() follows the chunk contract of MetricsDB.iter_metrics_for_node:
+    lists of at most chunk_size rows, newest first, holding HealthMetrics
+    or, with a column projection, plain tuples in that column order.
+    """
+
+    @abstractmethod
+    def append(self, metrics: Iterable[HealthMetrics]) -> int:
+        """Store metrics records; returns the number of rows written."""
+
+    @abstractmethod
+    def scan(
+        self,
+        node_name: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = READ_CHUNK_SIZE,
+    ) -> Iterator[list]:
+        """
+        Stream a node's metrics with start <= timestamp < end.
+
+        Args:
+            node_name: Node name.
+            start: Start of the range (inclusive).
+            end: End of the range (exclusive), defaults to open-ended.
+            columns: Columns to read (names from INSERT_COLUMNS).
+            chunk_size: Rows per yielded chunk.
+        """
+
+    @abstractmethod
+    def nodes(self) -> List[str]:
+        """Names of all nodes with stored metrics."""
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """HistoryStore backed by the row-oriented MetricsDB."""
+
+    def __init__(self, db: MetricsDB):
+        self.db = db
+
+    def append(self, metrics: Iterable[HealthMetrics]) -> int:
+        return self.db.insert_batch(metrics)
+
+    def scan(
+        self,
+        node_name: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = READ_CHUNK_SIZE,
+    ) -> Iterator[list]:
+        return self.db.iter_metrics_for_node(
+            node_name, chunk_size=chunk_size, columns=columns, start=start, end=end
+        )
+
+    def nodes(self) -> List[str]:
+        return self.db.get_all_nodes()
+
+    def close(self) -> None:
+        self.db.close()
+
+
+class ParquetHistoryStore(HistoryStore):
+    """
+    Columnar HistoryStore writing Parquet files partitioned by node and day.
+
+    Layout: <root>/node=<name>/date=<YYYY-MM-DD>/part-*.parquet. Every
+    append writes new part files and never rewrites old ones; files are
+    written under a temporary name and renamed, so readers only ever see
+    complete files. The node name lives in the directory, not the file.
+
+    A scan lists only the day directories overlapping the requested range
+    and reads only the requested columns, with the time filter pushed down
+    to row-group statistics.
+    """
+
+    # Columns stored in each file (node_name is the partition directory)
+    FILE_COLUMNS = tuple(name for name in INSERT_COLUMNS if name != "node_name")
+    # Names the merged file and the parts it replaces while a day is compacted
+    COMPACTION_MANIFEST = "_compaction.json"
+
+    def __init__(self, root_dir: Path = HISTORY_DIR):
+        """
+        Args:
+            root_dir: Directory holding the node partitions.
+        """
+        if pa is None:
+            raise ImportError("The parquet history backend requires pyarrow")
+
+        self.root_dir = Path(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.schema = pa.schema([
+            ("timestamp", pa.timestamp("us")),
+            ("block_height", pa.int64()),
+            ("current_block_height", pa.int64()),
+            ("peers_count", pa.int64()),
+            ("finality_lag", pa.int64()),
+            ("time_since_last_block", pa.int64()),
+            ("rpc_response_time", pa.float64()),
+            ("status", pa.string()),
+        ])
+
+    def _node_dir(self, node_name: str) -> Path:
+        return self.root_dir / f"node={quote(node_name, safe='')}"
+
+    @staticmethod
+    def _day_dir_name(day: date) -> str:
+        return f"date={day.isoformat()}"
+
+    def append(self, metrics: Iterable[HealthMetrics]) -> int:
+        # Column lists per (node, day) partition
+        partitions: Dict[tuple, Dict[str, list]] = defaultdict(
+            lambda: {name: [] for name in self.FILE_COLUMNS}
+        )
+
+        for m in metrics:
+            columns = partitions[(m.node_name, m.timestamp.date())]
+            for name in self.FILE_COLUMNS:
+                columns[name].append(getattr(m, name))
+
+        written = 0
+        for (node_name, day), columns in partitions.items():
+            table = pa.Table.from_pydict(columns, schema=self.schema)
+            self._write_part(self._node_dir(node_name) / self._day_dir_name(day), table)
+            written += table.num_rows
+
+        return written
+
+    @staticmethod
+    def _part_name() -> str:
+        return f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+
+    def _write_part(self, day_dir: Path, table: "pa.Table") -> Path:
+        """Write a table as a new part file in a day directory."""
+        day_dir.mkdir(parents=True, exist_ok=True)
+        name = self._part_name()
+        tmp_path = day_dir / f".{name}.tmp"
+        path = day_dir / f"{name}.parquet"
+
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        return path
+
+    def _day_dirs(
+        self,
+        node_name: str,
+        start: datetime,
+        end: Optional[datetime],
+    ) -> List[Path]:
+        """A node's day directories overlapping [start, end), newest first."""
+        node_dir = self._node_dir(node_name)
+        if not node_dir.is_dir():
+            return []
+
+        day_dirs = []
+        for day_dir in node_dir.glob("date=*"):
+            day = date.fromisoformat(day_dir.name.split("=", 1)[1])
+            if day < start.date() or (end is not None and day > end.date()):
+                continue
+            day_dirs.append(day_dir)
+
+        return sorted(day_dirs, reverse=True)
+
+    def _read_day(
+        self,
+        day_dir: Path,
+        start: datetime,
+        end: Optional[datetime],
+        file_columns: List[str],
+    ) -> Optional["pa.Table"]:
+        """One day's rows in the range, newest first, or None if empty."""
+        filters = [("timestamp", ">=", start)]
+        if end is not None:
+            filters.append(("timestamp", "<", end))
+
+        replaced = self._replaced_parts(day_dir)
+        tables = [
+            pq.read_table(path, columns=file_columns, filters=filters)
+            for path in sorted(day_dir.glob("*.parquet"))
+            if path.name not in replaced
+        ]
+        if not tables:
+            return None
+
+        table = pa.concat_tables(tables)
+        return table.sort_by([("timestamp", "descending")])
+
+    def scan(
+        self,
+        node_name: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = READ_CHUNK_SIZE,
+    ) -> Iterator[list]:
+        projected = _check_columns(columns)
+        # timestamp is always read so each day can be ordered by it
+        file_columns = [
+            name for name in self.FILE_COLUMNS if name in projected or name == "timestamp"
+        ]
+
+        def rows() -> Iterator[Any]:
+            for day_dir in self._day_dirs(node_name, start, end):
+                table = self._read_day(day_dir, start, end, file_columns)
+                if table is None:
+                    continue
+
+                values = [
+                    [node_name] * table.num_rows if name == "node_name"
+                    else table.column(name).to_pylist()
+                    for name in projected
+                ]
+                if columns is None:
+                    for row in zip(*values):
+                        yield HealthMetrics(**dict(zip(projected, row)))
+                else:
+                    yield from zip(*values)
+
+        row_iter = rows()
+        while True:
+            chunk = list(islice(row_iter, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def nodes(self) -> List[str]:
+        return sorted(
+            unquote(path.name.split("=", 1)[1])
+            for path in self.root_dir.glob("node=*")
+            if path.is_dir()
+        )
+
+    def compact(self, node_name: str, day: date) -> int:
+        """
+        Merge a node's part files for one day into a single file.
+
+        Frequent small appends leave many tiny files; compacting days that
+        are no longer written to keeps scans to one file per node-day.
+
+        Before the merged file appears, a manifest names it and the parts
+        it replaces; scans skip those parts once the merged file exists,
+        so a crash at any point never doubles or drops rows. The next
+        compaction of the day deletes the replaced parts of a finished
+        merge, or the leftovers of an unfinished one. A scan running
+        during compaction may still see the day's rows twice.
+
+        Returns:
+            Number of part files merged (0 if there was nothing to merge).
+        """
+        day_dir = self._node_dir(node_name) / self._day_dir_name(day)
+        self._finish_compaction(day_dir)
+
+        parts = sorted(day_dir.glob("*.parquet"))
+        if len(parts) < 2:
+            return 0
+
+        table = pa.concat_tables(pq.read_table(path) for path in parts)
+        name = self._part_name()
+        self._write_manifest(day_dir, {
+            "merged": f"{name}.parquet",
+            "replaced": [path.name for path in parts],
+        })
+        tmp_path = day_dir / f".{name}.tmp"
+        pq.write_table(table.sort_by("timestamp"), tmp_path)
+        os.replace(tmp_path, day_dir / f"{name}.parquet")
+        self._finish_compaction(day_dir)
+
+        logger.debug(f"Compacted {len(parts)} parquet parts for {node_name} on {day}")
+        return len(parts)
+
+    def _write_manifest(self, day_dir: Path, manifest: Dict[str, Any]) -> None:
+        """Atomically write a day's compaction manifest."""
+        tmp_path = day_dir / f".{self.COMPACTION_MANIFEST}.tmp"
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, day_dir / self.COMPACTION_MANIFEST)
+
+    def _read_manifest(self, day_dir: Path) -> Optional[Dict[str, Any]]:
+        """A day's compaction manifest, or None if no compaction is pending."""
+        try:
+            return json.loads((day_dir / self.COMPACTION_MANIFEST).read_text())
+        except FileNotFoundError:
+            return None
+
+    def _replaced_parts(self, day_dir: Path) -> set:
+        """Names of parts superseded by a merged file that already exists."""
+        manifest = self._read_manifest(day_dir)
+        if manifest is None or not (day_dir / manifest["merged"]).exists():
+            return set()
+        return set(manifest["replaced"])
+
+    def _finish_compaction(self, day_dir: Path) -> None:
+        """
+        Clean up after the day's last compaction.
+
+        If its merged file exists the replaced parts are deleted, else
+        the partial merged file is; the manifest goes last either way.
+        """
+        manifest = self._read_manifest(day_dir)
+        if manifest is None:
+            return
+
+        merged = day_dir / manifest["merged"]
+        if merged.exists():
+            for name in manifest["replaced"]:
+                (day_dir / name).unlink(missing_ok=True)
+        else:
+            (day_dir / f".{merged.stem}.tmp").unlink(missing_ok=True)
+            logger.warning(f"Rolled back an interrupted compaction in {day_dir}")
+
+        (day_dir / self.COMPACTION_MANIFEST).unlink()
+
+
+def create_history_store(
+    backend: str = HISTORY_BACKEND,
+    db: Optional[MetricsDB] = None,
+) -> HistoryStore:
+    """
+    Build the configured history backend.
+
+    Args:
+        backend: "sqlite" or "parquet".
+        db: MetricsDB for the sqlite backend (a default one if omitted).
+    """
+    if backend == "sqlite":
+        if db is None:
+            db = MetricsDB()
+            db.create_tables()
+        return SQLiteHistoryStore(db)
+    if backend == "parquet":
+        return ParquetHistoryStore()
+
+    raise ValueError(f"Unknown history backend: {backend}")
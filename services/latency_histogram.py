@@ -0,0 +1,205 @@
+import logging
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Rolling windows kept for every histogram, in seconds
+WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+
+
+class LogHistogram:
+    """
+    Log-linear (HDR-style) histogram of latencies.
+
+    Values are stored in integer microseconds. Below 2 * SUB_BUCKETS us
+    every value has its own bucket; above that each power of two is split
+    into SUB_BUCKETS linear buckets, so the relative error stays under
+    1 / SUB_BUCKETS (~6%) from microseconds to hours with a few hundred
+    sparse buckets.
+    """
+
+    SUB_BUCKET_BITS = 4
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    @classmethod
+    def bucket_index(cls, value_ms: float) -> int:
+        """Bucket index of a value in milliseconds."""
+        value_us = max(0, int(value_ms * 1000))
+        if value_us < 2 * cls.SUB_BUCKETS:
+            return value_us
+
+        shift = value_us.bit_length() - 1 - cls.SUB_BUCKET_BITS
+        return shift * cls.SUB_BUCKETS + (value_us >> shift)
+
+    @classmethod
+    def bucket_value(cls, index: int) -> float:
+        """Highest value (ms) that falls into a bucket."""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index / 1000
+
+        shift = index // cls.SUB_BUCKETS - 1
+        mantissa = index - shift * cls.SUB_BUCKETS
+        return (((mantissa + 1) << shift) - 1) / 1000
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        """Add a value in milliseconds."""
+        index = self.bucket_index(value_ms)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total += count
+
+        if self.min_ms is None or value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if self.max_ms is None or value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add all values of another histogram to this one."""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+
+        for value in (other.min_ms, other.max_ms):
+            if value is None:
+                continue
+            if self.min_ms is None or value < self.min_ms:
+                self.min_ms = value
+            if self.max_ms is None or value > self.max_ms:
+                self.max_ms = value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Value at or below which q% of recorded values fall.
+
+        Args:
+            q: Percentile between 0 and 100.
+
+        Returns:
+            Bucket upper bound in ms (clamped to the observed max), or None
+            if the histogram is empty.
+        """
+        if self.total == 0:
+            return None
+
+        rank = max(1, -(-self.total * q // 100))  # ceil without floats
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.bucket_value(index), self.max_ms)
+
+        return self.max_ms
+
+
+class RollingHistogram:
+    """
+    LogHistogram over rolling time windows.
+
+    Time is cut into fixed slices, each with its own histogram, in a ring
+    long enough for the largest window. Recording touches only the current
+    slice (O(1)); a window query merges the slices it covers.
+    """
+
+    def __init__(
+        self,
+        windows: Iterable[int] = WINDOWS.values(),
+        slice_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            windows: Window lengths in seconds that can be queried.
+            slice_seconds: Time resolution of the windows.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.slice_seconds = slice_seconds
+        self.max_window = max(windows)
+        self.clock = clock
+        slots = int(-(-self.max_window // slice_seconds)) + 1
+        self._slices: list[Optional[LogHistogram]] = [None] * slots
+        self._slice_ids: list[int] = [-1] * slots
+
+    def _slice_id(self, now: float) -> int:
+        return int(now // self.slice_seconds)
+
+    def record(self, value_ms: float) -> None:
+        """Add a value in milliseconds to the current time slice."""
+        slice_id = self._slice_id(self.clock())
+        slot = slice_id % len(self._slices)
+
+        if self._slice_ids[slot] != slice_id:
+            # Slot still holds a slice older than the largest window
+            self._slices[slot] = LogHistogram()
+            self._slice_ids[slot] = slice_id
+
+        self._slices[slot].record(value_ms)
+
+    def window(self, seconds: float) -> LogHistogram:
+        """Merged histogram of the values recorded in the last `seconds`."""
+        if seconds > self.max_window:
+            raise ValueError(f"Window {seconds}s exceeds the kept {self.max_window}s")
+
+        current = self._slice_id(self.clock())
+        oldest = current - int(-(-seconds // self.slice_seconds)) + 1
+
+        merged = LogHistogram()
+        for slice_id, histogram in zip(self._slice_ids, self._slices):
+            if histogram is not None and oldest <= slice_id <= current:
+                merged.merge(histogram)
+        return merged
+
+
+class LatencyHistograms:
+    """Rolling latency histograms per node and probe type, kept in memory."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            clock: Monotonic time source shared by all histograms.
+        """
+        self.clock = clock
+        self._histograms: Dict[tuple[str, str], RollingHistogram] = {}
+
+    def record(self, node_name: str, probe: str, value_ms: float) -> None:
+        """Record one latency measurement for a node's probe."""
+        key = (node_name, probe)
+        histogram = self._histograms.get(key)
+
+        if histogram is None:
+            histogram = self._histograms[key] = RollingHistogram(clock=self.clock)
+
+        histogram.record(value_ms)
+
+    def probes(self, node_name: str) -> list[str]:
+        """Probe types with recorded latencies for a node."""
+        return sorted(probe for name, probe in self._histograms if name == node_name)
+
+    def summary(self, node_name: str, probe: str, window: str = "5m") -> Dict[str, Optional[float]]:
+        """
+        Latency distribution of a node's probe over a rolling window.
+
+        Args:
+            node_name: Node name.
+            probe: Probe type, e.g. "system_health" or "get_chain_state".
+            window: One of WINDOWS ("1m", "5m", "1h").
+
+        Returns:
+            dict with count, min, p50, p95, p99 and max (ms; None if empty).
+        """
+        histogram = self._histograms.get((node_name, probe))
+        merged = histogram.window(WINDOWS[window]) if histogram else LogHistogram()
+
+        return {
+            "count": merged.total,
+            "min": merged.min_ms,
+            "p50": merged.percentile(50),
+            "p95": merged.percentile(95),
+            "p99": merged.percentile(99),
+            "max": merged.max_ms,
+        }
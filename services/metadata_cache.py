@@ -0,0 +1,99 @@
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Optional
+
+from scalecodec.base import ScaleBytes
+
+logger = logging.getLogger(__name__)
+
+
+class DiskMetadataCache:
+    """
+    On-disk runtime metadata cache for one chain.
+
+    Plugs into SubstrateInterface as its ``cache_region`` (the Dogpile
+    get/set interface), which looks metadata up by ``METADATA_<spec_version>``.
+    Files live under ``<cache_dir>/<genesis_hash>/`` as raw SCALE bytes, so
+    a warm start decodes local bytes instead of downloading several MB of
+    metadata. A new runtime version is simply a cache miss; older versions
+    are pruned when it is stored.
+    """
+
+    KEY_PATTERN = re.compile(r"^METADATA_(\d+)$")
+
+    def __init__(self, cache_dir: Path, genesis_hash: str, keep_versions: int = 2):
+        """
+        Args:
+            cache_dir: Root cache directory.
+            genesis_hash: Genesis hash of the chain, separates chains.
+            keep_versions: Runtime versions kept on disk per chain.
+        """
+        self.directory = Path(cache_dir) / genesis_hash.lower()
+        self.keep_versions = max(1, keep_versions)
+        self.runtime_config: Any = None
+        self.hits = 0
+        self.misses = 0
+
+    def bind(self, runtime_config: Any) -> None:
+        """Set the runtime configuration used to decode cached metadata."""
+        self.runtime_config = runtime_config
+
+    def _path(self, key: str) -> Optional[Path]:
+        """File path for a cache key, or None for keys this cache ignores."""
+        if not self.KEY_PATTERN.match(key):
+            return None
+        return self.directory / f"{key}.scale"
+
+    def get(self, key: str) -> Any:
+        """Load and decode cached metadata. Returns None on a miss."""
+        path = self._path(key)
+        if path is None or self.runtime_config is None or not path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            metadata = self.runtime_config.create_scale_object(
+                "MetadataVersioned", data=ScaleBytes(path.read_bytes())
+            )
+            metadata.decode()
+
+        except Exception as e:
+            logger.warning(f"Discarding unreadable metadata cache {path}: {e}")
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info(f"Loaded runtime metadata from {path}")
+        return metadata
+
+    def set(self, key: str, metadata: Any) -> None:
+        """Store the raw bytes of freshly downloaded metadata."""
+        path = self._path(key)
+        if path is None:
+            return
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(bytes(metadata.data.data))
+            os.replace(tmp_path, path)  # readers never see a partial file
+            logger.info(f"Cached runtime metadata in {path}")
+
+        except Exception as e:
+            logger.warning(f"Failed to cache runtime metadata in {path}: {e}")
+            return
+
+        self._prune()
+
+    def _prune(self) -> None:
+        """Keep only the newest runtime versions for this chain."""
+        cached = sorted(
+            self.directory.glob("METADATA_*.scale"),
+            key=lambda p: int(self.KEY_PATTERN.match(p.stem).group(1)),
+            reverse=True,
+        )
+        for stale in cached[self.keep_versions:]:
+            stale.unlink(missing_ok=True)
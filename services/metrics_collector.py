@@ -1,12 +1,26 @@
+import asyncio
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
 
 from models.node import Node
-from models.metrics import HealthMetrics
+from models.metrics import HealthMetrics, LatencyStats
 from services.rpc_client import PolkadotRPCClient
-from services.time_utils import TimeUtils
+from services.connection_registry import ConnectionRegistry
+from services.executor_pool import ExecutorPool
+from services.block_cache import BlockCacheRegistry
+from services.latency_histogram import LatencyHistograms
+from services.time_utils import TimeUtils, BLOCK_AGE_UNKNOWN
 from services.error_handler import ErrorHandler
+from config import (
+    RPC_BATCH_REQUESTS,
+    STREAMING_MODE,
+    EXECUTOR_WORKERS_PER_ENDPOINT,
+    EXECUTOR_MAX_QUEUE,
+    EXECUTOR_GROUP_BY_HOST,
+    BLOCK_CACHE_SIZE,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -15,9 +29,28 @@ logger = logging.getLogger(__name__)
 class MetricsCollector:
     """Collects health metrics from blockchain nodes."""
 
-    def __init__(self):
-        """Initialize metrics collector."""
+    def __init__(self, streaming: bool = STREAMING_MODE):
+        """
+        Initialize metrics collector.
+
+        Args:
+            streaming: Track heads via subscriptions instead of polling them.
+        """
+        # Node name -> client; nodes with the same RPC URL share a client
         self.clients: dict[str, PolkadotRPCClient] = {}
+        self.registry = ConnectionRegistry()
+        # Blocking work is isolated per endpoint (or provider) so one hung
+        # endpoint cannot use up the threads serving healthy ones
+        self.executors = ExecutorPool(
+            max_workers=EXECUTOR_WORKERS_PER_ENDPOINT,
+            max_queue=EXECUTOR_MAX_QUEUE,
+            group_by_host=EXECUTOR_GROUP_BY_HOST,
+        )
+        # Immutable block data, shared by all endpoints of the same chain
+        self.block_caches = BlockCacheRegistry(BLOCK_CACHE_SIZE)
+        # Rolling per-node, per-probe latency distributions (1m/5m/1h)
+        self.latency_histograms = LatencyHistograms()
+        self.streaming = streaming
 
     async def collect_metrics(self, node: Node) -> Optional[HealthMetrics]:
         """
@@ -30,66 +63,196 @@ class MetricsCollector:
             HealthMetrics object with collected data, or None if collection fails.
         """
         if node.name not in self.clients:
-            self.clients[node.name] = PolkadotRPCClient(node.rpc_url)
+            self.clients[node.name] = self.registry.acquire(
+                node.rpc_url,
+                batch_requests=RPC_BATCH_REQUESTS,
+                executor=self.executors.get(node.rpc_url),
+                block_caches=self.block_caches,
+            )
 
         client = self.clients[node.name]
 
-        if client.substrate is None:
+        # Dead endpoints are skipped without a connect attempt until their
+        # backoff expires; the outcome of this tick feeds the breaker
+        if not client.breaker.allow_request():
+            logger.warning(
+                f"Skipping {node.name}: endpoint unavailable, "
+                f"retry in {client.breaker.retry_in():.0f}s"
+            )
+            return None
+
+        try:
+            metrics = await self._collect_from_client(node, client)
+        except asyncio.CancelledError:
+            client.breaker.cancel_trial()
+            raise
+        except Exception:
+            # Counted as a failure so a half-open trial is not left in flight
+            client.breaker.record_failure()
+            raise
+
+        if metrics is None:
+            client.breaker.record_failure()
+        else:
+            client.breaker.record_success()
+
+        return metrics
+
+    async def _collect_from_client(
+        self,
+        node: Node,
+        client: PolkadotRPCClient,
+    ) -> Optional[HealthMetrics]:
+        """Connect if needed and run the probes for one node."""
+        if not client.is_connected:
             connected = await client.connect()
             if not connected:
                 logger.error(f"Could not connect to {node.name}")
                 return None
 
-        chain_head = await ErrorHandler.execute_with_timeout(
-            client.get_chain_head,
-            timeout=client.timeout,
-            fallback_value=None,
-            operation_name=f"get_chain_head for {node.name}",
+        if self.streaming:
+            metrics = await self._collect_from_stream(node, client)
+            if metrics is not None:
+                return metrics
+
+        # Probes are independent; run them together so a node costs one
+        # round trip (or one timeout) instead of five in a row. Chain head,
+        # finality and peers travel in a single JSON-RPC batch, and the
+        # finalized block's timestamp comes with the finalized header.
+        chain_state_task = self._start_probe(
+            client.get_chain_state, client, node, fallback_value=None
         )
-        if not chain_head:
+        probe_tasks = [
+            self._start_probe(
+                client.measure_rpc_latency, client, node, fallback_value=None,
+                record_latency=False,
+            ),
+        ]
+
+        chain_state = await chain_state_task
+        if not chain_state:
+            for task in probe_tasks:
+                task.cancel()
+            await asyncio.gather(*probe_tasks, return_exceptions=True)
             logger.error(f"Could not get chain head for {node.name}")
             return None
 
-        block_height = chain_head["block_height"]
+        (latency,) = await asyncio.gather(*probe_tasks)
+        block_timestamp_ms = chain_state.get("finalized_block_timestamp")
+
+        block_height = chain_state["block_height"]
         current_block_height = block_height
 
-        finalized_block_number = await ErrorHandler.execute_with_timeout(
-            client.get_finalized_block_number,
-            timeout=client.timeout,
-            fallback_value=0,
-            operation_name=f"get_finalized_block_number for {node.name}",
-        )
+        finalized_block_number = chain_state["finalized_block_number"]
         finality_lag = max(0, block_height - finalized_block_number) if finalized_block_number else 0
 
-        peers_count = await ErrorHandler.execute_with_timeout(
-            client.get_peers_count,
-            timeout=client.timeout,
-            fallback_value=0,
-            operation_name=f"get_peers_count for {node.name}",
-        )
+        peers_count = chain_state["peers_count"]
+        if peers_count is None:
+            peers_count = 0
 
-        block_timestamp_ms = await ErrorHandler.execute_with_timeout(
-            client.get_finalized_block_timestamp,
-            timeout=client.timeout,
-            fallback_value=None,
-            operation_name=f"get_finalized_block_timestamp for {node.name}",
-        )
         if block_timestamp_ms is not None:
             time_since_last_block = TimeUtils.calculate_time_since_last_block(
                 block_timestamp_ms
             )
         else:
-            time_since_last_block = 0
+            logger.warning(f"Finalized block timestamp unavailable for {node.name}")
+            time_since_last_block = BLOCK_AGE_UNKNOWN
+
+        return self._build_metrics(
+            node,
+            block_height=block_height,
+            current_block_height=current_block_height,
+            peers_count=peers_count,
+            finality_lag=finality_lag,
+            time_since_last_block=time_since_last_block,
+            rpc_response_time=self._response_time(node, latency),
+        )
+
+    async def _collect_from_stream(
+        self,
+        node: Node,
+        client: PolkadotRPCClient,
+    ) -> Optional[HealthMetrics]:
+        """
+        Collect metrics from subscription-fed head state.
+
+        Heights, finality lag and block age come from memory; only peers
+        and the latency probe go over the wire.
 
-        rpc_response_time = await ErrorHandler.execute_with_timeout(
-            client.measure_rpc_response_time,
-            timeout=client.timeout,
-            fallback_value=-1.0,
-            operation_name=f"measure_rpc_response_time for {node.name}",
+        Returns:
+            HealthMetrics, or None if the node cannot stream heads or the
+            stream has not yet seen a new block and a finalized head (the
+            caller polls instead).
+        """
+        snapshot_task = self._start_probe(
+            client.get_head_snapshot, client, node, fallback_value=None,
+            record_latency=False,
         )
-        if rpc_response_time is None:
-            rpc_response_time = -1.0
+        probe_tasks = [
+            self._start_probe(
+                client.get_peers_count, client, node, fallback_value=0
+            ),
+            self._start_probe(
+                client.measure_rpc_latency, client, node, fallback_value=None,
+                record_latency=False,
+            ),
+        ]
 
+        snapshot = await snapshot_task
+        if not snapshot or None in (snapshot["time_since_last_block"], snapshot["finality_lag"]):
+            for task in probe_tasks:
+                task.cancel()
+            await asyncio.gather(*probe_tasks, return_exceptions=True)
+
+            if not snapshot:
+                logger.warning(f"Head stream unavailable for {node.name}, polling instead")
+            else:
+                logger.debug(f"No block age or finality streamed for {node.name} yet, polling instead")
+            return None
+
+        peers_count, latency = await asyncio.gather(*probe_tasks)
+
+        return self._build_metrics(
+            node,
+            block_height=snapshot["block_height"],
+            current_block_height=snapshot["block_height"],
+            peers_count=peers_count if peers_count is not None else 0,
+            finality_lag=snapshot["finality_lag"],
+            time_since_last_block=snapshot["time_since_last_block"],
+            rpc_response_time=self._response_time(node, latency),
+        )
+
+    def _response_time(self, node: Node, latency: Optional[LatencyStats]) -> float:
+        """
+        Record latency samples and return their median in ms.
+
+        Returns -1.0 if no sample succeeded.
+        """
+        if latency is None or latency.p50_ms is None:
+            return -1.0
+
+        for value_ms in latency.values_ms:
+            self.latency_histograms.record(node.name, "system_health", value_ms)
+
+        logger.debug(
+            f"RPC latency for {node.name}: samples={latency.samples}, "
+            f"errors={latency.errors}, min={latency.min_ms:.1f}ms, "
+            f"p50={latency.p50_ms:.1f}ms, p95={latency.p95_ms:.1f}ms, "
+            f"max={latency.max_ms:.1f}ms"
+        )
+        return latency.p50_ms
+
+    @staticmethod
+    def _build_metrics(
+        node: Node,
+        block_height: int,
+        current_block_height: int,
+        peers_count: int,
+        finality_lag: int,
+        time_since_last_block: int,
+        rpc_response_time: float,
+    ) -> HealthMetrics:
+        """Create HealthMetrics, evaluate overall status and log it."""
         metrics = HealthMetrics(
             node_name=node.name,
             block_height=block_height,
@@ -115,6 +278,81 @@ class MetricsCollector:
 
         return metrics
 
+    def _start_probe(
+        self,
+        probe: Callable[[], Awaitable[Any]],
+        client: PolkadotRPCClient,
+        node: Node,
+        fallback_value: Any,
+        record_latency: bool = True,
+    ) -> asyncio.Task:
+        """
+        Schedule a single probe with timeout and graceful fallback.
+
+        Successful probes (non-None result) are timed into the node's
+        latency histogram under the probe's name, unless record_latency
+        is False.
+        """
+        async def _timed_probe() -> Any:
+            start_ns = time.perf_counter_ns()
+            result = await probe()
+            if result is not None:
+                self.latency_histograms.record(
+                    node.name, probe.__name__, (time.perf_counter_ns() - start_ns) / 1_000_000
+                )
+            return result
+
+        return asyncio.create_task(
+            ErrorHandler.execute_with_timeout(
+                _timed_probe if record_latency else probe,
+                timeout=client.timeout,
+                fallback_value=fallback_value,
+                operation_name=f"{probe.__name__} for {node.name}",
+            )
+        )
+
+    async def collect_all(
+        self,
+        nodes: Iterable[Node],
+        max_concurrency: int = 10,
+    ) -> AsyncIterator[tuple[Node, Optional[HealthMetrics]]]:
+        """
+        Collect metrics for many nodes concurrently.
+
+        At most ``max_concurrency`` nodes are collected at the same time.
+        Results are yielded as soon as each node finishes (completion order,
+        not input order), so one pass takes about as long as the slowest node.
+
+        Args:
+            nodes: Nodes to collect metrics for.
+            max_concurrency: Maximum number of nodes collected in parallel.
+
+        Yields:
+            (node, metrics) tuples; metrics is None if collection failed.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _collect(node: Node) -> tuple[Node, Optional[HealthMetrics]]:
+            async with semaphore:
+                try:
+                    return node, await self.collect_metrics(node)
+                except Exception as e:
+                    logger.error(
+                        f"Unexpected error collecting {node.name}: "
+                        f"{type(e).__name__}: {e}"
+                    )
+                    return node, None
+
+        tasks = [asyncio.create_task(_collect(node)) for node in nodes]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early or was cancelled: don't leak tasks
+            for task in tasks:
+                task.cancel()
+
     @staticmethod
     def _evaluate_peers_health(peers_count: int) -> str:
         """Evaluate health status based on peer count."""
@@ -159,11 +397,11 @@ class MetricsCollector:
     async def disconnect(self, node_name: str) -> None:
         """Disconnect from a specific node."""
         if node_name in self.clients:
-            self.clients[node_name].disconnect()
-            del self.clients[node_name]
+            client = self.clients.pop(node_name)
+            await self.registry.release(client.rpc_url)
 
     async def disconnect_all(self) -> None:
         """Disconnect from all nodes."""
-        for client in self.clients.values():
-            client.disconnect()
+        await self.registry.close_all()
         self.clients.clear()
+        self.executors.shutdown()
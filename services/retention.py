@@ -0,0 +1,181 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from services.database import (
+    MetricsDB,
+    MetricsRecord,
+    MetricsRollup1m,
+    MetricsRollup1h,
+    MetricsRollup1d,
+    partition_day,
+)
+from config import (
+    RETENTION_RAW_DAYS,
+    RETENTION_ROLLUP_DAYS,
+    RETENTION_INTERVAL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionManager:
+    """
+    Expires old metrics and returns the freed space to the filesystem.
+
+    Day partitions past the raw window are dropped whole. Rows in the
+    unpartitioned metrics table and in the rollup tables are deleted in
+    small batches, each in its own short transaction, so the writer is
+    never blocked for long. Freed pages are released with
+    PRAGMA incremental_vacuum instead of a full VACUUM.
+    """
+
+    def __init__(
+        self,
+        db: MetricsDB,
+        raw_days: int = RETENTION_RAW_DAYS,
+        rollup_days: int = RETENTION_ROLLUP_DAYS,
+        interval_seconds: float = RETENTION_INTERVAL_SECONDS,
+        delete_batch_size: int = 5000,
+        vacuum_pages: int = 1000,
+    ):
+        """
+        Args:
+            db: Metrics database to maintain.
+            raw_days: Days of raw rows and 1-minute rollups kept (0 = forever).
+            rollup_days: Days of hourly and daily rollups kept (0 = forever).
+            interval_seconds: Pause between background maintenance runs.
+            delete_batch_size: Rows deleted per transaction.
+            vacuum_pages: Pages released per incremental_vacuum step.
+        """
+        self.db = db
+        self.raw_days = raw_days
+        self.rollup_days = rollup_days
+        self.interval_seconds = interval_seconds
+        self.delete_batch_size = max(1, delete_batch_size)
+        self.vacuum_pages = max(1, vacuum_pages)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def prune(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Delete data older than the retention windows.
+
+        Args:
+            now: Reference time, defaults to datetime.now().
+
+        Returns:
+            Rows deleted per table, plus "partitions" for dropped day tables.
+        """
+        now = now or datetime.now()
+        deleted: Dict[str, int] = {}
+
+        if self.raw_days > 0:
+            raw_cutoff = now - timedelta(days=self.raw_days)
+
+            deleted["partitions"] = 0
+            for name in self.db.list_partitions():
+                # A day table is dropped only once all of its day has expired
+                if partition_day(name) < raw_cutoff.date():
+                    self.db.drop_partition(name)
+                    deleted["partitions"] += 1
+
+            deleted[MetricsRecord.__tablename__] = self._delete_before(
+                MetricsRecord.__tablename__, "timestamp", raw_cutoff
+            )
+            deleted[MetricsRollup1m.__tablename__] = self._delete_before(
+                MetricsRollup1m.__tablename__, "bucket_start", raw_cutoff
+            )
+
+        if self.rollup_days > 0:
+            rollup_cutoff = now - timedelta(days=self.rollup_days)
+
+            for model in (MetricsRollup1h, MetricsRollup1d):
+                deleted[model.__tablename__] = self._delete_before(
+                    model.__tablename__, "bucket_start", rollup_cutoff
+                )
+
+        if any(deleted.values()):
+            logger.info(f"Retention pruned {deleted}")
+        return deleted
+
+    def _delete_before(self, table: str, column: str, cutoff: datetime) -> int:
+        """Delete rows with column < cutoff in batches; returns rows deleted."""
+        cutoff_value = self.db.db_timestamp(cutoff)
+        total = 0
+
+        while True:
+            with self.db.engine.begin() as conn:
+                result = conn.exec_driver_sql(
+                    f"DELETE FROM {table} WHERE rowid IN "
+                    f"(SELECT rowid FROM {table} WHERE {column} < ? LIMIT ?)",
+                    (cutoff_value, self.delete_batch_size),
+                )
+                batch = result.rowcount
+
+            total += batch
+            if batch < self.delete_batch_size or self._stop.is_set():
+                return total
+
+    def incremental_vacuum(self) -> int:
+        """
+        Release free pages to the filesystem a step at a time.
+
+        Returns:
+            Pages released (0 if the database is not in incremental mode).
+        """
+        released = 0
+
+        with self.db.engine.connect() as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+                return 0
+
+        while not self._stop.is_set():
+            with self.db.engine.begin() as conn:
+                free_before = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+                if not free_before:
+                    break
+
+                conn.exec_driver_sql(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+                free_after = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+            if free_after >= free_before:
+                break
+            released += free_before - free_after
+
+        return released
+
+    def run_once(self) -> Dict[str, int]:
+        """Prune expired data, then release the freed pages."""
+        deleted = self.prune()
+        pages = self.incremental_vacuum()
+        if pages:
+            logger.info(f"Incremental vacuum released {pages} pages")
+        return deleted
+
+    def start(self) -> None:
+        """Run maintenance in a background thread every interval_seconds."""
+        if self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="metrics-retention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread after its current step."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Retention run failed: {e}")
+            self._stop.wait(self.interval_seconds)
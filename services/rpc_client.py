@@ -1,34 +1,111 @@
 import asyncio
 import logging
+import threading
 import time
-from typing import Optional, Dict, Any
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable
 
 from substrateinterface import SubstrateInterface
 
+from services.ws_transport import JsonRpcWebSocket, JsonRpcError, BatchRejectedError
+from services.head_tracker import HeadTracker
+from services.circuit_breaker import CircuitBreaker
+from services.executor_pool import EndpointExecutor
+from services.metadata_cache import DiskMetadataCache
+from services.storage_utils import StorageUtils, TIMESTAMP_NOW_KEY
+from services.block_cache import BlockCache, BlockCacheRegistry
+from services.rpc_utils import RpcUtils
+from models.metrics import LatencyStats
+from config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_BASE_DELAY_SECONDS,
+    CIRCUIT_MAX_DELAY_SECONDS,
+    EXECUTOR_WORKERS_PER_ENDPOINT,
+    EXECUTOR_MAX_QUEUE,
+    METADATA_CACHE_DIR,
+    BLOCK_CACHE_SIZE,
+    RPC_LATENCY_SAMPLES,
+    RPC_BATCH_RETRY_SECONDS,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class PolkadotRPCClient:
     """RPC client for Polkadot blockchain."""
 
-    def __init__(self, rpc_url: str, timeout: int = 10):
+    def __init__(
+        self,
+        rpc_url: str,
+        timeout: int = 10,
+        batch_requests: bool = True,
+        executor: Optional[EndpointExecutor] = None,
+        metadata_cache_dir: Optional[Path] = METADATA_CACHE_DIR,
+        block_caches: Optional[BlockCacheRegistry] = None,
+        latency_samples: int = RPC_LATENCY_SAMPLES,
+    ):
         """
         Args:
             rpc_url: WebSocket URL of RPC endpoint.
             timeout: Request timeout in seconds.
+            batch_requests: Send per-tick probes as one JSON-RPC batch.
+            executor: Thread pool for blocking calls; a private one is
+                created if not given.
+            metadata_cache_dir: Directory for cached runtime metadata,
+                None to always download it.
+            block_caches: Per-chain header and block-hash caches, shared
+                with other clients; a private one is created if not given.
+            latency_samples: Pipelined calls per latency probe.
         """
         self.rpc_url = rpc_url
         self.timeout = timeout
+        self.batch_requests = batch_requests
+        # Monotonic time until which a rejected batch keeps batching off
+        self._batching_paused_until = 0.0
+        self.latency_samples = latency_samples
+        self.transport = JsonRpcWebSocket(rpc_url, timeout=timeout)
+        self.breaker = CircuitBreaker(
+            rpc_url,
+            failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+            base_delay=CIRCUIT_BASE_DELAY_SECONDS,
+            max_delay=CIRCUIT_MAX_DELAY_SECONDS,
+        )
+
+        # Metadata-aware interface, built lazily and only for storage
+        # items that need SCALE decoding against the runtime metadata
         self.substrate: Optional[SubstrateInterface] = None
+        self.metadata_cache_dir = metadata_cache_dir
+        self.genesis_hash: Optional[str] = None
+        # SubstrateInterface shares one websocket and request counter,
+        # so concurrent probes must not use it from two threads at once
+        self._substrate_lock = threading.Lock()
+        self.executor = executor or EndpointExecutor(
+            rpc_url,
+            max_workers=EXECUTOR_WORKERS_PER_ENDPOINT,
+            max_queue=EXECUTOR_MAX_QUEUE,
+        )
+
+        if block_caches is None:
+            block_caches = BlockCacheRegistry(BLOCK_CACHE_SIZE)
+        self.block_caches = block_caches
+        self._block_cache: Optional[BlockCache] = None
+        # Metadata-decoded timestamp reads running outside the probes
+        self._timestamp_tasks: dict[str, asyncio.Task] = {}
+
+        # Streaming mode: head state pushed by subscriptions
+        self.head_tracker: Optional[HeadTracker] = None
+        self._head_subscriptions: dict[str, Any] = {}
+        self._subscribe_lock = asyncio.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        """True while the JSON-RPC WebSocket is open."""
+        return self.transport.connected
 
     async def connect(self) -> bool:
         """Connect to Polkadot RPC endpoint. Returns True if successful."""
         try:
-            # asyncio.to_thread prevents blocking the event loop
-            self.substrate = await asyncio.to_thread(
-                SubstrateInterface,
-                url=self.rpc_url
-            )
+            await self.transport.connect()
             logger.info(f"Connected to {self.rpc_url}")
             return True
 
@@ -36,80 +113,407 @@ class PolkadotRPCClient:
             logger.error(f"Failed to connect to {self.rpc_url}: {e}")
             return False
 
-    def disconnect(self) -> None:
+    async def disconnect(self) -> None:
         """Disconnect from RPC endpoint."""
+        await self.transport.close()
+        self.head_tracker = None
+        self._head_subscriptions = {}
+
+        for task in list(self._timestamp_tasks.values()):
+            task.cancel()
+
         if self.substrate:
             self.substrate.close()
-            logger.info("Disconnected from RPC")
+            self.substrate = None
+
+        logger.info("Disconnected from RPC")
+
+    async def _rpc(self, method: str, params: Optional[list] = None) -> Any:
+        """Send a JSON-RPC request over the shared WebSocket."""
+        return await self.transport.request(method, params)
+
+    @property
+    def batching(self) -> bool:
+        """True while calls to _rpc_batch go out as one JSON-RPC batch."""
+        return self.batch_requests and time.monotonic() >= self._batching_paused_until
+
+    async def _rpc_batch(self, calls: list[tuple[str, list]]) -> list[Any]:
+        """
+        Send several requests in one round trip.
+
+        Returns one entry per call: the result, or the exception for that
+        call. After a rejected batch (one id-less error for the whole
+        array) the calls are sent as concurrent single requests, for
+        RPC_BATCH_RETRY_SECONDS before batching is tried again; per-call
+        errors do not count as a rejection.
+        """
+        if self.batching:
+            results = await self.transport.request_batch(calls)
+
+            rejection = next((r for r in results if isinstance(r, BatchRejectedError)), None)
+            if rejection is None:
+                return results
+
+            logger.warning(
+                f"JSON-RPC batch rejected by {self.rpc_url} ({rejection}); "
+                f"using single requests for {RPC_BATCH_RETRY_SECONDS}s"
+            )
+            self._batching_paused_until = time.monotonic() + RPC_BATCH_RETRY_SECONDS
+
+        return await asyncio.gather(
+            *(self._rpc(method, params) for method, params in calls),
+            return_exceptions=True,
+        )
+
+    async def get_genesis_hash(self) -> Optional[str]:
+        """Get the chain's genesis hash (fetched once per client)."""
+        if self.genesis_hash is None:
+            self.genesis_hash = await self._rpc("chain_getBlockHash", [0])
+        return self.genesis_hash
+
+    async def get_block_cache(self) -> Optional[BlockCache]:
+        """Block cache shared by all clients of this chain, or None if unknown."""
+        if self._block_cache is None:
+            try:
+                genesis_hash = await self.get_genesis_hash()
+            except Exception as e:
+                logger.debug(f"No genesis hash for block cache: {e}")
+                return None
+
+            if genesis_hash:
+                self._block_cache = self.block_caches.for_chain(genesis_hash)
+
+        return self._block_cache
+
+    async def get_header(self, block_hash: str, finalized: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get a block header by hash, served from the block cache when possible.
+
+        Args:
+            block_hash: Block hash.
+            finalized: The block is known to be finalized, so its number
+                -> hash mapping is cached too.
+
+        Returns:
+            Header dict, or None if the node does not know the block.
+        """
+        cache = await self.get_block_cache()
+        header = cache.get_header(block_hash) if cache else None
+        if header is not None:
+            return header
+
+        header = await self._rpc("chain_getHeader", [block_hash])
+
+        if header and cache:
+            if finalized:
+                cache.put_finalized(block_hash, header)
+            else:
+                cache.put_header(block_hash, header)
+
+        return header
+
+    async def get_block_hash(self, block_number: int) -> Optional[str]:
+        """
+        Get the hash of a block number.
+
+        Finalized numbers are served from the block cache; hashes above
+        the finalized head can still be reorged and are always fetched.
+        """
+        cache = await self.get_block_cache()
+        block_hash = cache.get_hash(block_number) if cache else None
+        if block_hash is not None:
+            return block_hash
+
+        block_hash = await self._rpc("chain_getBlockHash", [block_number])
+
+        if block_hash and cache:
+            cache.put_hash(block_number, block_hash)
+
+        return block_hash
+
+    async def _metadata_cache(self) -> Optional[DiskMetadataCache]:
+        """Metadata cache for this chain, or None if caching is off or fails."""
+        if self.metadata_cache_dir is None:
+            return None
+
+        try:
+            genesis_hash = await self.get_genesis_hash()
+        except Exception as e:
+            logger.debug(f"No genesis hash for metadata cache: {e}")
+            return None
+
+        return DiskMetadataCache(self.metadata_cache_dir, genesis_hash)
+
+    def _create_substrate(self, metadata_cache: Optional[DiskMetadataCache]) -> SubstrateInterface:
+        """Build the SubstrateInterface, reusing cached metadata when possible."""
+        substrate = SubstrateInterface(url=self.rpc_url, cache_region=metadata_cache)
+        if metadata_cache is not None:
+            metadata_cache.bind(substrate.runtime_config)
+        return substrate
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking SubstrateInterface call on this endpoint's executor."""
+        metadata_cache = None
+        if self.substrate is None:
+            metadata_cache = await self._metadata_cache()
+
+        def _locked_call() -> Any:
+            with self._substrate_lock:
+                if self.substrate is None:
+                    self.substrate = self._create_substrate(metadata_cache)
+                return func(*args)
+
+        return await self.executor.run(_locked_call)
 
     async def get_chain_head(self) -> Optional[Dict[str, Any]]:
         """Get current block height and hash. Returns None if fails."""
-        if not self.substrate:
+        if not self.is_connected:
             logger.warning("Not connected to RPC")
             return None
 
         try:
-            block_number = await asyncio.to_thread(
-                self._query_block_number
-            )
-
-            block_hash = await asyncio.to_thread(
-                self._query_block_hash,
-                block_number
-            )
+            block_hash = await self._rpc("chain_getBlockHash")
+            header = await self.get_header(block_hash)
 
             return {
-                "block_height": block_number,
-                "block_hash": block_hash
+                # header['number'] is a hex string like '0x1ba1234'
+                "block_height": int(header["number"], 16),
+                "block_hash": block_hash,
             }
 
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout getting chain head (>{self.timeout}s)")
+            return None
+
         except Exception as e:
             logger.error(f"Failed to get chain head: {e}")
             return None
 
-    def _query_block_number(self) -> int:
-        """Query current block number from storage."""
-        result = self.substrate.query("System", "Number")
-        return result.value
+    async def get_chain_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get chain head, finalized block and peers count together.
 
-    def _query_block_hash(self, block_number: int) -> str:
-        """Query block hash by block number."""
-        result = self.substrate.query("System", "BlockHash", [block_number])
-        return result.value
+        Best header, best hash, finalized head and peers go out as one
+        JSON-RPC batch. The finalized header and timestamp need the
+        finalized hash, so they follow as a second batch, which the block
+        cache saves while finality has not moved. A timestamp that needs
+        metadata decoding is None until the SubstrateInterface is built in
+        the background.
 
-    async def get_peers_count(self) -> Optional[int]:
-        """Get number of connected peers. Returns None if fails."""
-        if not self.substrate:
+        Returns:
+            dict with block_height, block_hash, finalized_block_number,
+            finalized_block_timestamp (ms) and peers_count (None for items
+            that failed), or None if the chain head is unavailable.
+        """
+        if not self.is_connected:
             logger.warning("Not connected to RPC")
             return None
 
         try:
-            peers = await asyncio.to_thread(
-                self._get_peers_rpc
-            )
-            return peers
+            header, block_hash, finalized_hash, peers = await self._rpc_batch([
+                ("chain_getHeader", []),
+                ("chain_getBlockHash", []),
+                ("chain_getFinalizedHead", []),
+                ("system_peers", []),
+            ])
+
+            if isinstance(header, Exception) or not header:
+                logger.error(f"Failed to get chain head: {header}")
+                return None
+
+            if isinstance(peers, JsonRpcError):
+                logger.debug(f"system_peers unavailable (expected on public RPC): {peers}")
+                peers_count = 0
+            elif isinstance(peers, Exception):
+                logger.error(f"Failed to get peers count: {peers}")
+                peers_count = None
+            else:
+                peers_count = len(peers or [])
+
+            finalized_block_number = None
+            finalized_block_timestamp = None
+            if isinstance(finalized_hash, Exception):
+                logger.error(f"Failed to get finalized head: {finalized_hash}")
+            else:
+                try:
+                    finalized_header, finalized_block_timestamp = (
+                        await self._get_finalized_block(finalized_hash)
+                    )
+                    if finalized_header:
+                        finalized_block_number = int(finalized_header["number"], 16)
+                except asyncio.TimeoutError:
+                    logger.warning(f"Timeout getting finalized block (>{self.timeout}s)")
+                except Exception as e:
+                    logger.error(f"Failed to get finalized block: {e}")
+
+            return {
+                "block_height": int(header["number"], 16),
+                "block_hash": None if isinstance(block_hash, Exception) else block_hash,
+                "finalized_block_number": finalized_block_number,
+                "finalized_block_timestamp": finalized_block_timestamp,
+                "peers_count": peers_count,
+            }
+
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout getting chain state (>{self.timeout}s)")
+            return None
 
         except Exception as e:
-            logger.error(f"Failed to get peers count: {e}")
+            logger.error(f"Failed to get chain state: {e}")
+            return None
+
+    async def _get_finalized_block(
+        self, finalized_hash: str
+    ) -> tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Get header and timestamp of the finalized block in one round trip.
+
+        Only the parts missing from the block cache are requested, so a
+        finalized block is fetched once no matter how long finality stalls.
+
+        Returns:
+            (header, timestamp in ms); the timestamp is None if unreadable.
+        """
+        cache = await self.get_block_cache()
+        header = cache.get_header(finalized_hash) if cache else None
+        timestamp = cache.get_timestamp(finalized_hash) if cache else None
+
+        calls = []
+        if header is None:
+            calls.append(("chain_getHeader", [finalized_hash]))
+        if timestamp is None:
+            calls.append(("state_getStorage", [TIMESTAMP_NOW_KEY, finalized_hash]))
+
+        results = list(await self._rpc_batch(calls)) if calls else []
+
+        if header is None:
+            header = results.pop(0)
+            if isinstance(header, Exception):
+                raise header
+            if header and cache:
+                cache.put_finalized(finalized_hash, header)
+
+        if timestamp is None:
+            raw_value = results.pop(0)
+            if isinstance(raw_value, asyncio.TimeoutError):
+                logger.debug("Timeout reading finalized Timestamp.Now")
+            else:
+                if isinstance(raw_value, Exception):
+                    logger.debug(f"Raw Timestamp.Now read failed ({raw_value}), using metadata decoding")
+                    raw_value = None
+                timestamp = StorageUtils.decode_u64(raw_value)
+                if timestamp is None:
+                    timestamp = await self._decode_timestamp_in_background(finalized_hash)
+                elif cache:
+                    cache.put_timestamp(finalized_hash, timestamp)
+
+        return header, timestamp
+
+    async def _decode_timestamp_in_background(self, block_hash: str) -> Optional[int]:
+        """
+        Read Timestamp.Now with metadata decoding in a task that fills the block cache.
+
+        Building the SubstrateInterface and downloading metadata can take
+        longer than a probe's timeout, so while there is no interface yet
+        the read only starts and None is returned. Once the interface
+        exists a read is one round trip, which is awaited for up to half
+        the request timeout; a slower read still lands in the cache.
+        """
+        task = self._timestamp_tasks.get(block_hash)
+        if task is None:
+            task = asyncio.create_task(self._decode_block_timestamp(block_hash, None))
+            self._timestamp_tasks[block_hash] = task
+            task.add_done_callback(lambda _: self._timestamp_tasks.pop(block_hash, None))
+
+        if self.substrate is None:
             return None
 
-    def _get_peers_rpc(self) -> int:
-        """Get peers count via RPC. Returns 0 if unavailable."""
         try:
-            result = self.substrate.rpc_request(
-                method="system_peers",
-                params=[]
-            )
+            return await asyncio.wait_for(asyncio.shield(task), timeout=self.timeout / 2)
+        except asyncio.TimeoutError:
+            logger.debug(f"Timestamp.Now decoding at {block_hash} still running")
+            return None
 
-            if "result" in result:
-                return len(result["result"])
+    @property
+    def is_streaming(self) -> bool:
+        """True while both head subscriptions are active."""
+        return bool(self._head_subscriptions) and all(
+            self.transport.is_subscribed(subscription_id)
+            for subscription_id in self._head_subscriptions.values()
+        )
 
-            return 0
+    async def subscribe_heads(self) -> bool:
+        """
+        Subscribe to new and finalized heads.
+
+        Headers are fed into a fresh HeadTracker as they arrive. Returns
+        True if both subscriptions were started.
+        """
+        if not self.is_connected:
+            logger.warning("Not connected to RPC")
+            return False
+
+        tracker = HeadTracker()
+        subscriptions = {}
+
+        try:
+            subscriptions["chain_unsubscribeNewHeads"] = await self.transport.subscribe(
+                "chain_subscribeNewHeads", [], tracker.on_new_head
+            )
+            subscriptions["chain_unsubscribeFinalizedHeads"] = await self.transport.subscribe(
+                "chain_subscribeFinalizedHeads", [], tracker.on_finalized_head
+            )
 
         except Exception as e:
+            logger.error(f"Failed to subscribe to heads on {self.rpc_url}: {e}")
+            for method, subscription_id in subscriptions.items():
+                try:
+                    await self.transport.unsubscribe(method, subscription_id)
+                except Exception:
+                    pass
+            return False
+
+        self.head_tracker = tracker
+        self._head_subscriptions = subscriptions
+        logger.info(f"Subscribed to new and finalized heads on {self.rpc_url}")
+        return True
+
+    async def get_head_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Get head state from the subscriptions, subscribing if needed.
+
+        Returns:
+            HeadTracker.snapshot() dict, or None if streaming is unavailable.
+        """
+        # Nodes sharing this client must not subscribe twice
+        async with self._subscribe_lock:
+            if not self.is_streaming and not await self.subscribe_heads():
+                return None
+
+        if not await self.head_tracker.wait_ready(self.timeout):
+            logger.warning(f"No head received from {self.rpc_url} (>{self.timeout}s)")
+            return None
+
+        return self.head_tracker.snapshot()
+
+    async def get_peers_count(self) -> Optional[int]:
+        """Get number of connected peers. Returns None if fails."""
+        if not self.is_connected:
+            logger.warning("Not connected to RPC")
+            return None
+
+        try:
+            peers = await self._rpc("system_peers")
+            return len(peers or [])
+
+        except JsonRpcError as e:
             logger.debug(f"system_peers unavailable (expected on public RPC): {e}")
             return 0
 
+        except Exception as e:
+            logger.error(f"Failed to get peers count: {e}")
+            return None
+
     async def get_finalized_block_timestamp(self) -> Optional[int]:
         """
         Get timestamp of the finalized head block in milliseconds.
@@ -117,148 +521,158 @@ class PolkadotRPCClient:
         Returns:
             int: Timestamp in milliseconds, None if query fails
         """
-        if not self.substrate:
+        if not self.is_connected:
             logger.warning("Not connected to RPC")
             return None
 
         try:
-            timestamp = await asyncio.to_thread(
-                self._query_finalized_block_timestamp
-            )
-            return timestamp
+            finalized_hash = await self._rpc("chain_getFinalizedHead")
 
         except Exception as e:
-            logger.debug(f"Failed to get finalized block timestamp: {e}")
+            logger.debug(f"Failed to get finalized head for timestamp: {e}")
             return None
 
-    def _query_finalized_block_timestamp(self) -> int:
-        """Query finalized block timestamp (blocking operation)."""
-        try:
-            result = self.substrate.query("Timestamp", "Now")
-            timestamp_ms = result.value
-            
-            # Return what we got from the query (even if it's 0)
-            # Don't use fallback - if query returns something, use it
-            if timestamp_ms is not None:
-                return timestamp_ms
-            
-            # Only use current time as last resort
-            import time
-            return int(time.time() * 1000)
-        
-        except Exception:
-            # If Timestamp pallet not available, use current time
-            import time
-            return int(time.time() * 1000)
+        return await self.get_block_timestamp(finalized_hash)
 
-    async def measure_rpc_response_time(self) -> Optional[float]:
+    async def get_block_timestamp(self, block_hash: str) -> Optional[int]:
         """
-        Measure RPC response time in milliseconds.
+        Get a block's Timestamp.Now in milliseconds, memoized per block hash.
 
-        Uses system_health RPC call as a lightweight probe.
+        Args:
+            block_hash: Block hash to read the timestamp at.
 
         Returns:
-            float: Response time in milliseconds, None if measurement fails
+            int: Timestamp in milliseconds, None if it cannot be read.
         """
-        if not self.substrate:
-            logger.warning("Not connected to RPC")
+        cache = await self.get_block_cache()
+        timestamp = cache.get_timestamp(block_hash) if cache else None
+        if timestamp is not None:
+            return timestamp
+
+        try:
+            # Fast path: precomputed key, raw read, fixed-width u64 decode
+            raw_value = await self._rpc("state_getStorage", [TIMESTAMP_NOW_KEY, block_hash])
+
+        except asyncio.TimeoutError:
+            logger.debug("Timeout reading raw Timestamp.Now")
             return None
 
+        except Exception as e:
+            logger.debug(f"Raw Timestamp.Now read failed ({e}), using metadata decoding")
+            raw_value = None
+
+        return await self._decode_block_timestamp(block_hash, raw_value)
+
+    async def _decode_block_timestamp(
+        self, block_hash: str, raw_value: Optional[str]
+    ) -> Optional[int]:
+        """
+        Decode a raw Timestamp.Now value, falling back to metadata decoding.
+
+        Readable timestamps are stored in the block cache.
+        """
+        timestamp = StorageUtils.decode_u64(raw_value)
+
+        if timestamp is None:
+            logger.debug("Raw Timestamp.Now unreadable, using metadata decoding")
+            try:
+                timestamp = await self._run_blocking(
+                    self._query_block_timestamp, block_hash
+                )
+            except Exception as e:
+                logger.debug(f"Failed to get block timestamp: {e}")
+                return None
+
+        if timestamp is not None:
+            cache = await self.get_block_cache()
+            if cache:
+                cache.put_timestamp(block_hash, timestamp)
+
+        return timestamp
+
+    def _query_block_timestamp(self, block_hash: str) -> Optional[int]:
+        """Query Timestamp.Now at a block (blocking operation)."""
         try:
-            response_time_ms = await asyncio.to_thread(
-                self._measure_rpc_latency
-            )
-            return response_time_ms
+            result = self.substrate.query("Timestamp", "Now", block_hash=block_hash)
+            return result.value
 
         except Exception as e:
-            logger.error(f"Failed to measure RPC response time: {e}")
+            # No wall-clock fallback: a made-up timestamp would hide stalls
+            logger.debug(f"Timestamp.Now query at {block_hash} failed: {e}")
             return None
 
-    def _measure_rpc_latency(self) -> float:
-        """Measure RPC latency with system_health call (blocking operation)."""
-        start_time = time.time()
-        
-        try:
-            self.substrate.rpc_request(method="system_health", params=[])
-            elapsed_ms = (time.time() - start_time) * 1000
-            return elapsed_ms
-        
-        except Exception:
-            elapsed_ms = (time.time() - start_time) * 1000
-            return elapsed_ms
-        
-    async def get_finalized_block_number(self) -> Optional[int]:
+    async def measure_rpc_latency(self, samples: Optional[int] = None) -> Optional[LatencyStats]:
         """
-        Get finalized block number.
+        Measure RPC latency with several pipelined system_health calls.
+
+        All samples are in flight on the WebSocket at once; each is timed
+        from send to response with perf_counter_ns. Failed or timed-out
+        calls are counted as errors, not as latency samples.
+
+        Args:
+            samples: Calls per probe, defaults to the client's latency_samples.
 
         Returns:
-            int: Finalized block number, or None if query fails.
+            LatencyStats, or None if not connected.
         """
-        if not self.substrate:
+        if not self.is_connected:
             logger.warning("Not connected to RPC")
             return None
 
-        try:
-            block_number = await asyncio.to_thread(
-                self._query_finalized_block_number
+        async def _sample() -> Optional[float]:
+            start_ns = time.perf_counter_ns()
+            try:
+                await self._rpc("system_health")
+            except Exception as e:
+                logger.debug(f"Latency sample against {self.rpc_url} failed: {e!r}")
+                return None
+            return (time.perf_counter_ns() - start_ns) / 1_000_000
+
+        results = await asyncio.gather(
+            *(_sample() for _ in range(max(1, samples or self.latency_samples)))
+        )
+        latencies = [r for r in results if r is not None]
+
+        stats = RpcUtils.summarize_latency(latencies, errors=len(results) - len(latencies))
+        if stats.errors:
+            logger.warning(
+                f"{stats.errors}/{len(results)} latency samples failed for {self.rpc_url}"
             )
-            return block_number
-        except Exception as e:
-            logger.error(f"Failed to get finalized block number: {e}")
-            return None
+        return stats
 
-    def _query_finalized_block_number(self) -> int:
-        """Query finalized block number (blocking operation)."""
-        # Get finalized head hash via RPC
-        finalized_hash = self.substrate.rpc_request(
-            method="chain_getFinalizedHead",
-            params=[]
-        )
-        
-        # finalized_hash should be in result['result']
-        if "result" in finalized_hash:
-            finalized_hash = finalized_hash["result"]
-        
-        # Get header for this hash
-        header_result = self.substrate.rpc_request(
-            method="chain_getHeader",
-            params=[finalized_hash]
-        )
-        
-        if "result" in header_result:
-            header = header_result["result"]
-            # header['number'] is a hex string like '0x1ba1234'
-            block_number = int(header["number"], 16)
-            return block_number
-        
-        return 0
-    
-    async def get_chain_head(self) -> Optional[Dict[str, Any]]:
-        """Get current block height and hash. Returns None if fails."""
-        if not self.substrate:
+    async def measure_rpc_response_time(self) -> Optional[float]:
+        """
+        Measure RPC response time in milliseconds.
+
+        Uses system_health RPC call as a lightweight probe.
+
+        Returns:
+            float: Median response time in milliseconds, None if every
+            sample failed.
+        """
+        stats = await self.measure_rpc_latency()
+        return stats.p50_ms if stats else None
+
+    async def get_finalized_block_number(self) -> Optional[int]:
+        """
+        Get finalized block number.
+
+        Returns:
+            int: Finalized block number, or None if query fails.
+        """
+        if not self.is_connected:
             logger.warning("Not connected to RPC")
             return None
 
         try:
-            result = await asyncio.wait_for(
-                asyncio.to_thread(self._query_chain_head),
-                timeout=self.timeout
-            )
-            return result
+            finalized_hash = await self._rpc("chain_getFinalizedHead")
+            header = await self.get_header(finalized_hash, finalized=True)
 
-        except asyncio.TimeoutError:
-            logger.warning(f"Timeout getting chain head (>{self.timeout}s)")
-            return None
+            if not header:
+                return 0
+
+            return int(header["number"], 16)
 
         except Exception as e:
-            logger.error(f"Failed to get chain head: {e}")
+            logger.error(f"Failed to get finalized block number: {e}")
             return None
-
-    def _query_chain_head(self) -> Dict[str, Any]:
-        """Query chain head (blocking operation)."""
-        block_number = self.substrate.query("System", "Number")
-        block_hash = self.substrate.query("System", "BlockHash", [block_number.value])
-        return {
-            "block_height": block_number.value,
-            "block_hash": block_hash.value,
-        }
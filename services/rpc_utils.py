@@ -1,7 +1,17 @@
 import logging
+import math
+from typing import Iterable
+
+import numpy as np
+
+from models.metrics import HealthStatus, LatencyStats
 
 logger = logging.getLogger(__name__)
 
+# Response-time thresholds (ms), shared by the scalar and batch evaluators
+RPC_HEALTHY_MAX_MS = 500
+RPC_WARNING_MAX_MS = 2000
+
 
 class RpcUtils:
     """Utilities for RPC performance analysis."""
@@ -17,13 +27,36 @@ class RpcUtils:
         Returns:
             Health status: "healthy", "warning", or "critical"
         """
-        if response_time_ms <= 500:
+        if response_time_ms <= RPC_HEALTHY_MAX_MS:
             return "healthy"
-        elif response_time_ms <= 2000:
+        elif response_time_ms <= RPC_WARNING_MAX_MS:
             return "warning"
         else:
             return "critical"
 
+    @staticmethod
+    def evaluate_rpc_health_batch(
+        response_time_ms: np.ndarray,
+        healthy_max_ms: float = RPC_HEALTHY_MAX_MS,
+        warning_max_ms: float = RPC_WARNING_MAX_MS,
+    ) -> np.ndarray:
+        """
+        Vectorized evaluate_rpc_health.
+
+        Args:
+            response_time_ms: Response times in milliseconds.
+            healthy_max_ms: Highest response time still healthy.
+            warning_max_ms: Highest response time still a warning.
+
+        Returns:
+            int8 array of HealthStatus codes, same shape as the input.
+        """
+        response_time_ms = np.asarray(response_time_ms)
+        codes = np.full(response_time_ms.shape, HealthStatus.CRITICAL, dtype=np.int8)
+        codes[response_time_ms <= warning_max_ms] = HealthStatus.WARNING
+        codes[response_time_ms <= healthy_max_ms] = HealthStatus.HEALTHY
+        return codes
+
     @staticmethod
     def format_response_time(response_time_ms: float) -> str:
         """
@@ -39,3 +72,45 @@ class RpcUtils:
             return f"{response_time_ms:.0f}ms"
         else:
             return f"{response_time_ms / 1000:.2f}s"
+
+    @staticmethod
+    def percentile(sorted_values: list[float], q: float) -> float:
+        """
+        Nearest-rank percentile of pre-sorted values.
+
+        Args:
+            sorted_values: Non-empty values in ascending order.
+            q: Percentile between 0 and 100.
+
+        Returns:
+            The smallest value with at least q% of values at or below it.
+        """
+        rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+        return sorted_values[min(rank, len(sorted_values)) - 1]
+
+    @staticmethod
+    def summarize_latency(samples_ms: Iterable[float], errors: int = 0) -> LatencyStats:
+        """
+        Summarize latency samples as min/p50/p95/max.
+
+        Args:
+            samples_ms: Latencies of successful calls in milliseconds.
+            errors: Number of failed calls, kept out of the percentiles.
+
+        Returns:
+            LatencyStats; percentiles are None if there are no samples.
+        """
+        ordered = sorted(samples_ms)
+
+        if not ordered:
+            return LatencyStats(0, errors, None, None, None, None)
+
+        return LatencyStats(
+            samples=len(ordered),
+            errors=errors,
+            min_ms=ordered[0],
+            p50_ms=RpcUtils.percentile(ordered, 50),
+            p95_ms=RpcUtils.percentile(ordered, 95),
+            max_ms=ordered[-1],
+            values_ms=ordered,
+        )
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Optional
+
+from models.node import Node
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TickStats:
+    """Scheduling counters for a single node."""
+
+    ticks: int = 0
+    overruns: int = 0        # ticks that took longer than the interval
+    skipped: int = 0         # slots dropped instead of running late ticks
+    max_lateness: float = 0  # worst start delay after the due time, seconds
+
+
+class TickScheduler:
+    """
+    Runs a per-node tick on a fixed interval without drift.
+
+    Every node has its own schedule ``start + offset + k * interval`` on the
+    monotonic clock, so sleep overshoot and tick duration never accumulate.
+    Each node gets a random phase offset in ``[0, jitter)`` to spread load.
+    A tick that runs past its next slot is reported as an overrun and the
+    missed slots are skipped, instead of firing queued ticks back to back.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        jitter: float = 0.0,
+        max_concurrency: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            interval: Seconds between ticks for each node.
+            jitter: Upper bound of the random per-node phase offset, seconds.
+            max_concurrency: Maximum number of ticks running at once.
+            clock: Monotonic clock returning seconds.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        self.interval = interval
+        self.jitter = max(0.0, min(jitter, interval))
+        self.clock = clock
+        self.stats: dict[str, TickStats] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask all node loops to finish after their current tick."""
+        self._stop.set()
+
+    async def run(
+        self,
+        nodes: Iterable[Node],
+        tick: Callable[[Node], Awaitable[None]],
+    ) -> None:
+        """
+        Run ``tick(node)`` for every node on schedule until stop() is called.
+
+        Args:
+            nodes: Nodes to schedule.
+            tick: Coroutine function run once per node per interval.
+        """
+        start = self.clock()
+        loops = [
+            asyncio.create_task(
+                self._run_node(node, tick, start + random.uniform(0, self.jitter))
+            )
+            for node in nodes
+        ]
+
+        try:
+            await asyncio.gather(*loops)
+        finally:
+            for loop in loops:
+                loop.cancel()
+            await asyncio.gather(*loops, return_exceptions=True)
+
+    async def _run_node(
+        self,
+        node: Node,
+        tick: Callable[[Node], Awaitable[None]],
+        first_due: float,
+    ) -> None:
+        """Schedule loop for a single node."""
+        stats = self.stats.setdefault(node.name, TickStats())
+        slot = 0
+
+        while not self._stop.is_set():
+            due = first_due + slot * self.interval
+
+            if await self._sleep_until(due):
+                return
+
+            lateness = self.clock() - due
+            stats.max_lateness = max(stats.max_lateness, lateness)
+
+            await self._run_tick(node, tick)
+            stats.ticks += 1
+
+            # Next slot strictly in the future; anything in between is skipped
+            now = self.clock()
+            next_slot = max(slot + 1, math.floor((now - first_due) / self.interval) + 1)
+            missed = next_slot - slot - 1
+
+            if missed > 0:
+                stats.overruns += 1
+                stats.skipped += missed
+                logger.warning(
+                    f"Tick for {node.name} overran the {self.interval}s interval "
+                    f"(took {now - due:.1f}s); skipped {missed} tick(s)"
+                )
+
+            slot = next_slot
+
+    async def _run_tick(
+        self,
+        node: Node,
+        tick: Callable[[Node], Awaitable[None]],
+    ) -> None:
+        """Run one tick, honouring the concurrency cap and isolating errors."""
+        try:
+            if self._semaphore is None:
+                await tick(node)
+            else:
+                async with self._semaphore:
+                    await tick(node)
+
+        except Exception as e:
+            logger.error(f"Tick failed for {node.name}: {type(e).__name__}: {e}")
+
+    async def _sleep_until(self, deadline: float) -> bool:
+        """Sleep until the deadline. Returns True if stop() was called."""
+        delay = deadline - self.clock()
+        if delay <= 0:
+            return self._stop.is_set()
+
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
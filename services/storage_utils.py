@@ -0,0 +1,65 @@
+import logging
+from typing import Optional
+
+from substrateinterface.utils.hasher import xxh128
+
+logger = logging.getLogger(__name__)
+
+
+class StorageUtils:
+    """Raw storage keys and fixed-width SCALE decoding for hot probes."""
+
+    @staticmethod
+    def storage_key(pallet: str, item: str) -> str:
+        """
+        Build the storage key of a plain (non-map) storage item.
+
+        Args:
+            pallet: Pallet name, e.g. "Timestamp".
+            item: Storage item name, e.g. "Now".
+
+        Returns:
+            Hex key: 0x + twox128(pallet) + twox128(item).
+        """
+        return "0x" + (xxh128(pallet.encode()) + xxh128(item.encode())).hex()
+
+    @staticmethod
+    def decode_uint(value_hex: Optional[str], byte_width: int) -> Optional[int]:
+        """
+        Decode a SCALE fixed-width unsigned integer (little endian).
+
+        Args:
+            value_hex: Hex string from state_getStorage, or None.
+            byte_width: 4 for u32, 8 for u64.
+
+        Returns:
+            Decoded integer, or None if the value is missing or malformed.
+        """
+        if not value_hex:
+            return None
+
+        try:
+            raw = bytes.fromhex(value_hex[2:] if value_hex.startswith("0x") else value_hex)
+        except ValueError:
+            logger.debug(f"Storage value is not hex: {value_hex!r}")
+            return None
+
+        if len(raw) != byte_width:
+            logger.debug(f"Expected {byte_width} bytes, got {len(raw)}: {value_hex}")
+            return None
+
+        return int.from_bytes(raw, "little")
+
+    @staticmethod
+    def decode_u32(value_hex: Optional[str]) -> Optional[int]:
+        """Decode a SCALE u32 storage value."""
+        return StorageUtils.decode_uint(value_hex, 4)
+
+    @staticmethod
+    def decode_u64(value_hex: Optional[str]) -> Optional[int]:
+        """Decode a SCALE u64 storage value."""
+        return StorageUtils.decode_uint(value_hex, 8)
+
+
+# Hot storage keys, hashed once at import
+TIMESTAMP_NOW_KEY = StorageUtils.storage_key("Timestamp", "Now")  # u64, milliseconds
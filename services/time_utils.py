@@ -1,8 +1,18 @@
 import logging
 from datetime import datetime, timezone
 
+import numpy as np
+
+from models.metrics import HealthStatus
+
 logger = logging.getLogger(__name__)
 
+# Block age thresholds (s), shared by the scalar and batch evaluators
+BLOCK_HEALTHY_MAX_SECONDS = 12
+BLOCK_WARNING_MAX_SECONDS = 30
+# Block age reported when no block timestamp could be read
+BLOCK_AGE_UNKNOWN = -1
+
 
 class TimeUtils:
     """Utilities for working with blockchain timestamps."""
@@ -30,14 +40,43 @@ class TimeUtils:
         Evaluate block freshness health status.
 
         Args:
-            seconds_since_block: Seconds since last block.
+            seconds_since_block: Seconds since last block, negative if
+                unknown.
 
         Returns:
-            Health status: "healthy", "warning", or "critical"
+            Health status: "healthy", "warning", or "critical". An unknown
+            block age is a warning.
         """
-        if seconds_since_block <= 12:
+        if seconds_since_block < 0:
+            return "warning"
+        elif seconds_since_block <= BLOCK_HEALTHY_MAX_SECONDS:
             return "healthy"
-        elif seconds_since_block <= 30:
+        elif seconds_since_block <= BLOCK_WARNING_MAX_SECONDS:
             return "warning"
         else:
             return "critical"
+
+    @staticmethod
+    def evaluate_block_freshness_batch(
+        seconds_since_block: np.ndarray,
+        healthy_max_seconds: float = BLOCK_HEALTHY_MAX_SECONDS,
+        warning_max_seconds: float = BLOCK_WARNING_MAX_SECONDS,
+    ) -> np.ndarray:
+        """
+        Vectorized evaluate_block_freshness.
+
+        Args:
+            seconds_since_block: Seconds since the last block, negative
+                if unknown.
+            healthy_max_seconds: Highest block age still healthy.
+            warning_max_seconds: Highest block age still a warning.
+
+        Returns:
+            int8 array of HealthStatus codes, same shape as the input.
+        """
+        seconds_since_block = np.asarray(seconds_since_block)
+        codes = np.full(seconds_since_block.shape, HealthStatus.CRITICAL, dtype=np.int8)
+        codes[seconds_since_block <= warning_max_seconds] = HealthStatus.WARNING
+        codes[seconds_since_block <= healthy_max_seconds] = HealthStatus.HEALTHY
+        codes[seconds_since_block < 0] = HealthStatus.WARNING
+        return codes
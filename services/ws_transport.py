@@ -0,0 +1,372 @@
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Callable, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class JsonRpcError(Exception):
+    """Error object returned by a JSON-RPC endpoint."""
+
+    def __init__(self, error: dict):
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(f"{error.get('message', 'JSON-RPC error')} (code {self.code})")
+
+
+class BatchRejectedError(JsonRpcError):
+    """Id-less error answering a whole batch: the endpoint does not take batches."""
+
+
+class JsonRpcWebSocket:
+    """
+    Asyncio JSON-RPC 2.0 client over a single WebSocket.
+
+    Many requests can be in flight at once: each gets a unique id and a
+    future, and one reader task routes responses back by id. No threads
+    are involved, so one event loop can serve hundreds of endpoints.
+    """
+
+    def __init__(self, url: str, timeout: float = 10):
+        """
+        Args:
+            url: WebSocket URL of the JSON-RPC endpoint.
+            timeout: Default timeout in seconds for connect and requests.
+        """
+        self.url = url
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: dict[int, asyncio.Future] = {}
+        # first request id -> request ids of each in-flight batch
+        self._batches: dict[int, list[int]] = {}
+        # Id-less errors not yet matched to a batch
+        self._rejections: list[BatchRejectedError] = []
+        # request id -> callback for subscribe calls awaiting their id
+        self._subscribe_requests: dict[int, Callable[[Any], None]] = {}
+        # subscription id -> callback for notifications
+        self._subscriptions: dict[Any, Callable[[Any], None]] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """True while the WebSocket is open."""
+        return self._ws is not None and not self._ws.closed
+
+    async def connect(self) -> None:
+        """Open the WebSocket and start the response reader."""
+        # Several callers may share this socket; only one may (re)connect
+        async with self._connect_lock:
+            if self.connected:
+                return
+
+            # Drop what is left of a connection the server closed on us
+            await self.close()
+
+            self._session = aiohttp.ClientSession()
+            try:
+                self._ws = await asyncio.wait_for(
+                    self._session.ws_connect(
+                        self.url,
+                        heartbeat=30,
+                        max_msg_size=0,  # metadata responses can be several MB
+                    ),
+                    timeout=self.timeout,
+                )
+            except BaseException:
+                await self._session.close()
+                self._session = None
+                raise
+
+            self._reader_task = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        """Close the WebSocket and fail any requests still waiting."""
+        if self._reader_task:
+            self._reader_task.cancel()
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+        self._fail_pending(ConnectionError(f"Connection to {self.url} closed"))
+        self._rejections.clear()
+        self._subscriptions.clear()
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[list] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Send a JSON-RPC request and wait for its result.
+
+        Args:
+            method: JSON-RPC method name.
+            params: Positional parameters.
+            timeout: Seconds to wait for the response (default: self.timeout).
+
+        Returns:
+            The "result" field of the response.
+
+        Raises:
+            ConnectionError: If the socket is not connected or drops.
+            JsonRpcError: If the endpoint returns an error object.
+            asyncio.TimeoutError: If no response arrives in time.
+        """
+        if not self.connected:
+            raise ConnectionError(f"Not connected to {self.url}")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params or [],
+        }
+
+        try:
+            await self._ws.send_str(json.dumps(payload))
+            return await asyncio.wait_for(
+                future,
+                timeout=self.timeout if timeout is None else timeout,
+            )
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def subscribe(
+        self,
+        method: str,
+        params: Optional[list],
+        callback: Callable[[Any], None],
+    ) -> Any:
+        """
+        Start a JSON-RPC subscription.
+
+        The callback is registered as soon as the subscription id arrives,
+        before any notification for it can be dispatched, and is called
+        from the reader task with each notification's "result".
+
+        Returns:
+            Subscription id, used for unsubscribe().
+        """
+        if not self.connected:
+            raise ConnectionError(f"Not connected to {self.url}")
+
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._subscribe_requests[request_id] = callback
+
+        payload = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params or [],
+        }
+
+        try:
+            await self._ws.send_str(json.dumps(payload))
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+            self._subscribe_requests.pop(request_id, None)
+
+    async def unsubscribe(self, method: str, subscription_id: Any) -> None:
+        """Stop a subscription started with subscribe()."""
+        self._subscriptions.pop(subscription_id, None)
+        if self.connected:
+            await self.request(method, [subscription_id])
+
+    def is_subscribed(self, subscription_id: Any) -> bool:
+        """True while the subscription is active on this socket."""
+        return self.connected and subscription_id in self._subscriptions
+
+    async def request_batch(
+        self,
+        calls: list[tuple[str, list]],
+        timeout: Optional[float] = None,
+    ) -> list[Any]:
+        """
+        Send several JSON-RPC requests as one batch array.
+
+        The endpoint answers with one array, in any order; responses are
+        matched back to calls by id.
+
+        Args:
+            calls: (method, params) pairs.
+            timeout: Seconds to wait for the response (default: self.timeout).
+
+        Returns:
+            One entry per call, in call order: the result, or the
+            exception for that call (JsonRpcError, or ConnectionError
+            if the socket dropped while waiting).
+
+        Raises:
+            ConnectionError: If the socket is not connected.
+            asyncio.TimeoutError: If the batch response does not arrive in time.
+        """
+        if not self.connected:
+            raise ConnectionError(f"Not connected to {self.url}")
+        if not calls:
+            return []
+
+        loop = asyncio.get_running_loop()
+        request_ids = [next(self._ids) for _ in calls]
+        futures = []
+        payload = []
+
+        for request_id, (method, params) in zip(request_ids, calls):
+            future = loop.create_future()
+            self._pending[request_id] = future
+            futures.append(future)
+            payload.append({
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": method,
+                "params": params or [],
+            })
+
+        self._batches[request_ids[0]] = request_ids
+
+        try:
+            await self._ws.send_str(json.dumps(payload))
+            return await asyncio.wait_for(
+                asyncio.gather(*futures, return_exceptions=True),
+                timeout=self.timeout if timeout is None else timeout,
+            )
+        finally:
+            self._batches.pop(request_ids[0], None)
+            for request_id in request_ids:
+                self._pending.pop(request_id, None)
+            if self._rejections:
+                self._match_rejections()
+
+    async def _read_loop(self) -> None:
+        """Route incoming messages to the futures waiting for them."""
+        error: Exception = ConnectionError(f"Connection to {self.url} lost")
+
+        try:
+            async for message in self._ws:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self._dispatch(json.loads(message.data))
+                    if self._rejections:
+                        self._match_rejections()
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    error = ConnectionError(
+                        f"WebSocket error on {self.url}: {self._ws.exception()}"
+                    )
+                    break
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            logger.error(f"Reader for {self.url} stopped: {type(e).__name__}: {e}")
+            error = ConnectionError(f"Reader for {self.url} failed: {e}")
+
+        self._fail_pending(error)
+        self._subscriptions.clear()
+
+    def _dispatch(self, message: Any) -> None:
+        """Resolve the future(s) for a decoded response or batch response."""
+        if isinstance(message, list):
+            for item in message:
+                self._dispatch(item)
+            return
+
+        if not isinstance(message, dict):
+            return
+
+        if "method" in message and "id" not in message:
+            self._dispatch_notification(message.get("params") or {})
+            return
+
+        if message.get("id") is None and "error" in message:
+            # Endpoints that do not support batches answer the whole
+            # array with one error object that carries no id
+            self._rejections.append(BatchRejectedError(message["error"]))
+            return
+
+        future = self._pending.get(message.get("id"))
+        if future is None or future.done():
+            return
+
+        if "error" in message:
+            future.set_exception(JsonRpcError(message["error"]))
+            return
+
+        callback = self._subscribe_requests.get(message["id"])
+        if callback is not None:
+            self._subscriptions[message.get("result")] = callback
+
+        future.set_result(message.get("result"))
+
+    def _dispatch_notification(self, params: dict) -> None:
+        """Hand a subscription notification to its callback."""
+        callback = self._subscriptions.get(params.get("subscription"))
+        if callback is None:
+            return
+
+        try:
+            callback(params.get("result"))
+        except Exception as e:
+            logger.error(
+                f"Subscription callback failed on {self.url}: "
+                f"{type(e).__name__}: {e}"
+            )
+
+    def _match_rejections(self) -> None:
+        """
+        Fail the in-flight batches that id-less errors must be answering.
+
+        A rejection replaces a batch's whole response array and carries
+        no id, so only batches none of whose ids got a response can have
+        been rejected. Rejections are held until they account for every
+        such batch (one in flight, or one error per batch); meanwhile
+        other batches may still be answered and drop out. Errors left
+        once no batch can match are only logged, so other requests on
+        the shared socket are not affected.
+        """
+        unanswered = []
+        for request_ids in self._batches.values():
+            futures = [self._pending.get(request_id) for request_id in request_ids]
+            if all(future is not None and not future.done() for future in futures):
+                unanswered.append(futures)
+
+        if not unanswered:
+            for error in self._rejections:
+                logger.warning(f"Id-less error from {self.url} matches no batch: {error}")
+            self._rejections.clear()
+            return
+
+        if len(self._rejections) < len(unanswered):
+            return
+
+        for futures, error in zip(unanswered, self._rejections):
+            for future in futures:
+                future.set_exception(error)
+        self._rejections.clear()
+
+    def _fail_pending(self, error: Exception) -> None:
+        """Fail every request still waiting for a response."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
@@ -6,7 +6,9 @@ import unittest
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from models.metrics import HealthMetrics
+import numpy as np
+
+from models.metrics import HealthMetrics, MetricsBatch
 from services.alerts import AlertSystem
 
 
@@ -166,6 +168,31 @@ class TestAlertSystem(unittest.TestCase):
         self.assertTrue(hasattr(alert, "metric_name"))
         print("✓ Alert structure is correct")
 
+    
+    def test_batch_checks_match_check_alerts(self):
+        """Test that vectorized checks flag exactly the alerts check_alerts raises."""
+        rng = np.random.default_rng(3)
+        metrics = [
+            HealthMetrics(
+                timestamp=datetime.now(),
+                node_name="test-node",
+                block_height=2150000,
+                current_block_height=2150005,
+                peers_count=int(rng.integers(0, 10)),
+                finality_lag=int(rng.integers(40, 60)),
+                time_since_last_block=int(rng.choice([-1, *range(50, 70)])),
+                rpc_response_time=float(rng.choice([4999.0, 5000.0, 5000.5, 6000.0])),
+                status="healthy"
+            )
+            for _ in range(2000)
+        ]
+        
+        flags = AlertSystem.check_alerts_batch(MetricsBatch.from_metrics(metrics))
+        
+        for i, m in enumerate(metrics):
+            raised = {alert.metric_name for alert in AlertSystem.check_alerts(m)}
+            self.assertEqual({name for name, flag in flags.items() if flag[i]}, raised)
+        print("✓ Batch alert checks match check_alerts")
 
 if __name__ == '__main__':
     unittest.main()
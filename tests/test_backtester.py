@@ -0,0 +1,244 @@
+import sys
+from pathlib import Path
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+import io
+import tempfile
+import unittest
+from unittest.mock import patch
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from models.metrics import HealthMetrics, MetricsBatch
+from services.alerts import AlertThresholds
+from services.backtester import (
+    AlertBacktester,
+    iter_csv_batches,
+    iter_db_batches,
+    iter_history_batches,
+    parse_candidate,
+)
+from services.csv_exporter import export_metrics_to_csv
+from services.database import MetricsDB
+from services import history_store
+from services.history_store import ParquetHistoryStore, SQLiteHistoryStore
+import backtest
+
+START = datetime(2025, 12, 10, 10, 0, 0)
+
+# Only the finality lag check can fire with these thresholds
+FINALITY_ONLY = AlertThresholds(
+    finality_lag=50, rpc_response_time_ms=1e9, peers_min=0, block_age_seconds=1e9
+)
+LAGS = [0, 60, 60, 0, 0, 60, 0, 0, 0, 0, 0, 0, 60, 60]
+CRITICAL_MINUTES = {4, 5, 6, 9, 10, 13}
+
+
+def make_series(node_name: str = "node-a", lags=LAGS, critical=CRITICAL_MINUTES):
+    """One sample a minute from START."""
+    return [
+        HealthMetrics(
+            timestamp=START + timedelta(minutes=i),
+            node_name=node_name,
+            block_height=1000 + i,
+            current_block_height=1000 + i,
+            peers_count=40,
+            finality_lag=lag,
+            time_since_last_block=6,
+            rpc_response_time=100.0,
+            status="critical" if i in critical else "healthy",
+        )
+        for i, lag in enumerate(lags)
+    ]
+
+
+def run_backtest(batches, candidates=None):
+    backtester = AlertBacktester(candidates or {"finality": FINALITY_ONLY}, flap_window_seconds=300)
+    for batch in batches:
+        backtester.feed(batch)
+    return backtester.results()
+
+
+def summary(result):
+    """Comparable view of a result, without the carried state."""
+    return (
+        result.candidate,
+        result.node_name,
+        result.samples,
+        {name: (s.samples, s.episodes, s.flaps) for name, s in result.alerts.items()},
+        result.incidents,
+        result.detected,
+        result.detect_seconds,
+        result.false_alert_samples,
+    )
+
+
+class TestAlertBacktester(unittest.TestCase):
+
+    def test_known_series(self):
+        """Test alert counts, flaps and time-to-detect on a hand-checked series."""
+        [result] = run_backtest([MetricsBatch.from_metrics(make_series())])
+
+        finality = result.alerts["finality_lag"]
+        self.assertEqual((finality.samples, finality.episodes, finality.flaps), (5, 3, 1))
+        self.assertEqual(result.alerts["peers_count"].samples, 0)
+        self.assertEqual(result.alerts["any"].episodes, 3)
+        self.assertEqual(result.incidents, 3)
+        self.assertEqual(result.detected, 2)
+        self.assertEqual(result.missed, 1)
+        self.assertEqual(result.detect_seconds, [60.0, 0.0])
+        self.assertEqual(result.max_detect_seconds, 60.0)
+        self.assertEqual(result.false_alert_samples, 3)
+        print("✓ Known series backtest passed")
+
+    def test_chunking_does_not_change_results(self):
+        """Test that state carried across chunks gives the single-pass result."""
+        rng = np.random.default_rng(11)
+        lags = rng.choice([0, 5, 60], size=500, p=[0.05, 0.6, 0.35]).tolist()
+        critical = set(np.flatnonzero(rng.random(500) < 0.3).tolist())
+        batch = MetricsBatch.from_metrics(make_series(lags=lags, critical=critical))
+        [expected] = run_backtest([batch])
+
+        for chunk_size in (1, 2, 7, 64, 499):
+            chunks = [
+                batch.take(np.arange(i, min(i + chunk_size, len(batch))))
+                for i in range(0, len(batch), chunk_size)
+            ]
+            [result] = run_backtest(chunks)
+            self.assertEqual(summary(result), summary(expected), chunk_size)
+        print("✓ Chunk-invariant backtest passed")
+
+    def test_candidates_and_nodes_in_one_pass(self):
+        """Test that every candidate is scored for every node of a mixed batch."""
+        batch = MetricsBatch.from_metrics(make_series("node-a") + make_series("node-b"))
+
+        results = run_backtest([batch], {
+            "finality": FINALITY_ONLY,
+            "never": AlertThresholds(1e9, 1e9, 0, 1e9),
+        })
+
+        self.assertEqual(
+            [(r.candidate, r.node_name) for r in results],
+            [("finality", "node-a"), ("finality", "node-b"), ("never", "node-a"), ("never", "node-b")],
+        )
+        self.assertEqual(results[1].alerts["any"].samples, 5)
+        self.assertEqual(results[2].detected, 0)
+        self.assertEqual(results[2].missed, 3)
+        print("✓ Multi-candidate backtest passed")
+
+    def test_parse_candidate(self):
+        """Test threshold set parsing with names, defaults and bad fields."""
+        name, thresholds = parse_candidate("strict: finality_lag=20, peers_min=10")
+        self.assertEqual(name, "strict")
+        self.assertEqual(thresholds.finality_lag, 20)
+        self.assertEqual(thresholds.peers_min, 10)
+        self.assertEqual(thresholds.block_age_seconds, AlertThresholds().block_age_seconds)
+
+        self.assertEqual(parse_candidate("block_age_seconds=30", 2)[0], "candidate-2")
+        with self.assertRaises(ValueError):
+            parse_candidate("finality=20")
+        print("✓ Candidate parsing passed")
+
+
+class TestBacktestSources(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.temp_dir.name) / "test.db")
+        self.csv_path = str(Path(self.temp_dir.name) / "metrics.csv")
+
+        metrics = make_series("node-a") + make_series("node-b")
+        db = MetricsDB(db_path=self.db_path)
+        db.create_tables()
+        db.insert_batch(metrics)
+        db.close()
+        export_metrics_to_csv(reversed(metrics), self.csv_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_db_and_csv_agree(self):
+        """Test that both sources replay the same range with the same results."""
+        start, end = START + timedelta(minutes=1), START + timedelta(minutes=13)
+        db = MetricsDB(db_path=self.db_path)
+        try:
+            from_db = run_backtest(iter_db_batches(db, start, end, chunk_size=4))
+        finally:
+            db.close()
+        from_csv = run_backtest(iter_csv_batches(self.csv_path, start, end))
+
+        self.assertEqual([summary(r) for r in from_db], [summary(r) for r in from_csv])
+        self.assertEqual(from_db[0].samples, 12)
+        print("✓ DB and CSV sources agree")
+
+    def test_history_stores_agree_with_db(self):
+        """Test that replaying a HistoryStore matches replaying the database."""
+        start, end = START + timedelta(minutes=1), START + timedelta(minutes=13)
+        db = MetricsDB(db_path=self.db_path)
+        try:
+            from_db = run_backtest(iter_db_batches(db, start, end, chunk_size=4))
+            stores = [SQLiteHistoryStore(db)]
+            if history_store.pa is not None:
+                parquet = ParquetHistoryStore(Path(self.temp_dir.name) / "history")
+                parquet.append(make_series("node-a") + make_series("node-b"))
+                stores.append(parquet)
+
+            for store in stores:
+                from_store = run_backtest(iter_history_batches(store, start, end, chunk_size=4))
+                self.assertEqual([summary(r) for r in from_store], [summary(r) for r in from_db])
+        finally:
+            db.close()
+        print("✓ History store source agrees with DB")
+
+    def test_cli(self):
+        """Test the backtest entry point end to end."""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            code = backtest.main([
+                "--db", self.db_path,
+                "--start", START.isoformat(),
+                "--candidate", "strict:finality_lag=10",
+            ])
+
+        self.assertEqual(code, 0)
+        report = output.getvalue()
+        self.assertIn("strict", report)
+        self.assertIn("node-b", report)
+        self.assertIn("Replayed 28 samples against 2 threshold sets", report)
+
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(backtest.main(["--csv", self.csv_path, "--candidate", "bogus=1"]), 2)
+        print("✓ Backtest CLI passed")
+
+    def test_cli_history_source(self):
+        """Test that --history replays the store built by create_history_store."""
+        output = io.StringIO()
+        with patch.object(backtest, "create_history_store",
+                          return_value=SQLiteHistoryStore(MetricsDB(db_path=self.db_path))):
+            with redirect_stdout(output):
+                code = backtest.main(["--history", "--start", START.isoformat()])
+
+        self.assertEqual(code, 0)
+        self.assertIn("Replayed 28 samples against 1 threshold sets", output.getvalue())
+        print("✓ Backtest CLI history source passed")
+
+    def test_cli_with_utc_offsets(self):
+        """Test that offset-bearing --start/--end select the same UTC window from both sources."""
+        for source in (["--db", self.db_path], ["--csv", self.csv_path]):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                code = backtest.main(source + [
+                    "--start", "2025-12-10T12:00:00+02:00",
+                    "--end", "2025-12-10T05:05:00-05:00",
+                ])
+
+            self.assertEqual(code, 0, source)
+            self.assertIn("Replayed 10 samples against 1 threshold sets", output.getvalue())
+        print("✓ Backtest CLI with UTC offsets passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,277 @@
+import sys
+from pathlib import Path
+import unittest
+import asyncio
+import time
+from types import SimpleNamespace
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.block_cache import BlockCacheRegistry, LRUCache
+from services.rpc_client import PolkadotRPCClient
+from services.ws_transport import JsonRpcError
+
+
+GENESIS = "0x91b171bb158e2d3848fa23a9f1c25182fb8e20313b2c1eb49219da7a70ce90c3"
+FINALIZED_TIMESTAMP_MS = 1765362600000
+
+
+class FakeTransport:
+    """Answers JSON-RPC calls for a chain whose finality is stuck at #100."""
+
+    connected = True
+
+    def __init__(self, storage_ok: bool = True, finalized_header_ok: bool = True):
+        self.storage_ok = storage_ok
+        self.finalized_header_ok = finalized_header_ok
+        self.calls: list[tuple[str, list]] = []
+
+    async def request(self, method, params=None, timeout=None):
+        self.calls.append((method, params or []))
+        if method == "chain_getBlockHash":
+            return GENESIS if params == [0] else "0xbest"
+        if method == "chain_getHeader":
+            if params == ["0xfinal"] and not self.finalized_header_ok:
+                raise JsonRpcError({"code": -32000, "message": "Unknown block"})
+            return {"number": hex(100 if params == ["0xfinal"] else 105)}
+        if method == "chain_getFinalizedHead":
+            return "0xfinal"
+        if method == "state_getStorage":
+            if not self.storage_ok:
+                return None
+            timestamp_ms = FINALIZED_TIMESTAMP_MS if params[1:] == ["0xfinal"] else 0
+            return "0x" + timestamp_ms.to_bytes(8, "little").hex()
+        return []
+
+    async def request_batch(self, calls):
+        results = []
+        for method, params in calls:
+            try:
+                results.append(await self.request(method, params))
+            except Exception as e:
+                results.append(e)
+        return results
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class FailingSubstrate:
+    """Metadata fallback that cannot read Timestamp.Now."""
+
+    def query(self, module, storage_function, block_hash=None):
+        raise RuntimeError("Timestamp pallet unavailable")
+
+    def close(self):
+        pass
+
+
+class SlowSubstrate(FailingSubstrate):
+    """Metadata fallback that takes longer than a probe's timeout."""
+
+    def query(self, module, storage_function, block_hash=None):
+        time.sleep(0.3)
+        return SimpleNamespace(value=FINALIZED_TIMESTAMP_MS)
+
+
+class MetadataSubstrate(FailingSubstrate):
+    """Metadata fallback that answers in one round trip."""
+
+    def query(self, module, storage_function, block_hash=None):
+        return SimpleNamespace(value=FINALIZED_TIMESTAMP_MS)
+
+
+def make_client(registry, url="wss://a.example", **transport_kwargs):
+    client = PolkadotRPCClient(url, block_caches=registry, metadata_cache_dir=None)
+    client.transport = FakeTransport(**transport_kwargs)
+    return client
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_eviction_and_counters(self):
+        """Test that the least recently used entry is evicted and counted."""
+        cache = LRUCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", 3)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.evictions, 1)
+        self.assertEqual(cache.stats.size, 2)
+        print("✓ LRU eviction test passed")
+
+
+class TestBlockCache(unittest.TestCase):
+
+    def test_only_finalized_hashes_cached(self):
+        """Test that block numbers above the finalized head are not cached."""
+        cache = BlockCacheRegistry().for_chain(GENESIS)
+        cache.put_finalized("0xfinal", {"number": hex(100)})
+
+        cache.put_hash(99, "0x99")
+        cache.put_hash(101, "0x101")
+
+        self.assertEqual(cache.get_hash(100), "0xfinal")
+        self.assertEqual(cache.get_hash(99), "0x99")
+        self.assertIsNone(cache.get_hash(101))
+        print("✓ Finalized hash caching test passed")
+
+    def test_shared_per_chain(self):
+        """Test that the registry returns one cache per genesis hash."""
+        registry = BlockCacheRegistry()
+
+        self.assertIs(registry.for_chain(GENESIS), registry.for_chain(GENESIS.upper()))
+        self.assertIsNot(registry.for_chain(GENESIS), registry.for_chain("0xb0a8d493"))
+        self.assertEqual(len(registry), 2)
+        print("✓ Per-chain sharing test passed")
+
+    def test_stalled_finality_reuses_header(self):
+        """Test that an unchanged finalized head is not fetched again."""
+        registry = BlockCacheRegistry()
+        clients = [
+            make_client(registry, url) for url in ("wss://a.example", "wss://b.example")
+        ]
+
+        async def scenario():
+            states = []
+            for client in clients:
+                for _ in range(2):
+                    states.append(await client.get_chain_state())
+            return states
+
+        try:
+            states = run(scenario())
+        finally:
+            for client in clients:
+                client.executor.shutdown()
+
+        for state in states:
+            self.assertEqual(state["block_height"], 105)
+            self.assertEqual(state["finalized_block_number"], 100)
+
+        header_fetches = [
+            call for client in clients for call in client.transport.calls
+            if call == ("chain_getHeader", ["0xfinal"])
+        ]
+        self.assertEqual(len(header_fetches), 1)
+        self.assertEqual(registry.for_chain(GENESIS).headers.stats.hits, 3)
+        print("✓ Stalled finality cache test passed")
+
+
+class TestFinalizedBlockTimestamp(unittest.TestCase):
+
+    def test_timestamp_read_at_finalized_hash_once(self):
+        """Test that the timestamp is read at the finalized hash and memoized."""
+        client = make_client(BlockCacheRegistry())
+
+        async def scenario():
+            state = await client.get_chain_state()
+            timestamp = await client.get_finalized_block_timestamp()
+            await client.get_chain_state()
+            return state, timestamp
+
+        try:
+            state, timestamp = run(scenario())
+        finally:
+            client.executor.shutdown()
+
+        self.assertEqual(state["finalized_block_timestamp"], FINALIZED_TIMESTAMP_MS)
+        self.assertEqual(timestamp, FINALIZED_TIMESTAMP_MS)
+
+        storage_reads = [call for call in client.transport.calls if call[0] == "state_getStorage"]
+        self.assertEqual(len(storage_reads), 1)
+        self.assertEqual(storage_reads[0][1][1], "0xfinal")
+        print("✓ Finalized timestamp memoization test passed")
+
+    def test_unreadable_timestamp_is_none(self):
+        """Test that a failed read returns None instead of wall-clock time."""
+        client = make_client(BlockCacheRegistry(), storage_ok=False)
+        client.substrate = FailingSubstrate()
+
+        async def scenario():
+            state = await client.get_chain_state()
+            await asyncio.gather(*client._timestamp_tasks.values())
+            retried = await client.get_chain_state()
+            await asyncio.gather(*client._timestamp_tasks.values())
+            return state, retried
+
+        try:
+            first, second = run(scenario())
+        finally:
+            client.executor.shutdown()
+
+        for state in (first, second):
+            self.assertEqual(state["finalized_block_number"], 100)
+            self.assertIsNone(state["finalized_block_timestamp"])
+        print("✓ Unreadable timestamp test passed")
+
+    def test_metadata_decoding_stays_out_of_probe(self):
+        """Test that a slow metadata fallback neither delays nor drops the block height."""
+        client = make_client(BlockCacheRegistry(), storage_ok=False)
+        client.substrate = SlowSubstrate()
+        client.timeout = 0.2
+
+        async def scenario():
+            state = await asyncio.wait_for(client.get_chain_state(), timeout=0.2)
+            await asyncio.gather(*client._timestamp_tasks.values())
+            return state, await client.get_chain_state()
+
+        try:
+            first, second = run(scenario())
+        finally:
+            client.executor.shutdown()
+
+        self.assertEqual(first["block_height"], 105)
+        self.assertEqual(first["finalized_block_number"], 100)
+        self.assertIsNone(first["finalized_block_timestamp"])
+        self.assertEqual(second["finalized_block_timestamp"], FINALIZED_TIMESTAMP_MS)
+        print("✓ Background metadata decoding test passed")
+
+    def test_warm_metadata_decoding_in_same_probe(self):
+        """Test that a ready metadata fallback reports the timestamp at once."""
+        client = make_client(BlockCacheRegistry(), storage_ok=False)
+        client.substrate = MetadataSubstrate()
+
+        try:
+            state = run(client.get_chain_state())
+        finally:
+            client.executor.shutdown()
+
+        self.assertEqual(state["finalized_block_timestamp"], FINALIZED_TIMESTAMP_MS)
+        self.assertEqual(client._timestamp_tasks, {})
+        print("✓ Warm metadata decoding test passed")
+
+    def test_failed_finalized_block_keeps_chain_head(self):
+        """Test that a failed finalized header lookup still returns the head."""
+        client = make_client(BlockCacheRegistry(), finalized_header_ok=False)
+
+        async def scenario():
+            return await client.get_chain_state()
+
+        try:
+            state = run(scenario())
+        finally:
+            client.executor.shutdown()
+
+        self.assertEqual(state["block_height"], 105)
+        self.assertEqual(state["block_hash"], "0xbest")
+        self.assertIsNone(state["finalized_block_number"])
+        self.assertIsNone(state["finalized_block_timestamp"])
+        print("✓ Failed finalized block test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
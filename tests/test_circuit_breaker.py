@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.circuit_breaker import CircuitBreaker
+from services.error_handler import ErrorHandler
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "wss://rpc.example",
+            failure_threshold=3,
+            base_delay=10,
+            max_delay=100,
+            clock=self.clock,
+        )
+
+    def _trip(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        """Test that consecutive failures open the circuit."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        print("✓ Circuit opens after threshold")
+
+    def test_success_resets_failures(self):
+        """Test that a success in between keeps the circuit closed."""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        print("✓ Success resets failure count")
+
+    def test_half_open_allows_single_trial(self):
+        """Test that only one trial request passes after the backoff."""
+        self._trip()
+        self.clock.now += self.breaker.retry_in()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+        print("✓ Half-open single trial")
+
+    def test_trial_success_closes(self):
+        """Test that a successful trial closes the circuit."""
+        self._trip()
+        self.clock.now += self.breaker.retry_in()
+        self.breaker.allow_request()
+
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+        print("✓ Trial success closes circuit")
+
+    def test_trial_failure_backs_off_longer(self):
+        """Test that each failed trial re-opens with a longer delay."""
+        self._trip()
+        first_delay = self.breaker.retry_in()
+        self.assertTrue(5 <= first_delay <= 10)
+
+        self.clock.now += first_delay
+        self.breaker.allow_request()
+        self.breaker.record_failure()
+        second_delay = self.breaker.retry_in()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(10 <= second_delay <= 20)
+        print("✓ Failed trial backs off exponentially")
+
+    def test_cancelled_trial_is_released(self):
+        """Test that a cancelled trial lets the next caller try."""
+        self._trip()
+        self.clock.now += self.breaker.retry_in()
+        self.breaker.allow_request()
+
+        self.breaker.cancel_trial()
+
+        self.assertTrue(self.breaker.allow_request())
+        print("✓ Cancelled trial released")
+
+
+class TestBackoffDelay(unittest.TestCase):
+
+    def test_delay_bounds(self):
+        """Test that backoff doubles per attempt with jitter and a cap."""
+        for attempt, (low, high) in enumerate([(0.5, 1), (1, 2), (2, 4), (4, 8)]):
+            for _ in range(50):
+                delay = ErrorHandler.backoff_delay(attempt, base_delay=1, max_delay=30)
+                self.assertTrue(low <= delay <= high)
+
+        capped = ErrorHandler.backoff_delay(20, base_delay=1, max_delay=30)
+        self.assertTrue(15 <= capped <= 30)
+        print("✓ Backoff delay bounds")
+
+
+if __name__ == '__main__':
+    unittest.main()
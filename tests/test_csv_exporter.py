@@ -70,5 +70,30 @@ class TestCsvExporter(unittest.TestCase):
             self.assertFalse(filepath.exists(), "File should not be created for empty list")
             print("✓ Empty list test passed")
 
+    def test_export_generator(self):
+        """Test that a lazily produced stream of metrics is exported."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = Path(tmpdir) / "metrics.csv"
+            metrics = (
+                HealthMetrics(
+                    timestamp=datetime(2025, 12, 10, 10, i, 0),
+                    node_name="polkadot-validator-1",
+                    block_height=1000 + i,
+                    current_block_height=1005 + i,
+                    peers_count=42,
+                    finality_lag=5,
+                    time_since_last_block=6,
+                    rpc_response_time=120.5,
+                    status="healthy"
+                )
+                for i in range(3)
+            )
+
+            export_metrics_to_csv(metrics, str(filepath))
+
+            loaded = load_metrics_from_csv(str(filepath))
+            self.assertEqual([m.block_height for m in loaded], [1000, 1001, 1002])
+            print("✓ Generator export passed")
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,4 +1,5 @@
 import sys
+import subprocess
 from pathlib import Path
 from datetime import datetime, timedelta
 import tempfile
@@ -7,8 +8,10 @@ import unittest
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
+from sqlalchemy.dialects import sqlite
+
 from models.metrics import HealthMetrics
-from services.database import MetricsDB
+from services.database import INSERT_COLUMNS, ROLLUP_RESOLUTIONS, MetricsDB, _rollup_upsert_sql
 
 
 class TestMetricsDB(unittest.TestCase):
@@ -21,8 +24,22 @@ class TestMetricsDB(unittest.TestCase):
     
     def tearDown(self):
         """Clean up temporary directory."""
+        self.db.close()
         self.temp_dir.cleanup()
     
+    def _metric(self, i: int = 0, node_name: str = "polkadot-validator-1") -> HealthMetrics:
+        return HealthMetrics(
+            timestamp=datetime.now() - timedelta(minutes=i),
+            node_name=node_name,
+            block_height=2150000 - i,
+            current_block_height=2150005 - i,
+            peers_count=42,
+            finality_lag=5,
+            time_since_last_block=6,
+            rpc_response_time=125.5,
+            status="healthy"
+        )
+    
     def test_create_tables(self):
         """Test that database tables are created successfully."""
         self.assertTrue(Path(self.db.db_path).exists())
@@ -145,6 +162,329 @@ class TestMetricsDB(unittest.TestCase):
         self.assertIn("node-0", nodes)
         print("✓ Get all nodes passed")
 
+    
+    def test_bulk_insert_matches_orm_storage(self):
+        """Test that bulk rows are stored and read back like ORM rows."""
+        timestamp = datetime(2025, 1, 1, 12, 30, 45, 123456)
+        orm_metric = self._metric(node_name="orm-node")
+        orm_metric.timestamp = timestamp
+        bulk_metric = self._metric(node_name="bulk-node")
+        bulk_metric.timestamp = timestamp
+        
+        self.db.insert_metrics(orm_metric)
+        inserted = self.db.insert_batch(iter([bulk_metric]))
+        
+        with self.db.engine.connect() as conn:
+            stored = conn.exec_driver_sql(
+                "SELECT node_name, timestamp FROM metrics ORDER BY node_name"
+            ).all()
+        
+        self.assertEqual(inserted, 1)
+        self.assertEqual(stored[0][1], stored[1][1])
+        self.assertEqual(self.db.get_latest_for_node("bulk-node").timestamp, timestamp)
+        print("✓ Bulk insert storage format passed")
+    
+    def test_node_reads_use_composite_index(self):
+        """Test that the real per-node reads and counts search the composite indexes."""
+        db = MetricsDB(db_path=str(Path(self.temp_dir.name) / "partitioned.db"), partition_by_day=True)
+        db.create_tables()
+        db.insert_batch([self._metric(60 * 24)])
+        
+        try:
+            with db.engine.connect() as conn:
+                tables = db._source_tables(conn)
+                start = datetime.now() - timedelta(days=2)
+                statements = [
+                    db._node_range_select(tables, "a", list(INSERT_COLUMNS), start, None, False),
+                    db._node_range_select(
+                        tables[:1], "a", ["timestamp", "status"], start, datetime.now(), True, True
+                    ),
+                ]
+                for t in tables:
+                    statements += [db._latest_select(t, "a"), db._count_select(t, "a")]
+                
+                for stmt in statements:
+                    query = stmt.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+                    plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}")]
+                    searches = [step for step in plan if step.startswith(("SEARCH", "SCAN"))]
+                    
+                    self.assertTrue(searches, plan)
+                    for step in searches:
+                        self.assertRegex(step, r"^SEARCH \w+ USING (COVERING )?INDEX ix_\w+_node_name_timestamp")
+                    self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
+        finally:
+            db.close()
+        
+        self.assertEqual(len(tables), 2)
+        print("✓ Composite index query plans passed")
+    
+    def test_rollup_upsert_scans_only_new_rows(self):
+        """Test that the per-chunk rollup reads the rowid range, not the whole table."""
+        self.db.insert_batch([self._metric(i) for i in range(50)])
+        
+        with self.db.engine.connect() as conn:
+            for model, _, prefix_length, suffix in ROLLUP_RESOLUTIONS.values():
+                query = _rollup_upsert_sql(model.__tablename__, prefix_length, suffix)
+                plan = [row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}", (40,))]
+                self.assertIn("SEARCH metrics USING INTEGER PRIMARY KEY (rowid>?)", plan)
+        print("✓ Rollup upsert query plan passed")
+    
+    def test_migrate_existing_database(self):
+        """Test that create_tables adds the composite index to an old database."""
+        legacy_path = str(Path(self.temp_dir.name) / "legacy.db")
+        legacy = MetricsDB(db_path=legacy_path)
+        with legacy.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE TABLE metrics (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL, "
+                "node_name VARCHAR(255) NOT NULL, block_height INTEGER NOT NULL, "
+                "current_block_height INTEGER NOT NULL, peers_count INTEGER NOT NULL, "
+                "finality_lag INTEGER NOT NULL, time_since_last_block INTEGER NOT NULL, "
+                "rpc_response_time FLOAT NOT NULL, status VARCHAR(50) NOT NULL)"
+            )
+            conn.exec_driver_sql("CREATE INDEX ix_metrics_timestamp ON metrics (timestamp)")
+            conn.exec_driver_sql("CREATE INDEX ix_metrics_node_name ON metrics (node_name)")
+        
+        try:
+            legacy.create_tables()
+            with legacy.engine.connect() as conn:
+                indexes = {
+                    row[1] for row in conn.exec_driver_sql("PRAGMA index_list(metrics)")
+                }
+        finally:
+            legacy.close()
+        
+        self.assertIn("ix_metrics_node_name_timestamp", indexes)
+        self.assertIn("ix_metrics_timestamp", indexes)
+        self.assertNotIn("ix_metrics_node_name", indexes)
+        print("✓ Index migration passed")
+    
+    def test_rollups_maintained_on_insert(self):
+        """Test that rollup buckets merge rows across separate inserts."""
+        now = datetime.now().replace(second=10, microsecond=0)
+        first = self._metric()
+        first.timestamp = now
+        first.rpc_response_time = 100.0
+        second = self._metric()
+        second.timestamp = now + timedelta(seconds=20)
+        second.rpc_response_time = 300.0
+        second.peers_count = 10
+        second.status = "critical"
+        
+        self.db.insert_metrics(first)
+        self.db.insert_batch([second])
+        
+        for resolution in ("1m", "1h", "1d"):
+            rollups = self.db.get_rollups("polkadot-validator-1", hours=1, resolution=resolution)
+            
+            self.assertEqual(len(rollups), 1)
+            rollup = rollups[0]
+            self.assertEqual(rollup.sample_count, 2)
+            self.assertEqual(rollup.rpc_response_time_avg, 200.0)
+            self.assertEqual(rollup.rpc_response_time_min, 100.0)
+            self.assertEqual(rollup.rpc_response_time_max, 300.0)
+            self.assertEqual(rollup.peers_count_min, 10)
+            self.assertEqual(rollup.peers_count_max, 42)
+            self.assertEqual(rollup.healthy_count, 1)
+            self.assertEqual(rollup.critical_count, 1)
+        
+        self.assertEqual(rollups[0].bucket_start, now.replace(hour=0, minute=0, second=0))
+        print("✓ Rollup maintenance passed")
+    
+    def test_rollups_skip_failed_latency_probes(self):
+        """Test that failed probes (-1.0) are left out of latency aggregates."""
+        now = datetime.now().replace(second=5, microsecond=0)
+        other_minute = now.replace(minute=(now.minute + 1) % 60)
+        
+        def metric(timestamp, rpc_response_time):
+            m = self._metric()
+            m.timestamp = timestamp
+            m.rpc_response_time = rpc_response_time
+            return m
+        
+        # Failed probes in the same insert, in a later insert, and alone
+        self.db.insert_batch([metric(now, 200.0), metric(now + timedelta(seconds=10), -1.0)])
+        self.db.insert_batch([metric(now + timedelta(seconds=20), -1.0)])
+        self.db.insert_batch([metric(now + timedelta(seconds=30), 400.0)])
+        self.db.insert_batch([metric(other_minute, -1.0)])
+        
+        rollups = {
+            r.bucket_start: r
+            for r in self.db.get_rollups("polkadot-validator-1", hours=2, resolution="1m")
+        }
+        rollup = rollups[now.replace(second=0)]
+        self.assertEqual((rollup.sample_count, rollup.rpc_sample_count), (4, 2))
+        self.assertEqual(rollup.rpc_response_time_avg, 300.0)
+        self.assertEqual(rollup.rpc_response_time_min, 200.0)
+        self.assertEqual(rollup.rpc_response_time_max, 400.0)
+        
+        failed_only = rollups[other_minute.replace(second=0)]
+        self.assertEqual((failed_only.sample_count, failed_only.rpc_sample_count), (1, 0))
+        self.assertEqual(failed_only.rpc_response_time_avg, -1.0)
+        self.assertEqual(failed_only.rpc_response_time_min, -1.0)
+        
+        [day] = self.db.get_rollups("polkadot-validator-1", hours=2, resolution="1d")
+        self.assertEqual((day.sample_count, day.rpc_sample_count), (5, 2))
+        self.assertEqual((day.rpc_response_time_min, day.rpc_response_time_max), (200.0, 400.0))
+        print("✓ Rollups without failed probes passed")
+    
+    def test_rollups_skip_unknown_block_ages(self):
+        """Test that unknown block ages (-1) are left out of block age aggregates."""
+        now = datetime.now().replace(second=5, microsecond=0)
+        
+        def metric(timestamp, time_since_last_block):
+            m = self._metric()
+            m.timestamp = timestamp
+            m.time_since_last_block = time_since_last_block
+            return m
+        
+        self.db.insert_batch([metric(now, 6), metric(now + timedelta(seconds=10), -1)])
+        self.db.insert_batch([metric(now + timedelta(seconds=20), 18)])
+        
+        [rollup] = self.db.get_rollups("polkadot-validator-1", hours=1, resolution="1h")
+        self.assertEqual((rollup.sample_count, rollup.block_age_sample_count), (3, 2))
+        self.assertEqual(rollup.time_since_last_block_avg, 12.0)
+        self.assertEqual(rollup.time_since_last_block_min, 6)
+        self.assertEqual(rollup.time_since_last_block_max, 18)
+        print("✓ Rollups without unknown block ages passed")
+    
+    def test_pick_resolution(self):
+        """Test that the coarsest rollup giving enough points is chosen."""
+        self.assertEqual(MetricsDB.pick_resolution(timedelta(hours=1)), "1m")
+        self.assertEqual(MetricsDB.pick_resolution(timedelta(days=1)), "1h")
+        self.assertEqual(MetricsDB.pick_resolution(timedelta(days=7)), "1h")
+        self.assertEqual(MetricsDB.pick_resolution(timedelta(days=30)), "1d")
+        self.assertEqual(MetricsDB.pick_resolution(timedelta(minutes=5)), "1m")
+        print("✓ Rollup resolution choice passed")
+    
+    def test_rollups_backfilled_on_migration(self):
+        """Test that rollup tables are built from raw rows of an older database."""
+        self.db.insert_batch([self._metric(i) for i in range(90)])
+        with self.db.engine.begin() as conn:
+            conn.exec_driver_sql("DELETE FROM metrics_rollup_1h")
+        
+        self.db.create_tables()
+        rollups = self.db.get_rollups("polkadot-validator-1", hours=3, resolution="1h")
+        
+        self.assertEqual(sum(r.sample_count for r in rollups), 90)
+        self.assertIn(len(rollups), (2, 3))
+        print("✓ Rollup backfill passed")
+    
+    def test_sample_counts_added_on_migration(self):
+        """Test that rollup tables of an older database get per-metric sample counts."""
+        self.db.insert_batch([self._metric(i) for i in range(3)])
+        with self.db.engine.begin() as conn:
+            for table in ("metrics_rollup_1m", "metrics_rollup_1h", "metrics_rollup_1d"):
+                conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN rpc_sample_count")
+                conn.exec_driver_sql(f"ALTER TABLE {table} DROP COLUMN block_age_sample_count")
+        
+        self.db.create_tables()
+        rollups = self.db.get_rollups("polkadot-validator-1", hours=1, resolution="1d")
+        
+        self.assertEqual([r.rpc_sample_count for r in rollups], [r.sample_count for r in rollups])
+        self.assertEqual([r.block_age_sample_count for r in rollups], [r.sample_count for r in rollups])
+        self.assertEqual(rollups[-1].rpc_response_time_avg, 125.5)
+        print("✓ Rollup column migration passed")
+    
+    def test_wal_mode_enabled(self):
+        """Test that connections use WAL journaling and NORMAL sync."""
+        with self.db.engine.connect() as conn:
+            journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+        
+        self.assertEqual(journal_mode, "wal")
+        self.assertEqual(synchronous, 1)  # NORMAL
+        print("✓ WAL mode passed")
+    
+    def test_enqueue_writes_in_background(self):
+        """Test that queued records are written by the writer thread."""
+        db = MetricsDB(
+            db_path=self.db.db_path, write_batch_size=2, write_flush_seconds=0.05
+        )
+        try:
+            for i in range(5):
+                db.enqueue(self._metric(i))
+            db.flush()
+            
+            self.assertEqual(db.count_records("polkadot-validator-1"), 5)
+            self.assertEqual(db.rows_written, 5)
+            self.assertEqual(db.write_errors, 0)
+        finally:
+            db.close()
+        print("✓ Write-behind queue passed")
+    
+    def test_close_flushes_pending_records(self):
+        """Test that records still waiting for their batch are written on close."""
+        db = MetricsDB(
+            db_path=self.db.db_path, write_batch_size=1000, write_flush_seconds=60
+        )
+        for i in range(3):
+            db.enqueue(self._metric(i))
+        
+        start = datetime.now()
+        db.close()
+        
+        self.assertLess((datetime.now() - start).total_seconds(), 5)
+        self.assertEqual(self.db.count_records("polkadot-validator-1"), 3)
+        print("✓ Flush on close passed")
+    
+    def test_exit_flushes_pending_records(self):
+        """Test that queued records are written when the process exits without close()."""
+        script = (
+            "import sys; from datetime import datetime; "
+            f"sys.path.insert(0, {str(project_root)!r}); "
+            "from models.metrics import HealthMetrics; "
+            "from services.database import MetricsDB; "
+            f"db = MetricsDB(db_path={self.db.db_path!r}, write_batch_size=1000, write_flush_seconds=60); "
+            "[db.enqueue(HealthMetrics('polkadot-validator-1', 1, 1, 1, 0, 6, 100.0, 'healthy', "
+            "datetime.now())) for _ in range(3)]"
+        )
+        
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+        
+        self.assertEqual(self.db.count_records("polkadot-validator-1"), 3)
+        print("✓ Flush at exit passed")
+    
+    def test_iter_metrics_streams_chunks(self):
+        """Test that the streaming read yields bounded chunks, newest first."""
+        self.db.insert_batch([self._metric(i) for i in range(25)])
+        
+        chunks = list(self.db.iter_metrics_for_node("polkadot-validator-1", chunk_size=10))
+        
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        heights = [m.block_height for chunk in chunks for m in chunk]
+        self.assertEqual(heights, [2150000 - i for i in range(25)])
+        print("✓ Streaming read passed")
+    
+    def test_iter_metrics_projects_columns(self):
+        """Test that projected reads return tuples of just those columns."""
+        self.db.insert_batch([self._metric(i) for i in range(3)])
+        
+        rows = [
+            row
+            for chunk in self.db.iter_metrics_for_node(
+                "polkadot-validator-1", columns=["block_height", "rpc_response_time"]
+            )
+            for row in chunk
+        ]
+        
+        self.assertEqual(rows, [(2150000 - i, 125.5) for i in range(3)])
+        with self.assertRaises(ValueError):
+            next(self.db.iter_metrics_for_node("polkadot-validator-1", columns=["id"]))
+        print("✓ Projected streaming read passed")
+    
+    def test_iter_metric_batches(self):
+        """Test that batched reads match the record-based read."""
+        self.db.insert_batch([self._metric(i) for i in range(25)])
+        
+        batches = list(self.db.iter_metric_batches("polkadot-validator-1", chunk_size=10))
+        
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertEqual(
+            [m for batch in batches for m in batch.to_metrics()],
+            self.db.get_metrics_for_node("polkadot-validator-1"),
+        )
+        print("✓ Batched streaming read passed")
+
 
 if __name__ == '__main__':
     unittest.main()
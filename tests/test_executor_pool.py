@@ -0,0 +1,127 @@
+import sys
+import threading
+from pathlib import Path
+import unittest
+import asyncio
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.executor_pool import (
+    EndpointExecutor,
+    ExecutorPool,
+    ExecutorSaturatedError,
+)
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestEndpointExecutor(unittest.TestCase):
+
+    def test_hung_endpoint_does_not_starve_others(self):
+        """Test that a saturated executor leaves other endpoints unaffected."""
+        release = threading.Event()
+        pool = ExecutorPool(max_workers=1, max_queue=1)
+        hung = pool.get("wss://hung.example")
+        healthy = pool.get("wss://healthy.example")
+
+        async def scenario():
+            blocked = [
+                asyncio.create_task(hung.run(release.wait)) for _ in range(2)
+            ]
+            await asyncio.sleep(0.05)
+
+            with self.assertRaises(ExecutorSaturatedError):
+                await hung.run(lambda: "never runs")
+
+            result = await asyncio.wait_for(healthy.run(lambda: "ok"), timeout=1)
+
+            release.set()
+            await asyncio.gather(*blocked)
+            return result
+
+        try:
+            self.assertEqual(run(scenario()), "ok")
+        finally:
+            release.set()
+            pool.shutdown()
+
+        self.assertEqual(hung.stats.rejected, 1)
+        self.assertEqual(hung.stats.saturated, 1)
+        self.assertEqual(hung.stats.completed, 2)
+        print("✓ Executor isolation test passed")
+
+    def test_counters_after_run(self):
+        """Test that counters return to idle after calls complete."""
+        executor = EndpointExecutor("wss://rpc.example", max_workers=2)
+
+        async def scenario():
+            return await asyncio.gather(*(executor.run(pow, 2, n) for n in range(4)))
+
+        try:
+            self.assertEqual(run(scenario()), [1, 2, 4, 8])
+        finally:
+            executor.shutdown()
+
+        self.assertEqual(executor.stats.submitted, 4)
+        self.assertEqual(executor.stats.completed, 4)
+        self.assertEqual(executor.stats.active, 0)
+        self.assertEqual(executor.stats.queued, 0)
+        print("✓ Executor counters test passed")
+
+    def test_cancelled_queued_calls_free_the_queue(self):
+        """Test that calls cancelled while queued no longer count as queued."""
+        release = threading.Event()
+        executor = EndpointExecutor("wss://rpc.example", max_workers=1, max_queue=2)
+
+        async def scenario():
+            running = asyncio.create_task(executor.run(release.wait))
+            queued = [asyncio.create_task(executor.run(lambda: "cancelled")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+
+            for task in queued:
+                task.cancel()
+            await asyncio.gather(*queued, return_exceptions=True)
+            self.assertEqual(executor.stats.queued, 0)
+
+            follow_up = asyncio.create_task(executor.run(lambda: "ok"))
+            await asyncio.sleep(0.05)
+            release.set()
+            await running
+            return await asyncio.wait_for(follow_up, timeout=1)
+
+        try:
+            self.assertEqual(run(scenario()), "ok")
+        finally:
+            release.set()
+            executor.shutdown()
+
+        self.assertEqual(executor.stats.rejected, 0)
+        self.assertEqual(executor.stats.queued, 0)
+        self.assertEqual(executor.stats.completed, 2)
+        print("✓ Cancelled queued calls test passed")
+
+    def test_group_by_host(self):
+        """Test that endpoints of one provider share an executor when grouped."""
+        pool = ExecutorPool(group_by_host=True)
+        try:
+            a = pool.get("wss://provider.example/polkadot")
+            b = pool.get("wss://provider.example/kusama")
+            c = pool.get("wss://other.example")
+
+            self.assertIs(a, b)
+            self.assertIsNot(a, c)
+        finally:
+            pool.shutdown()
+        print("✓ Executor grouping test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+from datetime import datetime
+from itertools import product
+from unittest import mock
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from models.metrics import HealthMetrics, HealthStatus, MetricsBatch
+from services import health_checker, rpc_utils, time_utils
+from services.health_checker import HealthChecker, HealthThresholds
+from services.rpc_utils import RpcUtils
+from services.time_utils import TimeUtils
+
+# Values on and around every threshold, plus out-of-range and NaN inputs
+PEERS = [-1, 0, 1, 19, 20, 20.5, 21, 500, float("nan")]
+BLOCK_AGES = [-5, 0, 11, 12, 12.5, 13, 29, 30, 31, 10_000, float("nan")]
+RESPONSE_TIMES = [0.0, 499.9, 500, 500.1, 1999, 2000, 2000.01, 1e6, float("nan")]
+FINALITY_LAGS = [-1, 0, 1, 9, 10, 11, 29, 30, 30.5, 31, 100, float("nan")]
+
+
+def scalar_codes(peers, block_ages, response_times, finality_lags):
+    """Overall status codes from the scalar evaluate_metrics, one sample at a time."""
+    return np.array([
+        HealthStatus.parse(HealthChecker.evaluate_metrics(HealthMetrics(
+            node_name="node",
+            block_height=0,
+            current_block_height=0,
+            peers_count=p,
+            finality_lag=f,
+            time_since_last_block=b,
+            rpc_response_time=r,
+            status="healthy",
+            timestamp=datetime(2025, 1, 1),
+        )))
+        for p, b, r, f in zip(peers, block_ages, response_times, finality_lags)
+    ], dtype=np.int8)
+
+
+class TestBatchEvaluators(unittest.TestCase):
+
+    def test_per_metric_evaluators_match_scalar(self):
+        """Test each vectorized evaluator against its scalar counterpart."""
+        cases = [
+            (RpcUtils.evaluate_rpc_health_batch, RpcUtils.evaluate_rpc_health, RESPONSE_TIMES),
+            (TimeUtils.evaluate_block_freshness_batch, TimeUtils.evaluate_block_freshness, BLOCK_AGES),
+            (HealthChecker._eval_peers_batch, HealthChecker._eval_peers, PEERS),
+            (HealthChecker._eval_finality_batch, HealthChecker._eval_finality, FINALITY_LAGS),
+        ]
+
+        for batch_fn, scalar_fn, values in cases:
+            expected = [HealthStatus.parse(scalar_fn(v)) for v in values]
+            self.assertEqual(batch_fn(np.array(values)).tolist(), expected, scalar_fn.__name__)
+        print("✓ Per-metric batch evaluators passed")
+
+    def test_overall_status_matches_scalar_on_boundaries(self):
+        """Test every combination of boundary values against evaluate_metrics."""
+        peers, block_ages, response_times, finality_lags = (
+            np.array(column) for column in zip(
+                *product(PEERS, BLOCK_AGES, RESPONSE_TIMES, FINALITY_LAGS)
+            )
+        )
+
+        codes = HealthChecker.evaluate_batch(peers, block_ages, response_times, finality_lags)
+
+        self.assertEqual(codes.dtype, np.int8)
+        np.testing.assert_array_equal(
+            codes, scalar_codes(peers, block_ages, response_times, finality_lags)
+        )
+        print("✓ Boundary equivalence passed")
+
+    def test_overall_status_matches_scalar_on_random_samples(self):
+        """Test random integer-valued samples against evaluate_metrics."""
+        rng = np.random.default_rng(42)
+        count = 20_000
+        peers = rng.integers(0, 40, count)
+        block_ages = rng.integers(0, 45, count)
+        response_times = rng.uniform(0, 3000, count)
+        finality_lags = rng.integers(0, 40, count)
+
+        codes = HealthChecker.evaluate_batch(peers, block_ages, response_times, finality_lags)
+
+        np.testing.assert_array_equal(
+            codes, scalar_codes(peers, block_ages, response_times, finality_lags)
+        )
+        self.assertEqual(set(codes.tolist()), {0, 1, 2})
+        print("✓ Random sample equivalence passed")
+
+    def test_custom_thresholds_match_scalar(self):
+        """Test that thresholds passed to the batch path act like changed constants."""
+        thresholds = HealthThresholds(
+            peers_healthy_above=5,
+            block_healthy_max_seconds=20,
+            block_warning_max_seconds=60,
+            rpc_healthy_max_ms=100,
+            rpc_warning_max_ms=1000,
+            finality_healthy_below=3,
+            finality_warning_max=10,
+        )
+        rng = np.random.default_rng(7)
+        columns = [
+            rng.integers(0, 10, 5000),
+            rng.integers(0, 80, 5000),
+            rng.uniform(0, 1500, 5000),
+            rng.integers(0, 15, 5000),
+        ]
+
+        with mock.patch.multiple(
+            health_checker,
+            PEERS_HEALTHY_ABOVE=5, FINALITY_HEALTHY_BELOW=3, FINALITY_WARNING_MAX=10,
+        ), mock.patch.multiple(
+            time_utils, BLOCK_HEALTHY_MAX_SECONDS=20, BLOCK_WARNING_MAX_SECONDS=60,
+        ), mock.patch.multiple(
+            rpc_utils, RPC_HEALTHY_MAX_MS=100, RPC_WARNING_MAX_MS=1000,
+        ):
+            expected = scalar_codes(*columns)
+
+        np.testing.assert_array_equal(
+            HealthChecker.evaluate_batch(*columns, thresholds=thresholds), expected
+        )
+        print("✓ Custom threshold equivalence passed")
+
+    def test_evaluate_metrics_batch(self):
+        """Test evaluation straight from a MetricsBatch."""
+        metrics = [
+            HealthMetrics("node", 1, 1, 40, 5, 6, 120.0, "healthy", datetime(2025, 1, 1)),
+            HealthMetrics("node", 1, 1, 10, 5, 6, 120.0, "healthy", datetime(2025, 1, 1)),
+            HealthMetrics("node", 1, 1, 10, 5, 20, 120.0, "healthy", datetime(2025, 1, 1)),
+        ]
+
+        codes = HealthChecker.evaluate_metrics_batch(MetricsBatch.from_metrics(metrics))
+
+        self.assertEqual(
+            [str(HealthStatus(code)) for code in codes],
+            [HealthChecker.evaluate_metrics(m) for m in metrics],
+        )
+        print("✓ MetricsBatch evaluation passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
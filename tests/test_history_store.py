@@ -0,0 +1,203 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+import tempfile
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.metrics import HealthMetrics
+from services.database import MetricsDB
+from services import history_store
+from services.history_store import ParquetHistoryStore, SQLiteHistoryStore
+
+
+START = datetime(2025, 12, 10, 22, 0, 0)
+
+
+def make_metrics(node_name: str = "polkadot/validator 1", count: int = 12):
+    """One metric every 30 minutes from START, crossing midnight."""
+    return [
+        HealthMetrics(
+            timestamp=START + timedelta(minutes=30 * i),
+            node_name=node_name,
+            block_height=1000 + i,
+            current_block_height=1005 + i,
+            peers_count=40 + i,
+            finality_lag=5,
+            time_since_last_block=6,
+            rpc_response_time=100.0 + i,
+            status="healthy" if i % 2 else "warning",
+        )
+        for i in range(count)
+    ]
+
+
+class HistoryStoreContract:
+    """Behaviour every HistoryStore backend must share."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = self.make_store()
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def test_scan_full_rows_newest_first(self):
+        """Test that a scan returns whole records in descending time order."""
+        metrics = make_metrics()
+        self.assertEqual(self.store.append(metrics), 12)
+
+        scanned = [m for chunk in self.store.scan(metrics[0].node_name, START) for m in chunk]
+
+        self.assertEqual(scanned, metrics[::-1])
+        print(f"✓ {type(self.store).__name__} full scan passed")
+
+    def test_scan_range_and_projection(self):
+        """Test time-range bounds, projected columns and chunk sizes."""
+        metrics = make_metrics()
+        self.store.append(metrics[:6])
+        self.store.append(metrics[6:])
+
+        chunks = list(self.store.scan(
+            metrics[0].node_name,
+            start=START + timedelta(hours=1),
+            end=START + timedelta(hours=4),
+            columns=["rpc_response_time", "node_name"],
+            chunk_size=4,
+        ))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 2])
+        self.assertEqual(
+            [row for chunk in chunks for row in chunk],
+            [(100.0 + i, metrics[0].node_name) for i in range(7, 1, -1)],
+        )
+        with self.assertRaises(ValueError):
+            next(self.store.scan(metrics[0].node_name, START, columns=["bogus"]))
+        print(f"✓ {type(self.store).__name__} range scan passed")
+
+    def test_nodes(self):
+        """Test that every appended node is listed."""
+        self.store.append(make_metrics("node-a", 2) + make_metrics("node-b", 2))
+
+        self.assertEqual(sorted(self.store.nodes()), ["node-a", "node-b"])
+        print(f"✓ {type(self.store).__name__} node listing passed")
+
+
+class TestSQLiteHistoryStore(HistoryStoreContract, unittest.TestCase):
+
+    def make_store(self):
+        db = MetricsDB(db_path=str(Path(self.temp_dir.name) / "test.db"))
+        db.create_tables()
+        return SQLiteHistoryStore(db)
+
+
+@unittest.skipIf(history_store.pa is None, "pyarrow is not installed")
+class TestParquetHistoryStore(HistoryStoreContract, unittest.TestCase):
+
+    def make_store(self):
+        return ParquetHistoryStore(Path(self.temp_dir.name) / "history")
+
+    def test_partitioned_by_node_and_day(self):
+        """Test the node/day directory layout and append-only part files."""
+        metrics = make_metrics()
+        self.store.append(metrics[:6])
+        self.store.append(metrics[6:])
+
+        node_dir = self.store.root_dir / "node=polkadot%2Fvalidator%201"
+        days = sorted(path.name for path in node_dir.iterdir())
+        self.assertEqual(days, ["date=2025-12-10", "date=2025-12-11"])
+        self.assertEqual(len(list((node_dir / "date=2025-12-11").glob("*.parquet"))), 2)
+        print("✓ Parquet partition layout passed")
+
+    def test_scan_prunes_days_and_columns(self):
+        """Test that only overlapping days and requested columns are read."""
+        self.store.append(make_metrics())
+        reads = []
+        read_table = history_store.pq.read_table
+
+        def recording_read_table(path, columns=None, filters=None):
+            reads.append((Path(path).parent.name, tuple(columns)))
+            return read_table(path, columns=columns, filters=filters)
+
+        history_store.pq.read_table = recording_read_table
+        try:
+            rows = [
+                row for chunk in self.store.scan(
+                    "polkadot/validator 1",
+                    start=datetime(2025, 12, 11, 1, 0),
+                    columns=["peers_count"],
+                )
+                for row in chunk
+            ]
+        finally:
+            history_store.pq.read_table = read_table
+
+        self.assertEqual(rows, [(40 + i,) for i in range(11, 5, -1)])
+        self.assertEqual(reads, [("date=2025-12-11", ("timestamp", "peers_count"))])
+        print("✓ Parquet pruning passed")
+
+    def test_compact_merges_parts(self):
+        """Test that compaction leaves one file with the same rows."""
+        metrics = make_metrics()
+        for m in metrics:
+            self.store.append([m])
+        day_dir = self.store.root_dir / "node=polkadot%2Fvalidator%201" / "date=2025-12-11"
+
+        merged = self.store.compact("polkadot/validator 1", datetime(2025, 12, 11).date())
+
+        self.assertEqual(merged, 8)
+        self.assertEqual(len(list(day_dir.glob("*.parquet"))), 1)
+        scanned = [m for chunk in self.store.scan(metrics[0].node_name, START) for m in chunk]
+        self.assertEqual(scanned, metrics[::-1])
+        print("✓ Parquet compaction passed")
+
+    def test_interrupted_compaction(self):
+        """Test that scans and the next compaction recover from a crash mid-compaction."""
+        metrics = make_metrics()
+        for m in metrics:
+            self.store.append([m])
+        node_name, day = metrics[0].node_name, datetime(2025, 12, 11).date()
+        day_dir = self.store.root_dir / "node=polkadot%2Fvalidator%201" / "date=2025-12-11"
+
+        # Crash before the merged file was renamed into place
+        self.store._write_manifest(day_dir, {
+            "merged": "part-0-unfinished.parquet",
+            "replaced": [path.name for path in day_dir.glob("*.parquet")],
+        })
+        (day_dir / ".part-0-unfinished.tmp").write_bytes(b"partial")
+        scanned = [m for chunk in self.store.scan(node_name, START) for m in chunk]
+        self.assertEqual(scanned, metrics[::-1])
+
+        # The next compaction rolls that back, then crashes after its
+        # merged file appeared, before the replaced parts were deleted
+        finish = self.store._finish_compaction
+        calls = []
+
+        def finish_first_only(day_dir):
+            calls.append(day_dir)
+            if len(calls) == 1:
+                finish(day_dir)
+
+        self.store._finish_compaction = finish_first_only
+        try:
+            self.assertEqual(self.store.compact(node_name, day), 8)
+        finally:
+            del self.store._finish_compaction
+        self.assertFalse((day_dir / ".part-0-unfinished.tmp").exists())
+        self.assertEqual(len(list(day_dir.glob("*.parquet"))), 9)
+        scanned = [m for chunk in self.store.scan(node_name, START) for m in chunk]
+        self.assertEqual(scanned, metrics[::-1])
+
+        self.assertEqual(self.store.compact(node_name, day), 0)
+        self.assertEqual([path.suffix for path in day_dir.iterdir()], [".parquet"])
+        print("✓ Interrupted compaction recovery passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.latency_histogram import LatencyHistograms, LogHistogram, RollingHistogram
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLogHistogram(unittest.TestCase):
+
+    def test_bucket_error_is_bounded(self):
+        """Test that bucketing keeps values within ~6% from us to minutes."""
+        for value_ms in (0.005, 0.5, 3.7, 42.0, 250.0, 1999.0, 180000.0):
+            index = LogHistogram.bucket_index(value_ms)
+            upper = LogHistogram.bucket_value(index)
+
+            self.assertGreaterEqual(upper + 0.001, value_ms)
+            self.assertLessEqual(upper, value_ms * (1 + 1 / LogHistogram.SUB_BUCKETS) + 0.001)
+        print("✓ Bucket error bound test passed")
+
+    def test_percentiles(self):
+        """Test percentiles over 1..1000 ms."""
+        histogram = LogHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        self.assertEqual(histogram.total, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=500 / 16)
+        self.assertAlmostEqual(histogram.percentile(95), 950, delta=950 / 16)
+        self.assertEqual(histogram.percentile(100), 1000.0)
+        self.assertIsNone(LogHistogram().percentile(50))
+        print("✓ Histogram percentiles test passed")
+
+
+class TestRollingHistogram(unittest.TestCase):
+
+    def test_windows_expire_old_values(self):
+        """Test that values leave the 1m window but stay in the 1h window."""
+        clock = FakeClock()
+        histograms = LatencyHistograms(clock=clock)
+
+        histograms.record("polkadot", "system_health", 900.0)
+        clock.now += 120
+        histograms.record("polkadot", "system_health", 100.0)
+
+        last_minute = histograms.summary("polkadot", "system_health", "1m")
+        last_hour = histograms.summary("polkadot", "system_health", "1h")
+
+        self.assertEqual(last_minute["count"], 1)
+        self.assertEqual(last_minute["max"], 100.0)
+        self.assertEqual(last_hour["count"], 2)
+        self.assertEqual(last_hour["max"], 900.0)
+        print("✓ Rolling window expiry test passed")
+
+    def test_ring_slot_reused_after_an_hour(self):
+        """Test that a slot older than the largest window is reset on reuse."""
+        clock = FakeClock()
+        histogram = RollingHistogram(clock=clock)
+
+        histogram.record(10.0)
+        clock.now += histogram.slice_seconds * len(histogram._slices)  # same ring slot
+        histogram.record(20.0)
+
+        self.assertEqual(histogram.window(3600).total, 1)
+        self.assertEqual(histogram.window(3600).max_ms, 20.0)
+        print("✓ Ring slot reuse test passed")
+
+    def test_unknown_probe_is_empty(self):
+        """Test that querying a probe without data returns an empty summary."""
+        summary = LatencyHistograms().summary("polkadot", "system_health")
+
+        self.assertEqual(summary["count"], 0)
+        self.assertIsNone(summary["p50"])
+        print("✓ Empty summary test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+from pathlib import Path
+import tempfile
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from scalecodec.base import ScaleBytes
+
+from services.metadata_cache import DiskMetadataCache
+
+
+class FakeMetadata:
+    """Stand-in for a decoded MetadataVersioned object."""
+
+    def __init__(self, data: ScaleBytes):
+        self.data = data
+        self.decoded = False
+
+    def decode(self):
+        if bytes(self.data.data).startswith(b"bad"):
+            raise ValueError("corrupt metadata")
+        self.decoded = True
+
+
+class FakeRuntimeConfig:
+    def create_scale_object(self, type_string, data=None):
+        assert type_string == "MetadataVersioned"
+        return FakeMetadata(data)
+
+
+GENESIS = "0x91b171bb158e2d3848fa23a9f1c25182fb8e20313b2c1eb49219da7a70ce90c3"
+
+
+class TestDiskMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = DiskMetadataCache(Path(self.temp_dir.name), GENESIS)
+        self.cache.bind(FakeRuntimeConfig())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_roundtrip(self):
+        """Test that stored metadata bytes are decoded back on a warm start."""
+        self.cache.set("METADATA_1003000", FakeMetadata(ScaleBytes(b"meta-v1003000")))
+
+        warm = DiskMetadataCache(Path(self.temp_dir.name), GENESIS)
+        warm.bind(FakeRuntimeConfig())
+        metadata = warm.get("METADATA_1003000")
+
+        self.assertTrue(metadata.decoded)
+        self.assertEqual(bytes(metadata.data.data), b"meta-v1003000")
+        self.assertEqual(warm.hits, 1)
+        print("✓ Metadata cache roundtrip passed")
+
+    def test_new_runtime_version_is_a_miss(self):
+        """Test that a different spec_version is not served from cache."""
+        self.cache.set("METADATA_1003000", FakeMetadata(ScaleBytes(b"meta")))
+
+        self.assertIsNone(self.cache.get("METADATA_1004000"))
+        self.assertEqual(self.cache.misses, 1)
+        print("✓ Runtime upgrade miss passed")
+
+    def test_chains_are_separated(self):
+        """Test that another genesis hash does not see this chain's metadata."""
+        self.cache.set("METADATA_1003000", FakeMetadata(ScaleBytes(b"meta")))
+
+        other = DiskMetadataCache(Path(self.temp_dir.name), "0xb0a8d493")
+        other.bind(FakeRuntimeConfig())
+
+        self.assertIsNone(other.get("METADATA_1003000"))
+        print("✓ Chain separation passed")
+
+    def test_old_versions_pruned(self):
+        """Test that only the newest runtime versions are kept."""
+        for version in (1001000, 1002000, 1003000):
+            self.cache.set(f"METADATA_{version}", FakeMetadata(ScaleBytes(b"meta")))
+
+        files = sorted(p.name for p in self.cache.directory.iterdir())
+
+        self.assertEqual(files, ["METADATA_1002000.scale", "METADATA_1003000.scale"])
+        print("✓ Old version pruning passed")
+
+    def test_corrupt_file_discarded(self):
+        """Test that an undecodable cache file is removed and treated as a miss."""
+        self.cache.set("METADATA_1003000", FakeMetadata(ScaleBytes(b"bad bytes")))
+
+        self.assertIsNone(self.cache.get("METADATA_1003000"))
+        self.assertFalse((self.cache.directory / "METADATA_1003000.scale").exists())
+        print("✓ Corrupt cache file passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+import tempfile
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from models.metrics import (
+    CompactHealthMetrics,
+    HealthMetrics,
+    HealthStatus,
+    MetricsBatch,
+    from_epoch_ns,
+    to_epoch_ns,
+)
+from services.csv_exporter import export_metrics_to_csv, load_metrics_batch_from_csv
+
+
+def make_metrics(node_name: str = "polkadot-validator-1", count: int = 3):
+    statuses = ["healthy", "warning", "critical"]
+    return [
+        HealthMetrics(
+            timestamp=datetime(2025, 12, 10, 10, 30, 0, 123456) + timedelta(minutes=i),
+            node_name=node_name,
+            block_height=1000 + i,
+            current_block_height=1005 + i,
+            peers_count=42 - i,
+            finality_lag=5 + i,
+            time_since_last_block=6,
+            rpc_response_time=120.5 + i,
+            status=statuses[i % 3],
+        )
+        for i in range(count)
+    ]
+
+
+class TestCompactHealthMetrics(unittest.TestCase):
+
+    def test_status_enum(self):
+        """Test status parsing, string form and worst-status ordering."""
+        self.assertIs(HealthStatus.parse("warning"), HealthStatus.WARNING)
+        self.assertEqual(str(HealthStatus.CRITICAL), "critical")
+        self.assertEqual(max(HealthStatus.HEALTHY, HealthStatus.CRITICAL), HealthStatus.CRITICAL)
+        print("✓ Health status enum passed")
+
+    def test_epoch_ns_is_exact(self):
+        """Test that microsecond timestamps survive the epoch-ns round trip."""
+        timestamp = datetime(2025, 12, 10, 10, 30, 0, 999999)
+
+        self.assertEqual(to_epoch_ns(timestamp) % 1000, 0)
+        self.assertEqual(from_epoch_ns(to_epoch_ns(timestamp)), timestamp)
+        self.assertEqual(
+            to_epoch_ns(timestamp), np.datetime64(timestamp, "ns").astype(np.int64)
+        )
+        print("✓ Epoch-ns conversion passed")
+
+    def test_aware_timestamps_are_converted_to_utc(self):
+        """Test that aware datetimes convert like their naive UTC equivalent."""
+        naive_utc = datetime(2025, 12, 10, 8, 30, 0, 500)
+        aware = datetime(2025, 12, 10, 10, 30, 0, 500, tzinfo=timezone(timedelta(hours=2)))
+
+        self.assertEqual(to_epoch_ns(aware), to_epoch_ns(naive_utc))
+        self.assertEqual(to_epoch_ns(naive_utc.replace(tzinfo=timezone.utc)), to_epoch_ns(naive_utc))
+        self.assertEqual(from_epoch_ns(to_epoch_ns(aware)), naive_utc)
+        print("✓ Aware epoch-ns conversion passed")
+
+    def test_round_trip_and_slots(self):
+        """Test conversion to and from HealthMetrics and the slotted layout."""
+        metrics = make_metrics()[1]
+        compact = CompactHealthMetrics.from_metrics(metrics)
+
+        self.assertEqual(compact.status, HealthStatus.WARNING)
+        self.assertEqual(compact.to_metrics(), metrics)
+        self.assertFalse(hasattr(compact, "__dict__"))
+        print("✓ Compact metrics round trip passed")
+
+
+class TestMetricsBatch(unittest.TestCase):
+
+    def test_round_trip(self):
+        """Test that a batch stores typed columns and converts back losslessly."""
+        metrics = make_metrics()
+        batch = MetricsBatch.from_metrics(metrics)
+
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.status.dtype, np.int8)
+        self.assertEqual(batch.status.tolist(), [0, 1, 2])
+        self.assertEqual(batch.rpc_response_time.dtype, np.float64)
+        self.assertEqual(batch.to_metrics(), metrics)
+        print("✓ Batch round trip passed")
+
+    def test_concat_and_for_node(self):
+        """Test that concatenation merges node tables and rows can be selected."""
+        a = MetricsBatch.from_metrics(make_metrics("node-a", 2))
+        b = MetricsBatch.from_metrics(make_metrics("node-b", 1) + make_metrics("node-a", 1))
+
+        merged = MetricsBatch.concat([a, MetricsBatch.empty(), b])
+
+        self.assertEqual(merged.node_names, ["node-a", "node-b"])
+        self.assertEqual(merged.node_codes.tolist(), [0, 0, 1, 0])
+        self.assertEqual(len(merged.for_node("node-a")), 3)
+        self.assertEqual(merged.for_node("node-b").to_metrics(), make_metrics("node-b", 1))
+        self.assertEqual(len(merged.for_node("missing")), 0)
+        self.assertEqual(MetricsBatch.empty().to_metrics(), [])
+        print("✓ Batch concat and selection passed")
+
+    def test_aware_timestamps(self):
+        """Test batches built from aware metrics, directly and through a CSV export."""
+        metrics = make_metrics(count=3)
+        aware = [
+            HealthMetrics(**{
+                **vars(m),
+                "timestamp": m.timestamp.replace(tzinfo=timezone.utc).astimezone(
+                    timezone(timedelta(hours=-5))
+                ),
+            })
+            for m in metrics
+        ]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = str(Path(tmpdir) / "metrics.csv")
+            export_metrics_to_csv(aware, filepath)
+            from_csv = load_metrics_batch_from_csv(filepath)
+
+        expected = MetricsBatch.from_metrics(metrics).timestamp_ns
+        np.testing.assert_array_equal(MetricsBatch.from_metrics(aware).timestamp_ns, expected)
+        np.testing.assert_array_equal(from_csv.timestamp_ns, expected)
+        self.assertEqual(
+            CompactHealthMetrics.from_metrics(aware[0]).to_metrics().timestamp, metrics[0].timestamp
+        )
+        print("✓ Aware batch timestamps passed")
+
+    def test_load_from_csv(self):
+        """Test that a CSV export loads straight into a batch."""
+        metrics = make_metrics(count=5)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = str(Path(tmpdir) / "metrics.csv")
+            export_metrics_to_csv(metrics, filepath)
+
+            batch = load_metrics_batch_from_csv(filepath)
+            missing = load_metrics_batch_from_csv(str(Path(tmpdir) / "missing.csv"))
+
+        self.assertEqual(batch.to_metrics(), metrics)
+        self.assertEqual(len(missing), 0)
+        print("✓ Batch CSV load passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
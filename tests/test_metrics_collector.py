@@ -0,0 +1,402 @@
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+import unittest
+import asyncio
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.node import Node
+from services.metrics_collector import MetricsCollector
+from services.head_tracker import HeadTracker
+from services.connection_registry import ConnectionRegistry
+from services.circuit_breaker import CircuitBreaker
+from services.rpc_utils import RpcUtils
+from services.time_utils import BLOCK_AGE_UNKNOWN
+from services.alerts import AlertSystem
+
+
+class FakeRPCClient:
+    """Connected client whose probes each take a fixed delay."""
+
+    def __init__(self, delay: float = 0.05, chain_head_ok: bool = True, timestamp_ok: bool = True):
+        self.delay = delay
+        self.chain_head_ok = chain_head_ok
+        self.timestamp_ok = timestamp_ok
+        self.timeout = 1
+        self.is_connected = True
+        self.breaker = CircuitBreaker("fake")
+
+    async def get_chain_state(self):
+        await asyncio.sleep(self.delay)
+        if not self.chain_head_ok:
+            return None
+        return {
+            "block_height": 1000,
+            "block_hash": "0xabc",
+            "finalized_block_number": 998,
+            "finalized_block_timestamp": int(time.time() * 1000) if self.timestamp_ok else None,
+            "peers_count": 25,
+        }
+
+    async def measure_rpc_latency(self):
+        await asyncio.sleep(self.delay)
+        raise RuntimeError("probe failed")
+
+
+class FakeEndpointClient(FakeRPCClient):
+    """Client created by the connection registry for one endpoint URL."""
+
+    def __init__(self, rpc_url, **kwargs):
+        super().__init__(delay=0)
+        self.rpc_url = rpc_url
+        self.disconnected = False
+
+    async def disconnect(self):
+        self.disconnected = True
+
+
+class FakeStreamingClient(FakeRPCClient):
+    """Connected client whose heads are pushed into a HeadTracker."""
+
+    def __init__(self):
+        super().__init__(delay=0)
+        self.head_tracker = HeadTracker()
+        self.polled = False
+
+    async def get_chain_state(self):
+        self.polled = True
+        return await super().get_chain_state()
+
+    async def get_head_snapshot(self):
+        return self.head_tracker.snapshot()
+
+    async def get_peers_count(self):
+        return 30
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestCollectMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+        self.node = Node(name="polkadot", rpc_url="wss://rpc.example")
+
+    def test_probes_run_in_parallel(self):
+        """Test that 50ms probes finish in about one probe's time."""
+        self.collector.clients[self.node.name] = FakeRPCClient(delay=0.05)
+
+        start = time.perf_counter()
+        metrics = run(self.collector.collect_metrics(self.node))
+        elapsed = time.perf_counter() - start
+
+        self.assertIsNotNone(metrics)
+        self.assertLess(elapsed, 0.12)
+        self.assertEqual(metrics.block_height, 1000)
+        self.assertEqual(metrics.finality_lag, 2)
+        self.assertEqual(metrics.peers_count, 25)
+        print("✓ Parallel probes test passed")
+
+    def test_probe_fallbacks_are_kept(self):
+        """Test that a failing probe still degrades to its fallback value."""
+        self.collector.clients[self.node.name] = FakeRPCClient(delay=0)
+
+        metrics = run(self.collector.collect_metrics(self.node))
+
+        self.assertEqual(metrics.rpc_response_time, -1.0)
+        print("✓ Probe fallback test passed")
+
+    def test_latencies_recorded_in_histograms(self):
+        """Test that latency samples and probe durations feed the histograms."""
+        client = FakeRPCClient(delay=0)
+
+        async def measure_rpc_latency():
+            return RpcUtils.summarize_latency([40.0, 50.0, 60.0], errors=1)
+
+        client.measure_rpc_latency = measure_rpc_latency
+        self.collector.clients[self.node.name] = client
+
+        metrics = run(self.collector.collect_metrics(self.node))
+        histograms = self.collector.latency_histograms
+
+        self.assertEqual(metrics.rpc_response_time, 50.0)
+        self.assertEqual(histograms.probes(self.node.name), ["get_chain_state", "system_health"])
+        self.assertEqual(histograms.summary(self.node.name, "system_health", "1m")["count"], 3)
+        self.assertEqual(histograms.summary(self.node.name, "get_chain_state", "1m")["count"], 1)
+        print("✓ Latency histogram recording test passed")
+
+    def test_missing_block_timestamp_is_unknown_age(self):
+        """Test that a missing finalized timestamp reports an unknown block age."""
+        client = FakeRPCClient(delay=0, timestamp_ok=False)
+
+        async def measure_rpc_latency():
+            return RpcUtils.summarize_latency([40.0, 50.0, 60.0])
+
+        client.measure_rpc_latency = measure_rpc_latency
+        self.collector.clients[self.node.name] = client
+
+        metrics = run(self.collector.collect_metrics(self.node))
+        alerts = AlertSystem.check_alerts(metrics)
+
+        self.assertEqual(metrics.time_since_last_block, BLOCK_AGE_UNKNOWN)
+        self.assertEqual(metrics.status, "warning")
+        self.assertEqual([alert.metric_name for alert in alerts], ["block_age"])
+        self.assertIn("unknown", alerts[0].message)
+        print("✓ Unknown block age test passed")
+
+    def test_missing_chain_head_returns_none(self):
+        """Test that collection fails when the chain head is unavailable."""
+        self.collector.clients[self.node.name] = FakeRPCClient(
+            delay=0, chain_head_ok=False
+        )
+
+        metrics = run(self.collector.collect_metrics(self.node))
+
+        self.assertIsNone(metrics)
+        print("✓ Missing chain head test passed")
+
+
+class TestCircuitBreakerIntegration(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+        self.node = Node(name="polkadot", rpc_url="wss://rpc.example")
+        self.client = FakeRPCClient(delay=0, chain_head_ok=False)
+        self.collector.clients[self.node.name] = self.client
+
+    def test_open_circuit_skips_node(self):
+        """Test that a node is skipped without probing once its circuit opens."""
+        for _ in range(self.client.breaker.failure_threshold):
+            self.assertIsNone(run(self.collector.collect_metrics(self.node)))
+
+        self.assertEqual(self.client.breaker.state, CircuitBreaker.OPEN)
+
+        calls = 0
+
+        async def counting_chain_state():
+            nonlocal calls
+            calls += 1
+            return None
+
+        self.client.get_chain_state = counting_chain_state
+        self.assertIsNone(run(self.collector.collect_metrics(self.node)))
+        self.assertEqual(calls, 0)
+        print("✓ Open circuit skip test passed")
+
+    def test_error_in_trial_releases_it(self):
+        """Test that an exception during a half-open trial is recorded as a failure."""
+        breaker = self.client.breaker
+        breaker.base_delay = 0
+        for _ in range(breaker.failure_threshold):
+            run(self.collector.collect_metrics(self.node))
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        async def broken_connect():
+            raise KeyError("transport")
+
+        self.client.is_connected = False
+        self.client.connect = broken_connect
+        with self.assertRaises(KeyError):
+            run(self.collector.collect_metrics(self.node))
+
+        self.assertEqual(breaker.failures, breaker.failure_threshold + 1)
+        self.assertTrue(breaker.allow_request())
+        print("✓ Failed trial release test passed")
+
+
+class TestStreamingCollection(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = MetricsCollector(streaming=True)
+        self.node = Node(name="polkadot", rpc_url="wss://rpc.example")
+        self.client = FakeStreamingClient()
+        self.collector.clients[self.node.name] = self.client
+
+    def test_metrics_from_pushed_heads(self):
+        """Test that a streaming tick reads heights from pushed headers."""
+        self.client.head_tracker.on_new_head({"number": hex(2000)})
+        self.client.head_tracker.on_finalized_head({"number": hex(1995)})
+        self.client.head_tracker.on_new_head({"number": hex(2001)})
+
+        metrics = run(self.collector.collect_metrics(self.node))
+
+        self.assertFalse(self.client.polled)
+        self.assertEqual(metrics.block_height, 2001)
+        self.assertEqual(metrics.finality_lag, 6)
+        self.assertEqual(metrics.peers_count, 30)
+        self.assertEqual(metrics.time_since_last_block, 0)
+        print("✓ Streaming collection test passed")
+
+    def test_first_header_does_not_reset_block_age(self):
+        """Test that block age stays unknown until the streamed height advances."""
+        tracker = self.client.head_tracker
+        tracker.on_new_head({"number": hex(2000)})
+        tracker.on_finalized_head({"number": hex(1995)})
+
+        self.assertIsNone(tracker.snapshot()["time_since_last_block"])
+        metrics = run(self.collector.collect_metrics(self.node))
+        self.assertTrue(self.client.polled)
+        self.assertEqual(metrics.block_height, 1000)
+
+        tracker.on_new_head({"number": hex(2000)})
+        self.assertIsNone(tracker.snapshot()["time_since_last_block"])
+        tracker.on_new_head({"number": hex(2001)})
+        self.assertEqual(tracker.snapshot()["time_since_last_block"], 0)
+        print("✓ Resubscribe block age test passed")
+
+    def test_finality_unknown_until_finalized_head(self):
+        """Test that finality lag is not reported before a finalized header arrives."""
+        tracker = self.client.head_tracker
+        tracker.on_new_head({"number": hex(2000)})
+        tracker.on_new_head({"number": hex(2001)})
+
+        self.assertIsNone(tracker.snapshot()["finality_lag"])
+        self.assertFalse(run(tracker.wait_ready(0.05)))
+        metrics = run(self.collector.collect_metrics(self.node))
+        self.assertTrue(self.client.polled)
+        self.assertEqual(metrics.finality_lag, 2)
+
+        tracker.on_finalized_head({"number": hex(1995)})
+        self.assertTrue(run(tracker.wait_ready(0.05)))
+        self.assertEqual(tracker.snapshot()["finality_lag"], 6)
+        print("✓ Unknown finality lag test passed")
+
+    def test_falls_back_to_polling(self):
+        """Test that nodes without head data are polled instead."""
+        metrics = run(self.collector.collect_metrics(self.node))
+
+        self.assertTrue(self.client.polled)
+        self.assertEqual(metrics.block_height, 1000)
+        print("✓ Streaming fallback test passed")
+
+
+class TestConnectionSharing(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+        self.collector.registry = ConnectionRegistry(client_factory=FakeEndpointClient)
+        self.nodes = [
+            Node(name="polkadot-a", rpc_url="wss://rpc.example"),
+            Node(name="polkadot-b", rpc_url="wss://rpc.example/"),
+            Node(name="kusama", rpc_url="wss://kusama.example"),
+        ]
+
+    def test_nodes_share_client_per_url(self):
+        """Test that nodes with the same RPC URL reuse one client."""
+        for node in self.nodes:
+            run(self.collector.collect_metrics(node))
+
+        clients = self.collector.clients
+        self.assertIs(clients["polkadot-a"], clients["polkadot-b"])
+        self.assertIsNot(clients["polkadot-a"], clients["kusama"])
+        self.assertEqual(len(self.collector.registry), 2)
+        self.assertEqual(self.collector.registry.refcount("wss://rpc.example"), 2)
+        print("✓ Shared connection test passed")
+
+    def test_last_release_disconnects(self):
+        """Test that a shared client closes only when its last node leaves."""
+        for node in self.nodes:
+            run(self.collector.collect_metrics(node))
+        shared = self.collector.clients["polkadot-a"]
+
+        run(self.collector.disconnect("polkadot-a"))
+        self.assertFalse(shared.disconnected)
+
+        run(self.collector.disconnect("polkadot-b"))
+        self.assertTrue(shared.disconnected)
+        self.assertEqual(len(self.collector.registry), 1)
+        print("✓ Reference counting test passed")
+
+
+class TestCollectAll(unittest.TestCase):
+
+    def setUp(self):
+        self.collector = MetricsCollector()
+        self.nodes = [
+            Node(name="slow", rpc_url="wss://slow.example"),
+            Node(name="medium", rpc_url="wss://medium.example"),
+            Node(name="fast", rpc_url="wss://fast.example"),
+        ]
+        self.delays = {"slow": 0.06, "medium": 0.03, "fast": 0.0}
+
+    def test_results_in_completion_order(self):
+        """Test that nodes are yielded as they finish, not in config order."""
+        async def fake_collect(node):
+            await asyncio.sleep(self.delays[node.name])
+            return node.name
+
+        async def consume():
+            return [
+                metrics
+                async for _, metrics in self.collector.collect_all(
+                    self.nodes, max_concurrency=3
+                )
+            ]
+
+        with patch.object(self.collector, "collect_metrics", side_effect=fake_collect):
+            order = run(consume())
+
+        self.assertEqual(order, ["fast", "medium", "slow"])
+        print("✓ Completion order test passed")
+
+    def test_concurrency_cap(self):
+        """Test that no more than max_concurrency nodes run at once."""
+        running = 0
+        peak = 0
+
+        async def fake_collect(node):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return node.name
+
+        async def consume():
+            return [
+                item
+                async for item in self.collector.collect_all(
+                    self.nodes * 3, max_concurrency=2
+                )
+            ]
+
+        with patch.object(self.collector, "collect_metrics", side_effect=fake_collect):
+            results = run(consume())
+
+        self.assertEqual(len(results), 9)
+        self.assertEqual(peak, 2)
+        print("✓ Concurrency cap test passed")
+
+    def test_failure_yields_none(self):
+        """Test that an unexpected error for one node does not stop the others."""
+        async def fake_collect(node):
+            if node.name == "medium":
+                raise RuntimeError("boom")
+            return node.name
+
+        async def consume():
+            return {
+                node.name: metrics
+                async for node, metrics in self.collector.collect_all(self.nodes)
+            }
+
+        with patch.object(self.collector, "collect_metrics", side_effect=fake_collect):
+            results = run(consume())
+
+        self.assertIsNone(results["medium"])
+        self.assertEqual(results["fast"], "fast")
+        print("✓ Failure isolation test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
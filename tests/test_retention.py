@@ -0,0 +1,143 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+import tempfile
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.metrics import HealthMetrics
+from services.database import MetricsDB, partition_name
+from services.retention import RetentionManager
+
+
+def make_metric(timestamp: datetime, node_name: str = "polkadot") -> HealthMetrics:
+    return HealthMetrics(
+        timestamp=timestamp,
+        node_name=node_name,
+        block_height=2150000,
+        current_block_height=2150005,
+        peers_count=42,
+        finality_lag=5,
+        time_since_last_block=6,
+        rpc_response_time=125.5,
+        status="healthy",
+    )
+
+
+class TestRetention(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.temp_dir.name) / "test.db")
+        self.now = datetime.now()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _open(self, **kwargs) -> MetricsDB:
+        db = MetricsDB(db_path=self.db_path, **kwargs)
+        db.create_tables()
+        self.addCleanup(db.close)
+        return db
+
+    def test_prune_in_batches_keeps_recent_rows(self):
+        """Test that raw rows past the window are deleted batch by batch."""
+        db = self._open()
+        db.insert_batch(
+            [make_metric(self.now - timedelta(days=40, minutes=i)) for i in range(50)]
+            + [make_metric(self.now - timedelta(minutes=i)) for i in range(10)]
+        )
+
+        deleted = RetentionManager(db, raw_days=30, rollup_days=0, delete_batch_size=7).prune()
+
+        self.assertEqual(deleted["metrics"], 50)
+        self.assertEqual(db.count_records(), 10)
+        self.assertGreater(deleted["metrics_rollup_1m"], 0)
+        print("✓ Batched raw pruning passed")
+
+    def test_rollup_window_is_separate(self):
+        """Test that hourly rollups outlive the raw rows they summarize."""
+        db = self._open()
+        db.insert_batch([make_metric(self.now - timedelta(days=40))])
+
+        RetentionManager(db, raw_days=30, rollup_days=365).prune()
+
+        self.assertEqual(db.count_records(), 0)
+        self.assertEqual(db.get_rollups("polkadot", hours=24 * 41, resolution="1m"), [])
+        self.assertEqual(len(db.get_rollups("polkadot", hours=24 * 41, resolution="1h")), 1)
+        print("✓ Separate rollup retention passed")
+
+    def test_partitions_are_read_and_dropped(self):
+        """Test day partitions: reads span them and expiry drops whole days."""
+        db = self._open(partition_by_day=True)
+        old_day = self.now - timedelta(days=40)
+        db.insert_batch([
+            make_metric(old_day),
+            make_metric(self.now - timedelta(minutes=5)),
+            make_metric(self.now - timedelta(minutes=1)),
+        ])
+
+        self.assertIn(partition_name(old_day.date()), db.list_partitions())
+        self.assertEqual(db.count_records("polkadot"), 3)
+        self.assertEqual(len(db.get_metrics_for_node("polkadot", hours=1)), 2)
+        self.assertEqual(
+            db.get_latest_for_node("polkadot").timestamp, self.now - timedelta(minutes=1)
+        )
+
+        deleted = RetentionManager(db, raw_days=30, rollup_days=0).prune()
+
+        self.assertEqual(deleted["partitions"], 1)
+        self.assertNotIn(partition_name(old_day.date()), db.list_partitions())
+        self.assertEqual(db.count_records("polkadot"), 2)
+        print("✓ Day partitions passed")
+
+    def test_incremental_vacuum_releases_pages(self):
+        """Test that pruned pages are handed back without a full VACUUM."""
+        db = self._open()
+        db.insert_batch(
+            [make_metric(self.now - timedelta(days=40, seconds=i)) for i in range(5000)]
+        )
+        retention = RetentionManager(db, raw_days=30, rollup_days=1)
+
+        retention.prune()
+        released = retention.incremental_vacuum()
+
+        with db.engine.connect() as conn:
+            free_pages = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        self.assertGreater(released, 0)
+        self.assertEqual(free_pages, 0)
+        print("✓ Incremental vacuum passed")
+
+    def test_existing_database_converted(self):
+        """Test that a database without auto_vacuum is switched to incremental."""
+        legacy = MetricsDB(db_path=self.db_path)
+        with legacy.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("PRAGMA auto_vacuum=NONE")
+            conn.exec_driver_sql("VACUUM")
+            conn.exec_driver_sql("CREATE TABLE legacy (x INTEGER)")
+        legacy.close()
+
+        db = self._open()
+        with db.engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+        self.assertEqual(mode, 2)
+        print("✓ Incremental vacuum migration passed")
+
+    def test_background_thread_stops(self):
+        """Test that the maintenance thread runs and stops cleanly."""
+        db = self._open()
+        db.insert_batch([make_metric(self.now - timedelta(days=40))])
+        retention = RetentionManager(db, raw_days=30, interval_seconds=60)
+
+        retention.start()
+        retention.stop()
+
+        self.assertEqual(db.count_records(), 0)
+        print("✓ Background retention passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
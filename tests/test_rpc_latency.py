@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+import unittest
+import asyncio
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.rpc_client import PolkadotRPCClient
+from services.rpc_utils import RpcUtils
+
+
+class FlakyTransport:
+    """Answers system_health after a delay; every third call times out."""
+
+    connected = True
+
+    def __init__(self):
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, method, params=None, timeout=None):
+        self.calls += 1
+        call = self.calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01 * call)
+            if call % 3 == 0:
+                raise asyncio.TimeoutError()
+            return {"peers": 0, "isSyncing": False}
+        finally:
+            self.in_flight -= 1
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestLatencySummary(unittest.TestCase):
+
+    def test_percentiles(self):
+        """Test nearest-rank min/p50/p95/max over unordered samples."""
+        stats = RpcUtils.summarize_latency([float(n) for n in range(100, 0, -1)], errors=2)
+
+        self.assertEqual(stats.samples, 100)
+        self.assertEqual(stats.errors, 2)
+        self.assertEqual(stats.min_ms, 1.0)
+        self.assertEqual(stats.p50_ms, 50.0)
+        self.assertEqual(stats.p95_ms, 95.0)
+        self.assertEqual(stats.max_ms, 100.0)
+        print("✓ Latency percentiles test passed")
+
+    def test_no_samples(self):
+        """Test that a probe with only failures has no percentiles."""
+        stats = RpcUtils.summarize_latency([], errors=3)
+
+        self.assertEqual(stats.samples, 0)
+        self.assertEqual(stats.errors, 3)
+        self.assertIsNone(stats.p50_ms)
+        print("✓ Empty latency summary test passed")
+
+
+class TestMeasureRpcLatency(unittest.TestCase):
+
+    def test_pipelined_samples_exclude_errors(self):
+        """Test that samples run concurrently and failures are not latencies."""
+        client = PolkadotRPCClient("wss://rpc.example", latency_samples=6)
+        client.transport = FlakyTransport()
+
+        try:
+            stats = run(client.measure_rpc_latency())
+        finally:
+            client.executor.shutdown()
+
+        self.assertEqual(client.transport.max_in_flight, 6)
+        self.assertEqual(stats.samples, 4)
+        self.assertEqual(stats.errors, 2)
+        self.assertGreaterEqual(stats.min_ms, 10)
+        self.assertLess(stats.max_ms, 500)
+        self.assertLessEqual(stats.min_ms, stats.p50_ms)
+        self.assertLessEqual(stats.p50_ms, stats.p95_ms)
+        print("✓ Pipelined latency probe test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import time
+from pathlib import Path
+import unittest
+import asyncio
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from models.node import Node
+from services.scheduler import TickScheduler
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestTickScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.node = Node(name="polkadot", rpc_url="wss://rpc.example")
+
+    def _run_for(self, scheduler, tick, seconds):
+        async def scenario():
+            asyncio.get_running_loop().call_later(seconds, scheduler.stop)
+            await scheduler.run([self.node], tick)
+
+        run(scenario())
+
+    def test_ticks_do_not_drift(self):
+        """Test that tick start times stay on the interval grid."""
+        starts = []
+
+        async def tick(node):
+            starts.append(time.monotonic())
+            await asyncio.sleep(0.02)  # work must not push later ticks back
+
+        scheduler = TickScheduler(interval=0.05)
+        self._run_for(scheduler, tick, 0.52)
+
+        offsets = [
+            (start - starts[0]) - i * 0.05
+            for i, start in enumerate(starts)
+        ]
+        self.assertGreaterEqual(len(starts), 10)
+        self.assertLess(max(offsets), 0.02)
+        self.assertEqual(scheduler.stats["polkadot"].overruns, 0)
+        print("✓ Drift-free scheduling test passed")
+
+    def test_overrun_skips_instead_of_stacking(self):
+        """Test that a slow tick skips missed slots and is reported."""
+        starts = []
+
+        async def tick(node):
+            starts.append(time.monotonic())
+            if len(starts) == 1:
+                await asyncio.sleep(0.17)  # spans three more slots
+
+        scheduler = TickScheduler(interval=0.05)
+        self._run_for(scheduler, tick, 0.32)
+
+        stats = scheduler.stats["polkadot"]
+        self.assertEqual(stats.overruns, 1)
+        self.assertEqual(stats.skipped, 3)
+        # The tick after the overrun waits for its slot, no burst
+        self.assertGreater(starts[1] - starts[0], 0.19)
+        print("✓ Overrun handling test passed")
+
+    def test_failing_tick_keeps_schedule(self):
+        """Test that an exception in one tick does not stop the node loop."""
+        calls = 0
+
+        async def tick(node):
+            nonlocal calls
+            calls += 1
+            raise RuntimeError("collection failed")
+
+        scheduler = TickScheduler(interval=0.02)
+        self._run_for(scheduler, tick, 0.11)
+
+        self.assertGreaterEqual(calls, 4)
+        print("✓ Failing tick test passed")
+
+    def test_invalid_interval(self):
+        """Test that a non-positive interval is rejected."""
+        with self.assertRaises(ValueError):
+            TickScheduler(interval=0)
+        print("✓ Invalid interval test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
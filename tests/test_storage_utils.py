@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+import unittest
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.storage_utils import StorageUtils, TIMESTAMP_NOW_KEY
+
+
+class TestStorageUtils(unittest.TestCase):
+
+    def test_known_storage_keys(self):
+        """Test twox128 keys against well-known Substrate storage keys."""
+        self.assertEqual(
+            TIMESTAMP_NOW_KEY,
+            "0xf0c365c3cf59d671eb72da0e7a4113c49f1f0515f462cdcf84e0f1d6045dfcbb",
+        )
+        self.assertEqual(
+            StorageUtils.storage_key("System", "Number"),
+            "0x26aa394eea5630e07c48ae0c9558cef702a5c1b19ab7a04f536c519aca4983ac",
+        )
+        print("✓ Storage keys test passed")
+
+    def test_decode_u64_timestamp(self):
+        """Test decoding a little-endian u64 timestamp."""
+        timestamp_ms = 1765362600000
+        value_hex = "0x" + timestamp_ms.to_bytes(8, "little").hex()
+
+        self.assertEqual(StorageUtils.decode_u64(value_hex), timestamp_ms)
+        print("✓ u64 decode test passed")
+
+    def test_decode_u32_block_number(self):
+        """Test decoding a little-endian u32 block number."""
+        self.assertEqual(StorageUtils.decode_u32("0x40e20100"), 123456)
+        print("✓ u32 decode test passed")
+
+    def test_decode_rejects_bad_values(self):
+        """Test that missing, short or non-hex values decode to None."""
+        self.assertIsNone(StorageUtils.decode_u64(None))
+        self.assertIsNone(StorageUtils.decode_u64("0x0102"))
+        self.assertIsNone(StorageUtils.decode_u64("0xzz"))
+        print("✓ Bad value decode test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()
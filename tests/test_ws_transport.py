@@ -0,0 +1,342 @@
+import sys
+import json
+from pathlib import Path
+import unittest
+import asyncio
+import time
+
+from aiohttp import web
+
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from services.ws_transport import JsonRpcWebSocket, JsonRpcError, BatchRejectedError
+from services.rpc_client import PolkadotRPCClient
+
+
+async def start_server(handler, sockets=None):
+    """Start a local JSON-RPC WebSocket server. Returns (runner, url)."""
+    async def websocket_handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        if sockets is not None:
+            sockets.append(ws)
+        tasks = set()
+        async for message in ws:
+            task = asyncio.create_task(handler(ws, json.loads(message.data)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        for task in tasks:
+            task.cancel()
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", websocket_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"ws://127.0.0.1:{port}/"
+
+
+async def reply_after_delay(ws, request):
+    """Answer echo requests after the delay given in params[0]."""
+    if request["method"] == "fail":
+        await ws.send_str(json.dumps({
+            "jsonrpc": "2.0",
+            "id": request["id"],
+            "error": {"code": -32601, "message": "Method not found"},
+        }))
+        return
+
+    delay = request["params"][0]
+    await asyncio.sleep(delay)
+    await ws.send_str(json.dumps({
+        "jsonrpc": "2.0",
+        "id": request["id"],
+        "result": delay,
+    }))
+
+
+async def reply_to_batch(ws, request):
+    """Answer a batch with responses in reverse order."""
+    responses = []
+    for call in request:
+        if call["method"] == "fail":
+            responses.append({
+                "jsonrpc": "2.0",
+                "id": call["id"],
+                "error": {"code": -32601, "message": "Method not found"},
+            })
+        else:
+            responses.append({
+                "jsonrpc": "2.0",
+                "id": call["id"],
+                "result": call["method"],
+            })
+    await ws.send_str(json.dumps(list(reversed(responses))))
+
+
+async def reject_batches(ws, request):
+    """Answer any batch the way endpoints without batch support do."""
+    if not isinstance(request, list):
+        await ws.send_str(json.dumps({
+            "jsonrpc": "2.0", "id": request["id"], "result": request["method"],
+        }))
+        return
+
+    await ws.send_str(json.dumps({
+        "jsonrpc": "2.0",
+        "id": None,
+        "error": {"code": -32600, "message": "Batch requests are not supported"},
+    }))
+
+
+async def reject_some_batches(ws, request):
+    """Reject batches starting with a "reject" call, answer others after 50ms."""
+    if request[0]["method"] == "reject":
+        await reject_batches(ws, request)
+        return
+
+    await asyncio.sleep(0.05)
+    await reply_to_batch(ws, request)
+
+
+async def subscription_server(ws, request):
+    """Confirm a subscription and push two notifications right away."""
+    await ws.send_str(json.dumps({
+        "jsonrpc": "2.0", "id": request["id"], "result": "sub-1",
+    }))
+    for number in ("0x10", "0x11"):
+        await ws.send_str(json.dumps({
+            "jsonrpc": "2.0",
+            "method": "chain_newHead",
+            "params": {"subscription": "sub-1", "result": {"number": number}},
+        }))
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class TestJsonRpcWebSocket(unittest.TestCase):
+
+    def test_multiplexed_requests(self):
+        """Test that concurrent requests share one socket and resolve by id."""
+        async def scenario():
+            runner, url = await start_server(reply_after_delay)
+            transport = JsonRpcWebSocket(url, timeout=2)
+            try:
+                await transport.connect()
+                results = await asyncio.gather(
+                    transport.request("echo", [0.1]),
+                    transport.request("echo", [0.0]),
+                    transport.request("echo", [0.05]),
+                )
+            finally:
+                await transport.close()
+                await runner.cleanup()
+            return results
+
+        self.assertEqual(run(scenario()), [0.1, 0.0, 0.05])
+        print("✓ Multiplexed requests test passed")
+
+    def test_error_response(self):
+        """Test that JSON-RPC error objects raise JsonRpcError."""
+        async def scenario():
+            runner, url = await start_server(reply_after_delay)
+            transport = JsonRpcWebSocket(url, timeout=2)
+            try:
+                await transport.connect()
+                await transport.request("fail")
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        with self.assertRaises(JsonRpcError):
+            run(scenario())
+        print("✓ Error response test passed")
+
+    def test_pending_requests_fail_on_disconnect(self):
+        """Test that in-flight requests fail when the server goes away."""
+        async def scenario():
+            sockets = []
+            runner, url = await start_server(reply_after_delay, sockets)
+            transport = JsonRpcWebSocket(url, timeout=5)
+            try:
+                await transport.connect()
+                pending = asyncio.create_task(transport.request("echo", [10]))
+                await asyncio.sleep(0.05)
+                await sockets[0].close()
+                await pending
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        with self.assertRaises(ConnectionError):
+            run(scenario())
+        print("✓ Disconnect handling test passed")
+
+    def test_batch_request(self):
+        """Test that batch responses are matched back to calls by id."""
+        async def scenario():
+            runner, url = await start_server(reply_to_batch)
+            transport = JsonRpcWebSocket(url, timeout=2)
+            try:
+                await transport.connect()
+                return await transport.request_batch([
+                    ("chain_getHeader", []),
+                    ("fail", []),
+                    ("system_peers", []),
+                ])
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        results = run(scenario())
+
+        self.assertEqual(results[0], "chain_getHeader")
+        self.assertIsInstance(results[1], JsonRpcError)
+        self.assertEqual(results[2], "system_peers")
+        print("✓ Batch request test passed")
+
+    def test_batch_rejected(self):
+        """Test that a batch rejection fails every call in the batch."""
+        async def scenario():
+            runner, url = await start_server(reject_batches)
+            transport = JsonRpcWebSocket(url, timeout=2)
+            try:
+                await transport.connect()
+                return await transport.request_batch([
+                    ("chain_getHeader", []),
+                    ("system_peers", []),
+                ])
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        results = run(scenario())
+
+        self.assertTrue(all(isinstance(r, BatchRejectedError) for r in results))
+        print("✓ Batch rejection test passed")
+
+    def test_rejection_fails_only_one_batch(self):
+        """Test that an id-less error leaves other in-flight batches alone."""
+        async def scenario():
+            runner, url = await start_server(reject_some_batches)
+            transport = JsonRpcWebSocket(url, timeout=2)
+            try:
+                await transport.connect()
+                answered = asyncio.create_task(transport.request_batch([
+                    ("chain_getHeader", []),
+                    ("system_peers", []),
+                ]))
+                await asyncio.sleep(0.01)
+                rejected = await transport.request_batch([("reject", []), ("system_health", [])])
+                return await answered, rejected
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        answered, rejected = run(scenario())
+
+        self.assertEqual(answered, ["chain_getHeader", "system_peers"])
+        self.assertTrue(all(isinstance(r, BatchRejectedError) for r in rejected))
+        print("✓ Single batch rejection test passed")
+
+    def test_client_falls_back_only_on_rejection(self):
+        """Test that failing calls keep batching on and a rejection pauses it."""
+        async def batch_once(handler, calls):
+            runner, url = await start_server(handler)
+            client = PolkadotRPCClient(url, timeout=2, metadata_cache_dir=None)
+            try:
+                await client.connect()
+                return await client._rpc_batch(calls), client.batching
+            finally:
+                await client.disconnect()
+                client.executor.shutdown()
+                await runner.cleanup()
+
+        results, batching = run(batch_once(reply_to_batch, [("fail", [])]))
+        self.assertIsInstance(results[0], JsonRpcError)
+        self.assertTrue(batching)
+
+        results, batching = run(batch_once(reject_batches, [("chain_getHeader", []), ("system_peers", [])]))
+        self.assertEqual(results, ["chain_getHeader", "system_peers"])
+        self.assertFalse(batching)
+        print("✓ Batch fallback test passed")
+
+    def test_client_batches_again_after_pause(self):
+        """Test that a rejection does not turn batching off for good."""
+        received = []
+
+        async def count_batches(ws, request):
+            received.append(isinstance(request, list))
+            await reject_batches(ws, request)
+
+        async def scenario():
+            runner, url = await start_server(count_batches)
+            client = PolkadotRPCClient(url, timeout=2, metadata_cache_dir=None)
+            calls = [("chain_getHeader", []), ("system_peers", [])]
+            try:
+                await client.connect()
+                await client._rpc_batch(calls)
+                paused = await client._rpc_batch(calls)
+                client._batching_paused_until = time.monotonic()
+                resumed = await client._rpc_batch(calls)
+                return paused, resumed
+            finally:
+                await client.disconnect()
+                client.executor.shutdown()
+                await runner.cleanup()
+
+        paused, resumed = run(scenario())
+
+        self.assertEqual(paused, ["chain_getHeader", "system_peers"])
+        self.assertEqual(resumed, ["chain_getHeader", "system_peers"])
+        # batch, 2 singles, 2 singles while paused, batch, 2 singles
+        self.assertEqual(received, [True, False, False, False, False, True, False, False])
+        print("✓ Batch retry test passed")
+
+    def test_subscription_notifications(self):
+        """Test that notifications sent right after the id are not lost."""
+        received = []
+
+        async def scenario():
+            runner, url = await start_server(subscription_server)
+            transport = JsonRpcWebSocket(url, timeout=2)
+            try:
+                await transport.connect()
+                subscription_id = await transport.subscribe(
+                    "chain_subscribeNewHeads", [], received.append
+                )
+                await asyncio.sleep(0.05)
+                return subscription_id, transport.is_subscribed(subscription_id)
+            finally:
+                await transport.close()
+                await runner.cleanup()
+
+        subscription_id, subscribed = run(scenario())
+
+        self.assertEqual(subscription_id, "sub-1")
+        self.assertTrue(subscribed)
+        self.assertEqual(received, [{"number": "0x10"}, {"number": "0x11"}])
+        print("✓ Subscription notifications test passed")
+
+    def test_request_when_not_connected(self):
+        """Test that requests fail fast before connect()."""
+        transport = JsonRpcWebSocket("ws://127.0.0.1:1/")
+
+        with self.assertRaises(ConnectionError):
+            run(transport.request("system_health"))
+        print("✓ Not connected test passed")
+
+
+if __name__ == '__main__':
+    unittest.main()